@@ -0,0 +1,87 @@
+"""
+Benchmark of the JSON backends (orjson, ujson, standard library json) on the example GEMD data.
+
+Times, for every installed backend, the parsing of the thin JSON files of the bake and laser_shock examples
+(as read_gemd_data does), and the thin dumps of the GEMD objects of the bake material history
+(as ScienceKit.out and the stores do), and reports their throughput.
+
+Usage:
+    python benchmarks/json_backend_benchmark.py [--repeat 20]
+"""
+
+import argparse
+import pathlib
+import time
+
+from gemd.json import GEMDJson
+
+from openmsimodel.utilities import json_backend
+
+EXAMPLES = pathlib.Path(__file__).resolve().parent.parent / "examples"
+DATASETS = {
+    "bake": EXAMPLES / "bake",
+    "laser_shock": EXAMPLES / "laser_shock" / "input",
+}
+
+
+def best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(args=args)
+
+    encoder = GEMDJson()
+    texts = {
+        name: [path.read_text() for path in sorted(folder.rglob("*.json"))]
+        for name, folder in DATASETS.items()
+    }
+    objects = encoder.raw_loads(
+        (DATASETS["bake"] / "example_gemd_material_history.json").read_text()
+    )
+
+    default = json_backend.get_json_backend()
+    try:
+        for backend in json_backend.available_json_backends():
+            json_backend.set_json_backend(backend)
+            for name, dataset in texts.items():
+                size = sum(len(text) for text in dataset)
+                elapsed = best_of(
+                    args.repeat, lambda: [json_backend.loads(text) for text in dataset]
+                )
+                print(
+                    f"backend={backend:<6} loads {name:<11} files={len(dataset):<3} "
+                    f"{size / elapsed / 1e6:>8.1f} MB/s"
+                )
+            elapsed = best_of(
+                args.repeat,
+                lambda: [
+                    json_backend.thin_dumps(encoder, obj, indent=3) for obj in objects
+                ],
+            )
+            print(
+                f"backend={backend:<6} thin_dumps bake  objects={len(objects):<4} "
+                f"{len(objects) / elapsed:>8.0f} objects/s"
+            )
+        # GEMDJson.thin_dumps itself, for reference
+        elapsed = best_of(
+            args.repeat, lambda: [encoder.thin_dumps(obj, indent=3) for obj in objects]
+        )
+        print(
+            f"GEMDJson.thin_dumps bake  objects={len(objects):<4} "
+            f"{len(objects) / elapsed:>8.0f} objects/s"
+        )
+    finally:
+        json_backend.set_json_backend(default)
+
+
+if __name__ == "__main__":
+    main()
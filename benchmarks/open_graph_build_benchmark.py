@@ -0,0 +1,160 @@
+"""
+Benchmark of OpenGraph graph construction on a synthetic GEMD dataset.
+
+Generates chains of process -> material -> measurement/ingredient thin objects (runs, specs and templates)
+in memory and times how many objects per second OpenGraph ingests, for every layout and 'which' option,
+with and without bulk insertion.
+
+Usage:
+    python benchmarks/open_graph_build_benchmark.py [--nb_objects 100000] [--repeat 3]
+"""
+
+import argparse
+import itertools
+import tempfile
+import time
+import uuid
+import networkx as nx
+
+from openmsimodel.graph.open_graph import OpenGraph, GraphBuffer, paused_gc
+
+
+def link(uid):
+    return {"id": uid, "scope": "auto", "type": "link_by_uid"}
+
+
+def attribute(name, value, typ="parameter"):
+    return {
+        "name": name,
+        "type": typ,
+        "value": {"nominal": value, "type": "nominal_real", "units": "kelvin"},
+        "template": None,
+        "origin": "specified",
+        "file_links": [],
+        "notes": None,
+    }
+
+
+def thin_object(obj_type, name, **links):
+    obj = {
+        "type": obj_type,
+        "name": name,
+        "uids": {"auto": str(uuid.uuid4())},
+        "tags": ["synthetic::benchmark"],
+        "file_links": [],
+        "notes": None,
+    }
+    for key, value in links.items():
+        obj[key] = value
+    return obj
+
+
+def synthetic_gemd_objects(nb_objects):
+    """returns roughly nb_objects thin GEMD dicts forming linked process/material/ingredient/measurement chains"""
+    objects = []
+    templates = {}
+    for kind in ["process", "material", "measurement"]:
+        template = thin_object(f"{kind}_template", f"{kind} template")
+        template["parameters"] = [[link(str(uuid.uuid4())), None]]
+        templates[kind] = template
+        objects.append(template)
+    specs = {}
+    for kind in ["process", "material", "measurement"]:
+        spec = thin_object(
+            f"{kind}_spec", f"{kind} spec", template=link(templates[kind]["uids"]["auto"])
+        )
+        specs[kind] = spec
+        objects.append(spec)
+
+    previous_material = None
+    i = 0
+    while len(objects) < nb_objects:
+        process = thin_object(
+            "process_run",
+            f"process {i}",
+            spec=link(specs["process"]["uids"]["auto"]),
+            parameters=[attribute("temperature", 300 + i)],
+            conditions=[],
+        )
+        material = thin_object(
+            "material_run",
+            f"material {i}",
+            spec=link(specs["material"]["uids"]["auto"]),
+            process=link(process["uids"]["auto"]),
+        )
+        measurement = thin_object(
+            "measurement_run",
+            f"measurement {i}",
+            spec=link(specs["measurement"]["uids"]["auto"]),
+            material=link(material["uids"]["auto"]),
+            properties=[attribute("hardness", i, typ="property")],
+            parameters=[],
+            conditions=[],
+        )
+        objects.extend([process, material, measurement])
+        if previous_material is not None:
+            objects.append(
+                thin_object(
+                    "ingredient_run",
+                    f"ingredient {i}",
+                    spec={},
+                    process=link(process["uids"]["auto"]),
+                    material=link(previous_material["uids"]["auto"]),
+                )
+            )
+        previous_material = material
+        i += 1
+    return objects[:nb_objects]
+
+
+def ingest(open_graph, gemd_objects):
+    """the scan loop of OpenGraph.build_graph, without I/O, relabeling or diagnostics"""
+    G = nx.DiGraph()
+    G_scan = GraphBuffer() if open_graph.bulk_insert else G
+    with paused_gc(open_graph.bulk_insert):
+        for obj_data in gemd_objects:
+            obj_type = obj_data["type"]
+            obj_state = obj_type.split("_")[-1]
+            obj_uid = obj_data["uids"]["auto"]
+            open_graph.handle_gemd_obj(G_scan, obj_uid, obj_data, obj_type, obj_state)
+        if open_graph.bulk_insert:
+            G_scan.flush(G)
+    return G
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nb_objects", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(args=args)
+
+    print(f"Generating {args.nb_objects} synthetic gemd objects...")
+    gemd_objects = synthetic_gemd_objects(args.nb_objects)
+
+    with tempfile.TemporaryDirectory() as output:
+        for layout, which, bulk_insert in itertools.product(
+            ["raw", "visualisation"], ["run", "all"], [False, True]
+        ):
+            open_graph = OpenGraph(
+                "benchmark",
+                gemd_objects,
+                output,
+                layout=layout,
+                which=which,
+                bulk_insert=bulk_insert,
+            )
+            best = None
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                G = ingest(open_graph, gemd_objects)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            print(
+                f"layout={layout:<13} which={which:<3} bulk_insert={bulk_insert!s:<5} "
+                f"nodes={G.number_of_nodes():<7} edges={G.number_of_edges():<7} "
+                f"{len(gemd_objects) / best:>10.0f} objects/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import json
+from collections import defaultdict
+from itertools import islice
+
+# top level links of GEMD objects stored as GEMDEdges
+EDGE_KEYS = ["spec", "template", "material", "process"]
+# length of the longest paths followed by the reachability queries
+MAX_DEPTH = 16
+
+
+def batches(iterable, batch_size):
+    """yields lists of up to batch_size items of iterable"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def edge_label(gemd_type, key):
+    """returns the gemd_ref of the edge of a link, e.g., 'material_run:process_run' for the process of a material run,
+    as create_edges_query labels them"""
+    kind, state = gemd_type.rsplit("_", 1)
+    if key in ("material", "process") and kind in ("ingredient", "material"):
+        return f"{gemd_type}:{key}_{state}"
+    return f"{gemd_type}:{key}"
+
+
+def gemd_edges(obj, uid, scope):
+    """returns the GEMDEdge rows of a thin GEMD object: one per top level link in scope
+
+    Args:
+        obj (dict): thin GEMD object
+        uid (str): uid of the object, as stored
+        scope (str): scope of the links to store
+
+    Returns:
+        list: dicts with from_uid, to_uid and gemd_ref
+    """
+    rows = []
+    for key in EDGE_KEYS:
+        link = obj.get(key)
+        if (
+            isinstance(link, dict)
+            and link.get("type") == "link_by_uid"
+            and link.get("scope") == scope
+        ):
+            rows.append(
+                {
+                    "from_uid": uid,
+                    "to_uid": link["id"][:64],
+                    "gemd_ref": edge_label(obj["type"], key),
+                }
+            )
+    return rows
+
+
+def attribute_value(value):
+    """returns the value stored for an attribute: its category, nominal value, or composition as JSON"""
+    value_type = value.get("type")
+    if value_type == "nominal_categorical":
+        return value.get("category")
+    if value_type in ("nominal_real", "nominal_integer"):
+        return str(value.get("nominal"))
+    if value_type == "nominal_composition":
+        return json.dumps(value.get("quantities"))
+    return None
+
+
+def attribute_row(uid, att, conditions=None):
+    value = att.get("value") or {}
+    template = att.get("template")
+    return {
+        "gemdobject_uid": uid,
+        "template_id": template.get("id") if isinstance(template, dict) else None,
+        "name": att.get("name"),
+        "value": attribute_value(value),
+        "value_type": value.get("type"),
+        "value_units": value.get("units"),
+        "attribute_type": att.get("type"),
+        "property": json.dumps(att),
+        "conditions": json.dumps(conditions) if conditions is not None else None,
+    }
+
+
+def gemd_attributes(obj, uid):
+    """returns the GEMDAttribute rows of a thin GEMD object: one per parameter, condition and property.
+    Properties with conditions store the conditions they were measured at in 'conditions'.
+
+    Args:
+        obj (dict): thin GEMD object
+        uid (str): uid of the object, as stored
+
+    Returns:
+        list: dicts with the columns of GEMDAttribute
+    """
+    rows = []
+    for key in ("parameters", "conditions", "properties"):
+        for att in obj.get(key) or []:
+            if not isinstance(att, dict):
+                continue
+            if att.get("type") == "property_and_conditions":
+                rows.append(
+                    attribute_row(uid, att["property"], att.get("conditions") or [])
+                )
+            else:
+                rows.append(attribute_row(uid, att))
+    return rows
+
+
+def closure_rows(edges, model_id, max_depth=MAX_DEPTH):
+    """yields the GEMDClosure rows of a model: one per pair of objects linked by a path of at most max_depth
+    edges, as the recursive reachability queries follow them. Paths are counted level by level from every object
+    with edges, so that cycles end at max_depth.
+
+    Args:
+        edges (list): GEMDEdge rows (dicts with from_uid and to_uid) of the model
+        model_id (int): id of the model
+        max_depth (int, optional): maximum length of the paths. Defaults to MAX_DEPTH.
+
+    Yields:
+        dict: row with the columns of GEMDClosure
+    """
+    children = defaultdict(list)
+    for edge in edges:
+        children[edge["from_uid"]].append(edge["to_uid"])
+    for ancestor in children:
+        reached = {}
+        level = {ancestor: 1}
+        for depth in range(1, max_depth + 1):
+            next_level = defaultdict(int)
+            for uid, paths in level.items():
+                for child in children.get(uid, ()):
+                    next_level[child] += paths
+            for uid, paths in next_level.items():
+                if uid in reached:
+                    reached[uid]["max_depth"] = depth
+                    reached[uid]["paths"] += paths
+                else:
+                    reached[uid] = {"depth": depth, "max_depth": depth, "paths": paths}
+            if not next_level:
+                break
+            level = next_level
+        for descendant, stats in reached.items():
+            yield {
+                "ancestor": ancestor,
+                "descendant": descendant,
+                "model_id": model_id,
+                **stats,
+            }
@@ -1,31 +1,26 @@
-import pymssql
 import sqlalchemy as sqla
 import pandas
 
+from openmsimodel.db import schema
 
-class MSSQLDatabase:
-    # wraps a Microsoft SQL Server database
-    def __init__(self, AUTH, DATABASE=None):
-        # AUTH should be a dict with some specific fields useful for a direct connection to the database
-        self.AUTH = AUTH
-        self.SERVER = AUTH["host"]
-        if DATABASE is None:
-            self.DATABASE = AUTH["database"]
-        else:
-            self.DATABASE = DATABASE
-        self.ENGINE = self.__create_engine()
+DATABASE_BACKENDS = ["mssql", "sqlite"]
 
-    # def executed_casjobs_query(self):
-    #     pass
 
-    def execPyMSSQL(self, statement):
-        with pymssql.connect(
-            self.SERVER, self.AUTH["user"], self.AUTH["pwd"], self.DATABASE
-        ) as conn:
-            cursor = conn.cursor()
-            r = cursor.execute(statement)
-            conn.commit()
-        return r
+def open_database(AUTH, DATABASE=None):
+    # returns the database of the backend named in AUTH["backend"] (Microsoft SQL Server by default)
+    backend = AUTH.get("backend", "mssql")
+    if backend == "mssql":
+        return MSSQLDatabase(AUTH, DATABASE)
+    if backend == "sqlite":
+        return SQLiteDatabase(AUTH.get("path", DATABASE))
+    raise ValueError(
+        f"unknown database backend {backend}, expected one of {DATABASE_BACKENDS}."
+    )
+
+
+class GEMDDatabase:
+    # methods shared by the database backends, which differ by their engine (ENGINE) and SQL dialect (BACKEND)
+    BACKEND = None
 
     def execute_query(self, sql):
         if type(sql) == str:
@@ -47,13 +42,109 @@ class MSSQLDatabase:
                 raise
         return result
 
+    def create_tables(self):
+        # creates the GEMDModel, GEMDObject, GEMDAttribute and GEMDEdge tables, if they don't exist
+        schema.metadata.create_all(self.ENGINE)
+
+    def pool_status(self):
+        # statistics of the connection pool: connections held idle, in use, and opened beyond pool_size
+        pool = self.ENGINE.pool
+        status = {"pool": type(pool).__name__}
+        for key, method in [
+            ("size", "size"),
+            ("checked_in", "checkedin"),
+            ("checked_out", "checkedout"),
+            ("overflow", "overflow"),
+        ]:
+            if hasattr(pool, method):
+                status[key] = getattr(pool, method)()
+        return status
+
+    def dispose(self):
+        # closes the connections of the pool, e.g., before forking or at the end of a session
+        self.ENGINE.dispose()
+
+
+class SQLiteDatabase(GEMDDatabase):
+    # wraps a local SQLite database file (or an in-memory database), queried with the JSON1 functions of SQLite
+    BACKEND = "sqlite"
+
+    def __init__(self, DATABASE=None):
+        self.DATABASE = ":memory:" if DATABASE is None else str(DATABASE)
+        if self.DATABASE == ":memory:":
+            # a single connection, shared by all methods, holds the in-memory database
+            self.ENGINE = sqla.create_engine(
+                "sqlite://",
+                poolclass=sqla.pool.StaticPool,
+                connect_args={"check_same_thread": False},
+            )
+        else:
+            self.ENGINE = sqla.create_engine(f"sqlite:///{self.DATABASE}")
+        self.create_tables()
+
+
+class MSSQLDatabase(GEMDDatabase):
+    # wraps a Microsoft SQL Server database
+    # all methods share the connection pool of a single engine: connections are opened once and reused,
+    # checked with a ping before use (pool_pre_ping), and reopened after pool_recycle seconds
+    BACKEND = "mssql"
+
+    def __init__(
+        self,
+        AUTH,
+        DATABASE=None,
+        pool_size=5,
+        max_overflow=10,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+        pool_timeout=30,
+    ):
+        # AUTH should be a dict with some specific fields useful for a direct connection to the database
+        self.AUTH = AUTH
+        self.SERVER = AUTH["host"]
+        if DATABASE is None:
+            self.DATABASE = AUTH["database"]
+        else:
+            self.DATABASE = DATABASE
+        self.POOL_OPTIONS = {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_recycle": pool_recycle,
+            "pool_pre_ping": pool_pre_ping,
+            "pool_timeout": pool_timeout,
+        }
+        self.ENGINE = self.__create_engine()
+
+    # def executed_casjobs_query(self):
+    #     pass
+
+    def execPyMSSQL(self, statement):
+        # raw pymssql connection checked out of the engine's pool, returned to it on close
+        conn = self.ENGINE.raw_connection()
+        try:
+            cursor = conn.cursor()
+            r = cursor.execute(statement)
+            conn.commit()
+        finally:
+            conn.close()
+        return r
+
     def __create_engine(self):
         return sqla.create_engine(
-            f"mssql+pymssql://{self.AUTH['user']}:{self.AUTH['pwd']}@{self.SERVER}:1433/{self.DATABASE}?charset=utf8"
+            f"mssql+pymssql://{self.AUTH['user']}:{self.AUTH['pwd']}@{self.SERVER}:1433/{self.DATABASE}?charset=utf8",
+            poolclass=sqla.pool.QueuePool,
+            **self.POOL_OPTIONS,
         )
 
+    def pool_status(self):
+        return {
+            **super().pool_status(),
+            "max_overflow": self.POOL_OPTIONS["max_overflow"],
+        }
+
     def create_schema(self, schema):
-        self.ENGINE.execute(sqla.schema.CreateSchema(schema))
+        with self.ENGINE.begin() as conn:
+            conn.execute(sqla.schema.CreateSchema(schema))
 
     def get_source_id(self, ORG, schema="dbo"):
         sql = f"select source_id from {schema}.metadata_source where source_type='org' and organization_name='{ORG}'"
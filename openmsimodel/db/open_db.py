@@ -23,16 +23,18 @@ import time
 import os
 from pathlib import Path
 import pandas as pd
+import sqlalchemy as sqla
 
 from questionary import prompt, select, text, confirm
 
-from openmsimodel.db.gemd_database import MSSQLDatabase
+from openmsimodel.db.gemd_database import open_database
+from openmsimodel.db import schema
 from openmsimodel.utilities.argument_parsing import OpenMSIModelParser
 from openmsimodel.utilities.runnable import Runnable
 from openmsimodel.utilities.logging import Logger
 import openmsimodel.db.queries as queries
 
-from inspect import getmembers, isfunction
+from inspect import getmembers, isfunction, signature
 
 
 def create_acronym(phrase):
@@ -50,16 +52,29 @@ class OpenDB(Runnable):
 
     ARGUMENT_PARSER_TYPE = OpenMSIModelParser
 
-    def __init__(self, database_name, private_path, output, source=None, science_kit=None):
+    def __init__(
+        self,
+        database_name,
+        private_path,
+        output,
+        source=None,
+        science_kit=None,
+        backend="mssql",
+        closure=False,
+    ):
         """
         Initialization of OpenDB instance.
 
-        :param database_name: Name of the database to connect to.
+        :param database_name: Name of the database to connect to, or path of the database file with SQLite.
         :type database_name: str
-        :param private_path: Path to a JSON file containing database credentials.
+        :param private_path: Path to a JSON file containing database credentials. Unused with SQLite.
         :type private_path: str
         :param output: Path to the output directory.
         :type output: str
+        :param backend: Database backend, "mssql" (default) or "sqlite".
+        :type backend: str
+        :param closure: Whether models are loaded with their GEMDClosure, which reachability queries then join.
+        :type closure: bool
         """
         self.auth = None
         self.gemd_db = None
@@ -69,6 +84,8 @@ class OpenDB(Runnable):
         self.listed_acronyms = {}
         self.logger = Logger()
         self.science_kit = science_kit
+        self.backend = backend
+        self.closure = closure
         if self.science_kit:
             self.science_kit.open_dbs[database_name] = self
         self.setup(database_name, private_path)
@@ -81,10 +98,14 @@ class OpenDB(Runnable):
         :param private_path: Path to a JSON file containing database credentials.
         """
         try:
-            with open(private_path, "r") as f:
-                self.auth = json.load(f)
+            if self.backend == "sqlite":
+                # local database file, no credentials
+                self.auth = {"backend": "sqlite"}
+            else:
+                with open(private_path, "r") as f:
+                    self.auth = json.load(f)
             self.database = database_name  # GEMD
-            self.gemd_db = MSSQLDatabase(self.auth, self.database)
+            self.gemd_db = open_database(self.auth, self.database)
         except FileNotFoundError as e:
             self.logger.error(f"Error loading credentials: {e}")
             self.logger.warning("Database functionality disabled.")
@@ -96,11 +117,80 @@ class OpenDB(Runnable):
         except Exception as e:
             print(f"Error while reading functions from 'queries': {e}")
 
-    def load_model(self, name, dirpath, uuid="auto"):
-        return queries.load_model_query(name, self.gemd_db, dirpath, uuid)
+    def load_model(self, name, dirpath, uuid="auto", batch_size=1000):
+        return queries.load_model_query(
+            name,
+            self.gemd_db,
+            dirpath,
+            uuid,
+            batch_size=batch_size,
+            closure=self.closure,
+        )
 
     def create_tables(self):
-        return queries.create_tables_query()
+        return queries.create_tables_query(backend=self.gemd_db.BACKEND)
+
+    def has_closure(self, model_id=None, uid=None):
+        """
+        Whether the GEMDClosure of a model, or of the model of an object, is stored: closures are stored by
+        load_model_query with closure set, or by create_closure_query, and are looked up by their rows.
+
+        :param model_id: Id of the model.
+        :type model_id: int
+        :param uid: Uid of an object of the model, used instead of model_id.
+        :type uid: str
+
+        :return: True if the GEMDClosure of the model has rows.
+        :rtype: bool
+        """
+        closure, objects = schema.GEMDClosure, schema.GEMDObject
+        if uid is not None:
+            model_id = (
+                sqla.select(objects.c.model_id)
+                .where(objects.c.uid == uid)
+                .scalar_subquery()
+            )
+        else:
+            model_id = int(model_id)
+        query = sqla.select(sqla.exists().where(closure.c.model_id == model_id))
+        with self.gemd_db.ENGINE.connect() as conn:
+            return bool(conn.execute(query).scalar())
+
+    def run_listed_query(self, func, args):
+        """
+        Build a listed query with the arguments entered, in the SQL dialect of the database, and run it.
+        Reachability queries join the GEMDClosure of their model if closure is set and the model has one, and follow
+        edges recursively otherwise. Queries creating tables or rows are committed, and return no rows.
+
+        :param func: Function of the queries module.
+        :type func: function
+        :param args: Arguments entered, bound to the statement as parameters.
+        :type args: list
+
+        :return: The statement and its results.
+        :rtype: tuple
+
+        :raises ValueError: If the query only reads the GEMDClosure, and the model has none.
+        """
+        kwargs = {}
+        parameters = signature(func).parameters
+        if "backend" in parameters:
+            kwargs["backend"] = self.gemd_db.BACKEND
+        if "closure" in parameters and self.closure:
+            # the first argument is the uid of an object, or the id of a model
+            key = "uid" if "uid" in parameters else "model_id"
+            kwargs["closure"] = self.has_closure(**{key: args[0]})
+            if not kwargs["closure"]:
+                print("No GEMDClosure stored for the model: following edges instead.")
+        if func is queries.ancestors_query and not self.has_closure(uid=args[0]):
+            raise ValueError(
+                "No GEMDClosure stored for the model: create it with create_closure_query first."
+            )
+        statement = func(*args, **kwargs)
+        if func.__name__.startswith("create_"):
+            self.gemd_db.execute_update(statement)
+            return statement, pd.DataFrame()
+        return statement, self.gemd_db.execute_query(statement)
 
     def record_query_results(self, sql_results, query, name, dump=True):
         """
@@ -109,7 +199,7 @@ class OpenDB(Runnable):
         :param sql_results: The results of the SQL query.
         :type sql_results: DataFrame
         :param query: The SQL query that produced the results.
-        :type query: str
+        :type query: str or TextClause
         :param name: A name to use for the output file.
         :type name: str
         :param dump: If True, save the results to a CSV file. Default is True.
@@ -131,6 +221,9 @@ class OpenDB(Runnable):
             self.print_and_dump(result_df, query, "data_output")
         """
         print(f"Query: {query}")
+        if not isinstance(query, str):
+            # statement of the query registry, printed with the values bound to it
+            print(f"Parameters: {query.compile().params}")
 
         timestamp = time.strftime("%m%d%Y_%H%M_", time.localtime())
         random_suffix = random.randint(0, 10000)
@@ -219,6 +312,7 @@ class OpenDB(Runnable):
                     "Sync GEMD Folder With Database Table",
                     "Add Schema",
                     "Edit Db: Add Measurement",
+                    "Connection Pool Status",
                     "Return"
                 ]
                 mode_question = select(
@@ -228,8 +322,14 @@ class OpenDB(Runnable):
                 if mode_question == "Add Schema":
                     try:
                         # Create tables in the database schema
-                        add_schema_query = queries.create_tables_query()
-                        result = self.gemd_db.execute_query(add_schema_query)
+                        if self.gemd_db.BACKEND == "sqlite":
+                            # created along with the database
+                            add_schema_query = self.create_tables()
+                            result = pd.DataFrame()
+                        else:
+                            add_schema_query = queries.create_tables_query()
+                            self.gemd_db.execute_update(add_schema_query)
+                            result = pd.DataFrame()
                         self.record_query_results(
                             result, add_schema_query, "add_schema_query"
                         )
@@ -280,9 +380,10 @@ class OpenDB(Runnable):
                                 f"Couldn't recognize the identifier passed as '{identifier}'. Pass the full name or acronym."
                             )
 
-                        # Execute the selected query
-                        selected_query = func(*selected_query[1:])
-                        result = self.gemd_db.execute_query(selected_query)
+                        # Execute the selected query, with the arguments entered bound to its statement
+                        selected_query, result = self.run_listed_query(
+                            func, selected_query[1:]
+                        )
                         self.record_query_results(result, selected_query, identifier)
                     except Exception as e:
                         print(f"ERROR: {e}")
@@ -312,6 +413,13 @@ class OpenDB(Runnable):
                         raise ValueError("Expected two parameters (name and dirpath).")
                     self.dump_gemd_from_query(params[0], params[1])
 
+                elif mode_question == "Connection Pool Status":
+                    if self.gemd_db is None:
+                        print("No database connection.")
+                    else:
+                        for key, value in self.gemd_db.pool_status().items():
+                            print(f"{key}: {value}")
+
                 elif mode_question == "Return":
                     break
 
@@ -321,7 +429,14 @@ class OpenDB(Runnable):
     @classmethod
     def get_command_line_arguments(cls):
         superargs, superkwargs = super().get_command_line_arguments()
-        args = [*superargs, "database_name", "private_path", "output"]
+        args = [
+            *superargs,
+            "database_name",
+            "private_path",
+            "output",
+            "db_backend",
+            "closure",
+        ]
         kwargs = {**superkwargs}
         return args, kwargs
 
@@ -329,8 +444,18 @@ class OpenDB(Runnable):
     def run_from_command_line(cls, args=None):
         parser = cls.get_argument_parser()
         args = parser.parse_args(args=args)
-        open_db = cls(args.database_name, args.private_path, args.output)
-        open_db.interactive_mode()
+        open_db = cls(
+            args.database_name,
+            args.private_path,
+            args.output,
+            backend=args.db_backend,
+            closure=args.closure,
+        )
+        try:
+            open_db.interactive_mode()
+        finally:
+            if open_db.gemd_db is not None:
+                open_db.gemd_db.dispose()
 
 
 def main(args=None):
@@ -1,98 +1,124 @@
-from sqlalchemy.orm import Session
-from sqlalchemy.ext.automap import automap_base
-from openmsimodel.utilities.io import read_gemd_data
+import sqlalchemy
+import sqlalchemy.dialects.sqlite
+from openmsimodel.utilities.io import iter_gemd_data
 from gemd.json import GEMDJson
+from openmsimodel.db import bulk, schema, statements
 import json
 
 model_table_name = "GEMDModel"
 object_table_name = "GEMDObject"
 attribute_table_name = "GEMDAttribute"
 edge_table_name = "GEMDEdge"
+closure_table_name = "GEMDClosure"
 
 
-def show_models():
+statements.register(
+    "show_models",
+    portable="""select distinct * from GEMDModel""",
+)
+
+
+def show_models(backend="mssql"):
     """shows all models in the database.
 
     Returns:
-        _type_: str
+        TextClause: statement, with values bound
     """
-    return """select distinct * from GEMDModel"""
+    return statements.bind("show_models", backend)
+
+
+statements.register(
+    "top_elements",
+    mssql="""select top (:nb) * from gemdobject c where gemd_type=:gemd_type AND c.model_id=:model_id order by newid()""",
+    sqlite="""select * from GEMDObject c where gemd_type=:gemd_type AND c.model_id=:model_id order by random() limit :nb""",
+)
 
 
-def top_elements(model_id, nb, gemd_type):
+def top_elements(model_id, nb, gemd_type, backend="mssql"):
     """return top elements of a certain type from model.
 
     Args:
         model_id (int): id of the model to query
         nb (int): number of elements
         gemd_type (str): type of gemd object
+        backend (str, optional): SQL dialect, "mssql" or "sqlite". Defaults to "mssql".
 
     Returns:
-        _type_: str
+        TextClause: statement, with values bound
     """
-    return f"""select top {nb} * from gemdobject c where gemd_type='{gemd_type}' AND c.model_id='{model_id}' order by newid()"""
+    return statements.bind(
+        "top_elements",
+        backend,
+        model_id=int(model_id),
+        nb=int(nb),
+        gemd_type=gemd_type,
+    )
+
 
+for view in statements.GEMD_TYPES:
+    statements.register(
+        f"display_all:{view}",
+        mssql=f""" select * from {view} where model_id=:model_id""",
+    )
+statements.register(
+    "display_all",
+    sqlite=""" select * from GEMDObject where model_id=:model_id and gemd_type=:gemd_type""",
+)
 
-def display_all(model_id, type_to_display):
+
+def display_all(model_id, type_to_display, backend="mssql"):
     """displays all the gemd objects of a certain type in the model.
 
     Args:
         model_id (int): id of the model to query
         type_to_display (str): object type to display
+        backend (str, optional): SQL dialect, "mssql" or "sqlite". Defaults to "mssql".
 
     Returns:
-        _type_: str
+        TextClause: statement, with values bound
     """
-    return f""" select * from {type_to_display} where model_id={model_id}"""
-
-
-def return_all_paths(model_id):
-    """return all paths between all nodes in model"""
-    return f"""
-    with gr as (
-    select c.uid as root_uid
-    ,      c.gemd_type as root_type
-    ,      0 as level
-    ,      cast(NULL as varchar(64)) as endpoint_uid
-    ,      c.uid as from_uid, cast(NULL as bigint) as edge_id, cast(NULL as varchar(64)) as gemd_ref
-    ,      cast(gemd_type+':'+c.uid as varchar(max)) as [path]
-    from GEMDObject c where c.model_id={model_id} 
-    union all
-    select gr.root_uid, gr.root_type, gr.level+1, e.to_uid
-    ,      e.to_uid, e.id, e.gemd_ref
-    ,      gr.path+'==>'+e.gemd_ref+':'+e.to_uid
-    from gr
-    join GEMDEdge e on e.from_uid=gr.from_uid
-    where gr.level < 16
+    if backend == "sqlite":
+        # no views per type: objects are filtered from GEMDObject
+        return statements.bind(
+            "display_all",
+            backend,
+            model_id=int(model_id),
+            gemd_type=statements.gemd_type(type_to_display),
+        )
+    # view names can't be bound: one statement is registered per view
+    return statements.bind(
+        f"display_all:{statements.gemd_type(type_to_display)}",
+        backend,
+        model_id=int(model_id),
     )
-    select root_uid, root_type, endpoint_uid
-    ,      edge_id,gemd_ref
-    ,      path, level
-    from gr
-    order by root_type,root_uid, path
-    """
 
 
-def gemd_types_query():
-    return """
+statements.register(
+    "gemd_types_query",
+    mssql="""
     select distinct gemd_type
     ,      x.[key]
     from GEMDObject cross apply openjson(context,'$') x
     where x.[key] not in ('tags','description','uids','name','type','bounds','file_links','labels')
     order by 1,2
-    """
+    """,
+    sqlite="""
+    select distinct gemd_type
+    ,      x.[key]
+    from GEMDObject, json_each(GEMDObject.context) x
+    where x.[key] not in ('tags','description','uids','name','type','bounds','file_links','labels')
+    order by 1,2
+    """,
+)
 
 
-def reachable_nodes_query(uid):
-    """returns all the elements that can be reached from the node.
+def gemd_types_query(backend="mssql"):
+    return statements.bind("gemd_types_query", backend)
 
-    Args:
-        uid (str): unique identifier of object to query with
 
-    Returns:
-        _type_: str
-    """
-    return f"""
+statements.register(
+    "reachable_nodes_query",
+    mssql="""
         with gr as (
         select c.uid as node_uid
         ,      c.gemd_type as node_type
@@ -103,7 +129,7 @@ def reachable_nodes_query(uid):
         ,      cast(NULL as varchar(128)) as Source
         ,      0 as level
         from GEMDObject c
-        where uid='{uid}'
+        where uid=:uid
         union all
         select c.uid as node_uid
         ,      c.gemd_type as node_type
@@ -122,19 +148,103 @@ def reachable_nodes_query(uid):
         --,node_type,node_context
         from gr
         
-    """
+    """,
+    sqlite="""
+        with recursive gr as (
+        select c.uid as node_uid
+        ,      c.gemd_type as node_type
+        ,      c.context as node_context
+        ,      c.gemd_type||' ['||c.uid||']' as Target
+        ,      -1 as edge_id
+        ,      NULL as from_uid
+        ,      NULL as Source
+        ,      0 as level
+        from GEMDObject c
+        where uid=:uid
+        union all
+        select c.uid as node_uid
+        ,      c.gemd_type as node_type
+        ,      c.context as node_context
+        ,      c.gemd_type||' ['||c.uid||']' as Target
+        ,      e.id as edge_id
+        ,      gr.node_uid as from_uid
+        ,      gr.Target as Source
+        ,      gr.level+1 as level
+        from gr
+        join GEMDEdge e on e.from_uid=gr.node_uid
+        join GEMDObject c on c.uid=e.to_uid
+        where gr.level < 16
+        )
+        select Source,Target,node_context
+        from gr
+    """,
+)
 
 
-def to_node_query(model_id):
-    """returns all elements that can reach a given node, for all nodes in the model.
+statements.register(
+    "reachable_nodes_query:closure",
+    mssql="""
+        select cast(NULL as varchar(128)) as Source
+        ,      cast(c.gemd_type+' ['+c.uid+']' as varchar(128)) as Target
+        ,      c.context as node_context
+        from GEMDObject c
+        where c.uid=:uid
+        union all
+        select cast(s.gemd_type+' ['+s.uid+']' as varchar(128)) as Source
+        ,      cast(c.gemd_type+' ['+c.uid+']' as varchar(128)) as Target
+        ,      c.context as node_context
+        from (
+            select cast(:uid as varchar(64)) as uid, 0 as depth
+            union all
+            select k.descendant, k.depth from GEMDClosure k where k.ancestor=:uid
+        ) r
+        join GEMDObject s on s.uid=r.uid
+        join GEMDEdge e on e.from_uid=r.uid
+        join GEMDObject c on c.uid=e.to_uid
+        where r.depth < 16
+    """,
+    sqlite="""
+        select NULL as Source
+        ,      c.gemd_type||' ['||c.uid||']' as Target
+        ,      c.context as node_context
+        from GEMDObject c
+        where c.uid=:uid
+        union all
+        select s.gemd_type||' ['||s.uid||']' as Source
+        ,      c.gemd_type||' ['||c.uid||']' as Target
+        ,      c.context as node_context
+        from (
+            select :uid as uid, 0 as depth
+            union all
+            select k.descendant, k.depth from GEMDClosure k where k.ancestor=:uid
+        ) r
+        join GEMDObject s on s.uid=r.uid
+        join GEMDEdge e on e.from_uid=r.uid
+        join GEMDObject c on c.uid=e.to_uid
+        where r.depth < 16
+    """,
+)
+
+
+def reachable_nodes_query(uid, backend="mssql", closure=False):
+    """returns all the elements that can be reached from the node.
 
     Args:
-        model_id (str): id of the model to query from
+        uid (str): unique identifier of object to query with
+        backend (str, optional): SQL dialect, "mssql" or "sqlite". Defaults to "mssql".
+        closure (bool, optional): whether to join the GEMDClosure of the model instead of following edges
+            recursively. Edges are then returned once each, rather than once per path. Defaults to False.
 
     Returns:
-        _type_: str
+        TextClause: statement, with values bound
     """
-    return f"""
+    name = "reachable_nodes_query:closure" if closure else "reachable_nodes_query"
+    return statements.bind(name, backend, uid=uid)
+
+
+statements.register(
+    "to_node_query",
+    mssql="""
         with gr as (
         select c.uid as root_uid
         ,      c.gemd_type as root_type
@@ -142,7 +252,7 @@ def to_node_query(model_id):
         ,      cast(NULL as varchar(64)) as endpoint_uid
         ,      c.uid as from_uid, cast(NULL as bigint) as edge_id, cast(NULL as varchar(64)) as gemd_ref
         ,      cast(gemd_type+c.uid as varchar(max)) as [path]
-        from GEMDObject c where c.model_id={model_id}
+        from GEMDObject c where c.model_id=:model_id
         union all
         select gr.root_uid, gr.root_type, gr.level+1, e.to_uid
         ,      e.to_uid, e.id, e.gemd_ref
@@ -155,11 +265,60 @@ def to_node_query(model_id):
         from gr
         group by endpoint_uid
         order by num_in_nodes desc
+    """,
+    sqlite="""
+        with recursive gr as (
+        select c.uid as root_uid
+        ,      0 as level
+        ,      NULL as endpoint_uid
+        ,      c.uid as from_uid
+        from GEMDObject c where c.model_id=:model_id
+        union all
+        select gr.root_uid, gr.level+1, e.to_uid
+        ,      e.to_uid
+        from gr
+        join GEMDEdge e on e.from_uid=gr.from_uid
+        where gr.level < 16
+        )
+        select endpoint_uid, count(distinct root_uid) as num_in_nodes
+        from gr
+        group by endpoint_uid
+        order by num_in_nodes desc
+    """,
+)
+
+
+statements.register(
+    "to_node_query:closure",
+    portable="""
+        select k.descendant as endpoint_uid, count(*) as num_in_nodes
+        from GEMDClosure k
+        where k.model_id=:model_id
+        group by k.descendant
+        order by num_in_nodes desc
+    """,
+)
+
+
+def to_node_query(model_id, backend="mssql", closure=False):
+    """returns all elements that can reach a given node, for all nodes in the model.
+
+    Args:
+        model_id (str): id of the model to query from
+        backend (str, optional): SQL dialect, "mssql" or "sqlite". Defaults to "mssql".
+        closure (bool, optional): whether to count ancestors in the GEMDClosure of the model instead of following
+            edges recursively. Defaults to False.
+
+    Returns:
+        TextClause: statement, with values bound
     """
+    name = "to_node_query:closure" if closure else "to_node_query"
+    return statements.bind(name, backend, model_id=int(model_id))
 
 
-def multiple_paths_nodes_query(model_id):
-    return f"""
+statements.register(
+    "multiple_paths_nodes_query",
+    mssql="""
     with gr as (
     select c.uid as root_uid
     ,      c.gemd_type as root_type
@@ -168,7 +327,7 @@ def multiple_paths_nodes_query(model_id):
     ,      cast(NULL as varchar(32)) as endpoint_type
     ,      c.uid as from_uid, cast(NULL as bigint) as edge_id, cast(NULL as varchar(64)) as gemd_ref
     ,      cast(gemd_type+c.uid as varchar(max)) as [path]
-    from GEMDObject c where c.model_id={model_id} AND gemd_type='material_run' 
+    from GEMDObject c where c.model_id=:model_id AND gemd_type='material_run' 
     union all
     select gr.root_uid, gr.root_type, gr.level+1, e.to_uid, c.gemd_type
     ,      e.to_uid, e.id, e.gemd_ref
@@ -184,19 +343,142 @@ def multiple_paths_nodes_query(model_id):
     from gr
     group by root_type, root_uid, endpoint_uid,endpoint_type having count(*) > 1  -- if you want to find multiple paths between nodes
     order by root_type,root_uid, endpoint_uid,path
-    """
+    """,
+    sqlite="""
+    with recursive gr as (
+    select c.uid as root_uid
+    ,      c.gemd_type as root_type
+    ,      0 as level
+    ,      NULL as endpoint_uid
+    ,      NULL as endpoint_type
+    ,      c.uid as from_uid, NULL as edge_id, NULL as gemd_ref
+    ,      gemd_type||c.uid as [path]
+    from GEMDObject c where c.model_id=:model_id AND gemd_type='material_run'
+    union all
+    select gr.root_uid, gr.root_type, gr.level+1, e.to_uid, c.gemd_type
+    ,      e.to_uid, e.id, e.gemd_ref
+    ,      gr.path||'==>'||e.gemd_ref||':'||e.to_uid
+    from gr
+    join GEMDEdge e on e.from_uid=gr.from_uid
+    join GEMDObject c on c.uid=e.to_uid
+    where gr.level < 16
+    )
+    select root_uid, root_type, endpoint_uid, endpoint_type
+    ,      min(path) as path, min(level) as min_level, max(level) as max_level
+    ,      count(*) as num_paths
+    from gr
+    group by root_type, root_uid, endpoint_uid,endpoint_type having count(*) > 1
+    order by root_type,root_uid, endpoint_uid,path
+    """,
+)
 
 
-def return_all_paths(model_id):
-    """return all paths between all nodes, if exst.
+statements.register(
+    "multiple_paths_nodes_query:closure",
+    portable="""
+    select k.ancestor as root_uid, r.gemd_type as root_type
+    ,      k.descendant as endpoint_uid, c.gemd_type as endpoint_type
+    ,      k.depth as min_level, k.max_depth as max_level
+    ,      k.paths as num_paths
+    from GEMDClosure k
+    join GEMDObject r on r.uid=k.ancestor
+    join GEMDObject c on c.uid=k.descendant
+    where r.model_id=:model_id AND r.gemd_type='material_run' AND k.paths > 1
+    order by root_type, root_uid, endpoint_uid
+    """,
+)
+
+
+def multiple_paths_nodes_query(model_id, backend="mssql", closure=False):
+    """returns the pairs of material runs and objects linked by more than one path.
 
     Args:
         model_id (str): id of the model to query from
+        backend (str, optional): SQL dialect, "mssql" or "sqlite". Defaults to "mssql".
+        closure (bool, optional): whether to read path counts from the GEMDClosure of the model instead of
+            following edges recursively. The path column, an example of the paths, isn't returned then.
+            Defaults to False.
 
     Returns:
-        _type_: str
+        TextClause: statement, with values bound
     """
-    return f"""
+    name = (
+        "multiple_paths_nodes_query:closure" if closure else "multiple_paths_nodes_query"
+    )
+    return statements.bind(name, backend, model_id=int(model_id))
+
+
+statements.register(
+    "ancestors_query",
+    portable="""
+    select k.ancestor, c.gemd_type as ancestor_type, k.depth, k.paths
+    from GEMDClosure k
+    join GEMDObject c on c.uid=k.ancestor
+    where k.descendant=:uid
+    order by k.depth, k.ancestor
+    """,
+)
+
+
+def ancestors_query(uid, backend="mssql"):
+    """returns all the elements that can reach the node, looked up in GEMDClosure.
+
+    Args:
+        uid (str): unique identifier of object to query with
+        backend (str, optional): SQL dialect, "mssql" or "sqlite". Defaults to "mssql".
+
+    Returns:
+        TextClause: statement, with values bound
+    """
+    return statements.bind("ancestors_query", backend, uid=uid)
+
+
+statements.register(
+    "create_closure_query",
+    mssql="""
+    with gr as (
+    select c.uid as root_uid, c.uid as node_uid, 0 as level
+    from GEMDObject c where c.model_id=:model_id
+    union all
+    select gr.root_uid, e.to_uid, gr.level+1
+    from gr
+    join GEMDEdge e on e.from_uid=gr.node_uid
+    where gr.level < 16
+    )
+    insert into GEMDClosure (ancestor, descendant, model_id, depth, max_depth, paths)
+    select root_uid, node_uid, :model_id, min(level), max(level), count(*)
+    from gr
+    where level > 0
+    group by root_uid, node_uid
+    """,
+    sqlite="""
+    with recursive gr as (
+    select c.uid as root_uid, c.uid as node_uid, 0 as level
+    from GEMDObject c where c.model_id=:model_id
+    union all
+    select gr.root_uid, e.to_uid, gr.level+1
+    from gr
+    join GEMDEdge e on e.from_uid=gr.node_uid
+    where gr.level < 16
+    )
+    insert into GEMDClosure (ancestor, descendant, model_id, depth, max_depth, paths)
+    select root_uid, node_uid, :model_id, min(level), max(level), count(*)
+    from gr
+    where level > 0
+    group by root_uid, node_uid
+    """,
+)
+
+
+def create_closure_query(model_id, backend="mssql"):
+    """creates and stores the 'GEMDClosure' of a model from its pre-existing 'GEMDEdge's, for models loaded
+    without it"""
+    return statements.bind("create_closure_query", backend, model_id=int(model_id))
+
+
+statements.register(
+    "return_all_paths",
+    mssql="""
         with gr as (
         select c.uid as root_uid
         ,      c.gemd_type as root_type
@@ -204,7 +486,7 @@ def return_all_paths(model_id):
         ,      cast(NULL as varchar(64)) as endpoint_uid
         ,      c.uid as from_uid, cast(NULL as bigint) as edge_id, cast(NULL as varchar(64)) as gemd_ref
         ,      cast(gemd_type+':'+c.uid as varchar(max)) as [path]
-        from GEMDObject c where c.model_id={model_id} 
+        from GEMDObject c where c.model_id=:model_id 
         union all
         select gr.root_uid, gr.root_type, gr.level+1, e.to_uid
         ,      e.to_uid, e.id, e.gemd_ref
@@ -218,14 +500,54 @@ def return_all_paths(model_id):
         ,      path, level
         from gr
         order by root_type,root_uid, path
-        """
+        """,
+    sqlite="""
+        with recursive gr as (
+        select c.uid as root_uid
+        ,      c.gemd_type as root_type
+        ,      0 as level
+        ,      NULL as endpoint_uid
+        ,      c.uid as from_uid, NULL as edge_id, NULL as gemd_ref
+        ,      gemd_type||':'||c.uid as [path]
+        from GEMDObject c where c.model_id=:model_id
+        union all
+        select gr.root_uid, gr.root_type, gr.level+1, e.to_uid
+        ,      e.to_uid, e.id, e.gemd_ref
+        ,      gr.path||'==>'||e.gemd_ref||':'||e.to_uid
+        from gr
+        join GEMDEdge e on e.from_uid=gr.from_uid
+        where gr.level < 16
+        )
+        select root_uid, root_type, endpoint_uid
+        ,      edge_id,gemd_ref
+        ,      path, level
+        from gr
+        order by root_type,root_uid, path
+        """,
+)
+
+
+def return_all_paths(model_id, backend="mssql"):
+    """return all paths between all nodes, if exst.
 
+    Args:
+        model_id (str): id of the model to query from
+        backend (str, optional): SQL dialect, "mssql" or "sqlite". Defaults to "mssql".
 
-###############################
+    Returns:
+        TextClause: statement, with values bound
+    """
+    return statements.bind("return_all_paths", backend, model_id=int(model_id))
 
 
-def create_tables_query():
+def create_tables_query(backend="mssql"):
     """creates a table with the designed GEMD schema."""
+    if backend == "sqlite":
+        dialect = sqlalchemy.dialects.sqlite.dialect()
+        return ";\n".join(
+            str(sqlalchemy.schema.CreateTable(table).compile(dialect=dialect)).strip()
+            for table in schema.metadata.sorted_tables
+        )
 
     return f"""
     create table {model_table_name} (
@@ -261,62 +583,80 @@ def create_tables_query():
     , to_uid varchar(64) not null
     , gemd_ref varchar(64) not null
     )
+
+    CREATE TABLE {closure_table_name}(
+        ancestor varchar(64) not null
+    , descendant varchar(64) not null
+    , model_id bigint not null
+    , depth int not null
+    , max_depth int not null
+    , paths bigint not null
+    , constraint pk_GEMDClosure primary key(ancestor, descendant)
+    )
+    CREATE INDEX ix_GEMDClosure_descendant ON {closure_table_name}(descendant, ancestor)
     """
 
 
-def create_edges_query(model_id):
-    """creates and stores 'GEMDEdge's based on pre-existing 'GEMDObject's"""
-    return f"""insert into GEMDEdge
+statements.register(
+    "create_edges_query",
+    mssql="""insert into GEMDEdge
     select uid,material_run_uid, 'ingredient_run:material_run'
-    from ingredient_run WHERE model_id={model_id} AND material_run_uid is not null
+    from ingredient_run WHERE model_id=:model_id AND material_run_uid is not null
     union
     select uid,process_run_uid, 'ingredient_run:process_run'
-    from ingredient_run WHERE model_id={model_id} AND process_run_uid is not null
+    from ingredient_run WHERE model_id=:model_id AND process_run_uid is not null
     union
     select uid,spec_uid, 'ingredient_run:spec'
-    from ingredient_run WHERE model_id={model_id} AND process_run_uid is not null
+    from ingredient_run WHERE model_id=:model_id AND process_run_uid is not null
     union
     select uid,process_spec_uid, 'ingredient_spec:process_spec'
-    from ingredient_spec WHERE model_id={model_id} AND process_spec_uid is not null
+    from ingredient_spec WHERE model_id=:model_id AND process_spec_uid is not null
     union
     select uid,material_spec_uid, 'ingredient_spec:material_spec'
-    from ingredient_spec WHERE model_id={model_id} AND material_spec_uid is not null
+    from ingredient_spec WHERE model_id=:model_id AND material_spec_uid is not null
     union
     select uid,spec_uid, 'material_run:spec'
-    from material_run WHERE model_id={model_id} AND spec_uid is not null
+    from material_run WHERE model_id=:model_id AND spec_uid is not null
     union
     select uid, process_run_uid, 'material_run:process_run'
-    from material_run WHERE model_id={model_id} AND process_run_uid is not null
+    from material_run WHERE model_id=:model_id AND process_run_uid is not null
     union
     select uid,process_spec_uid, 'material_spec:process_spec'
-    from material_spec WHERE model_id={model_id} AND process_spec_uid is not null
+    from material_spec WHERE model_id=:model_id AND process_spec_uid is not null
     union
     select uid,template_uid, 'material_spec:template'
-    from material_spec WHERE model_id={model_id} AND template_uid is not null
+    from material_spec WHERE model_id=:model_id AND template_uid is not null
     union
     select uid,spec_uid, 'measurement_run:spec'
-    from measurement_run WHERE model_id={model_id} AND spec_uid is not null
+    from measurement_run WHERE model_id=:model_id AND spec_uid is not null
     union
     select uid,material_uid, 'measurement_run:material'
-    from measurement_run WHERE model_id={model_id} AND material_uid is not null
+    from measurement_run WHERE model_id=:model_id AND material_uid is not null
     union
     select uid,template_uid, 'measurement_spec:template'
-    from measurement_spec WHERE model_id={model_id} AND template_uid is not null
+    from measurement_spec WHERE model_id=:model_id AND template_uid is not null
     union
     select uid,spec_uid, 'process_run:spec'
-    from process_run WHERE model_id={model_id} AND spec_uid is not null
+    from process_run WHERE model_id=:model_id AND spec_uid is not null
     union
     select uid,template_uid, 'process_spec:template'
-    from process_spec WHERE model_id={model_id} AND template_uid is not null
-    """
+    from process_spec WHERE model_id=:model_id AND template_uid is not null
+    """,
+)
 
 
-def create_attributes_query(model_id):
-    return f"""
+def create_edges_query(model_id):
+    """creates and stores 'GEMDEdge's based on pre-existing 'GEMDObject's"""
+    return statements.bind("create_edges_query", model_id=int(model_id))
+
+
+statements.register(
+    "create_attributes_query",
+    mssql="""
         with a as (
         select s.uid, s.gemd_type
         ,      sp.*
-        from GEMDObject s where model_id={model_id}
+        from GEMDObject s where model_id=:model_id
         cross apply OPENJSON(s.context,'$.parameters') with (
             template_id nvarchar(128) '$.template.id',
             name nvarchar(128) '$.name',
@@ -338,60 +678,97 @@ def create_attributes_query(model_id):
         ,      a.attribute_type
         ,      a.parameter, NULL
         from a 
-    """
-
-
-def prepare_classes(db_engine):
-    try:
-        Base = automap_base()
-        Base.prepare(db_engine, reflect=True)
-        for c in Base.classes:
-            print(c)
-        GEMDObject = Base.classes.GEMDObject
-        GEMDModel = Base.classes.GEMDModel
-        return GEMDObject, GEMDModel
-    except Exception as e:
-        raise e
+    """,
+)
 
 
-def load_model_query(name, db, dirpath, uuid):
-    """function to load a model into the base
+def create_attributes_query(model_id):
+    return statements.bind("create_attributes_query", model_id=int(model_id))
+
+
+def load_model_query(
+    name,
+    db,
+    dirpath,
+    uuid,
+    n_workers=None,
+    batch_size=1000,
+    edges=True,
+    attributes=True,
+    closure=False,
+):
+    """function to load a model into the base. Objects are streamed from disk and inserted in batches with
+    executemany Core inserts, and their edges and attributes are computed from the same objects as they are read,
+    in a single transaction.
 
     Args:
         name (str): name of the model
         dirpath (str): path to folder or single file containing JSONs
         uuid (str, optional): _description_.
+        n_workers (int, optional): number of processes to parse the JSONs with. Defaults to None (serial).
+        batch_size (int, optional): number of objects inserted per statement. Defaults to 1000.
+        edges (bool, optional): whether to load GEMDEdges. Defaults to True.
+        attributes (bool, optional): whether to load GEMDAttributes. Defaults to True.
+        closure (bool, optional): whether to load the GEMDClosure of the model, computed from its edges once all
+            objects are read, for the reachability queries. Defaults to False.
+
+    Returns:
+        int: id of the model
     """
     print("Loading model and GEMDObjects...")
-
-    GEMDObject, GEMDModel = prepare_classes(db.ENGINE)
-
-    # creating GEMDModels
-    model = GEMDModel(name=name)
-
-    # creating GEMDObjects
-    files = read_gemd_data(dirpath, GEMDJson())
-    for f in files:
-        try:
-            GEMDObject(
-                gemd_type=f["type"],
-                uid=f["uids"][uuid][:64],
-                context=json.dumps(f),
-                gemdmodel=model,
-            )
-        except Exception as e:
-            print("ERROR:", e)
-
-    session = Session(db.ENGINE)
-    session.add(model)
-    session.commit()
-    print("Session commited.")
-
-    # print("Loading GEMDEdges and GEMDAttributes...")
-    # # creating GEMDEdges
-    # db.execute_query(create_edges_query(model.id))
-
-    # # creating GEMDEdges
-    # db.execute_query(create_attributes_query(model.id))
-
-    print("Queries executed.")
+    counts = {"objects": 0, "edges": 0, "attributes": 0, "closure": 0}
+    closure_edges = []
+    with db.ENGINE.begin() as conn:
+        model_id = conn.execute(
+            schema.GEMDModel.insert().values(name=name)
+        ).inserted_primary_key[0]
+        for batch in bulk.batches(
+            iter_gemd_data(dirpath, GEMDJson(), n_workers=n_workers), batch_size
+        ):
+            object_rows, edge_rows, attribute_rows = [], [], []
+            for f, _ in batch:
+                try:
+                    uid = f["uids"][uuid][:64]
+                    object_rows.append(
+                        {
+                            "uid": uid,
+                            "model_id": model_id,
+                            "gemd_type": f["type"],
+                            "context": json.dumps(f),
+                        }
+                    )
+                except Exception as e:
+                    print("ERROR:", e)
+                    continue
+                if edges or closure:
+                    object_edges = bulk.gemd_edges(f, uid, uuid)
+                    if edges:
+                        edge_rows.extend(object_edges)
+                    if closure:
+                        closure_edges.extend(object_edges)
+                if attributes:
+                    attribute_rows.extend(bulk.gemd_attributes(f, uid))
+            for table, rows in [
+                (schema.GEMDObject, object_rows),
+                (schema.GEMDEdge, edge_rows),
+                (schema.GEMDAttribute, attribute_rows),
+            ]:
+                if rows:
+                    conn.execute(table.insert(), rows)
+            counts["objects"] += len(object_rows)
+            counts["edges"] += len(edge_rows)
+            counts["attributes"] += len(attribute_rows)
+        if closure:
+            print("Loading GEMDClosure...")
+            for rows in bulk.batches(
+                bulk.closure_rows(closure_edges, model_id), batch_size
+            ):
+                conn.execute(schema.GEMDClosure.insert(), rows)
+                counts["closure"] += len(rows)
+            print(f"{counts['closure']} closure rows.")
+    print(
+        "Model {} loaded: {objects} objects, {edges} edges, {attributes} attributes.".format(
+            model_id, **counts
+        )
+    )
+    return model_id
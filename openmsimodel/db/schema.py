@@ -0,0 +1,61 @@
+import sqlalchemy as sqla
+
+# SQLite only auto-increments INTEGER PRIMARY KEY columns
+_Identity = sqla.BigInteger().with_variant(sqla.Integer(), "sqlite")
+
+metadata = sqla.MetaData()
+
+GEMDModel = sqla.Table(
+    "GEMDModel",
+    metadata,
+    sqla.Column("id", _Identity, primary_key=True, autoincrement=True),
+    sqla.Column("name", sqla.String(1024), nullable=False),
+)
+
+GEMDObject = sqla.Table(
+    "GEMDObject",
+    metadata,
+    sqla.Column("uid", sqla.String(64), primary_key=True),
+    sqla.Column(
+        "model_id", sqla.BigInteger, sqla.ForeignKey("GEMDModel.id"), nullable=False
+    ),
+    sqla.Column("gemd_type", sqla.String(32), nullable=False),
+    sqla.Column("context", sqla.Text, nullable=False),
+)
+
+GEMDAttribute = sqla.Table(
+    "GEMDAttribute",
+    metadata,
+    sqla.Column("gemdobject_uid", sqla.String(64), nullable=False),
+    sqla.Column("template_id", sqla.Unicode(128)),
+    sqla.Column("name", sqla.Unicode(128)),
+    sqla.Column("value", sqla.Unicode(4000)),
+    sqla.Column("value_type", sqla.Unicode(32)),
+    sqla.Column("value_units", sqla.Unicode(128)),
+    sqla.Column("attribute_type", sqla.Unicode(128)),
+    sqla.Column("property", sqla.UnicodeText),
+    sqla.Column("conditions", sqla.UnicodeText),
+)
+
+GEMDEdge = sqla.Table(
+    "GEMDEdge",
+    metadata,
+    sqla.Column("id", _Identity, primary_key=True, autoincrement=True),
+    sqla.Column("from_uid", sqla.String(64), nullable=False),
+    sqla.Column("to_uid", sqla.String(64), nullable=False),
+    sqla.Column("gemd_ref", sqla.String(64), nullable=False),
+)
+
+# transitive closure of GEMDEdge: one row per pair of objects linked by a path of at most 16 edges, with the
+# shortest and longest path lengths and the number of paths between them
+GEMDClosure = sqla.Table(
+    "GEMDClosure",
+    metadata,
+    sqla.Column("ancestor", sqla.String(64), primary_key=True),
+    sqla.Column("descendant", sqla.String(64), primary_key=True),
+    sqla.Column("model_id", sqla.BigInteger, nullable=False),
+    sqla.Column("depth", sqla.Integer, nullable=False),
+    sqla.Column("max_depth", sqla.Integer, nullable=False),
+    sqla.Column("paths", sqla.BigInteger, nullable=False),
+    sqla.Index("ix_GEMDClosure_descendant", "descendant", "ancestor"),
+)
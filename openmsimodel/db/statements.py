@@ -0,0 +1,92 @@
+import sqlalchemy
+
+# GEMD object types, which are also the names of the per-type views of the MSSQL database
+GEMD_TYPES = [
+    "material_spec",
+    "material_run",
+    "process_spec",
+    "process_run",
+    "ingredient_spec",
+    "ingredient_run",
+    "measurement_spec",
+    "measurement_run",
+    "material_template",
+    "process_template",
+    "measurement_template",
+    "condition_template",
+    "parameter_template",
+    "property_template",
+]
+
+# SQL of the registered statements, by name then backend, with :named bound parameters
+SQL = {}
+# sqlalchemy.text statements, by (name, backend), built once
+_statements = {}
+
+
+def register(name, **sql):
+    """registers the SQL of a statement, given for each backend as keyword arguments (e.g., mssql=..., sqlite=...).
+    SQL that runs on every backend is given as portable=... instead, and is used by backends without their own.
+
+    Args:
+        name (str): name of the statement
+        **sql (str): SQL by backend, or portable, with bound parameters written as :name
+    """
+    SQL[name] = sql
+    for key in [key for key in _statements if key[0] == name]:
+        del _statements[key]
+
+
+def statement(name, backend="mssql"):
+    """returns the sqlalchemy.text statement registered as name, for backend. Statements are built once per backend
+    and reused, and values are bound to them rather than formatted into their SQL, which keeps them from injecting
+    SQL. Values are still rendered into the SQL the server receives by drivers that bind on the client, such as
+    pymssql, so the server doesn't reuse plans across values.
+
+    Args:
+        name (str): name of the statement
+        backend (str, optional): SQL dialect, "mssql" or "sqlite". Defaults to "mssql".
+
+    Raises:
+        KeyError: if no statement is registered as name
+        ValueError: if the statement has neither SQL for backend nor portable SQL
+
+    Returns:
+        TextClause: statement, without values bound
+    """
+    key = (name, backend)
+    if key not in _statements:
+        if name not in SQL:
+            raise KeyError(f"no statement registered as '{name}'.")
+        sql = SQL[name].get(backend, SQL[name].get("portable"))
+        if sql is None:
+            raise ValueError(
+                f"statement '{name}' has no SQL for backend '{backend}', only for {sorted(SQL[name])}."
+            )
+        _statements[key] = sqlalchemy.text(sql)
+    return _statements[key]
+
+
+def bind(name, backend="mssql", **params):
+    """returns the statement registered as name, for backend, with params bound to it
+
+    Args:
+        name (str): name of the statement
+        backend (str, optional): SQL dialect, "mssql" or "sqlite". Defaults to "mssql".
+        **params: values of the bound parameters
+
+    Returns:
+        TextClause: statement, with values bound
+    """
+    return statement(name, backend).bindparams(**params)
+
+
+def gemd_type(value):
+    """checks that value is a GEMD object type, as used in identifiers that can't be bound (e.g., view names)
+
+    Raises:
+        ValueError: if value isn't a GEMD object type
+    """
+    if value not in GEMD_TYPES:
+        raise ValueError(f"unknown GEMD type '{value}', expected one of {GEMD_TYPES}.")
+    return value
@@ -1,5 +1,104 @@
 import uuid
-from gemd.util.impl import recursive_foreach
+from collections import Counter
+from collections.abc import Iterable, Mapping
+
+from gemd.entity.base_entity import BaseEntity
+from gemd.entity.dict_serializable import DictSerializable
+
+STOP = object()
+_LEAF_TYPES = (str, bytes, bytearray, int, float, bool, type(None))
+
+
+class _Leaving:
+    """marks the end of the visit of an entity on the stack of :func:`~traverse`, for post-order callbacks"""
+
+    __slots__ = ("entity",)
+
+    def __init__(self, entity):
+        self.entity = entity
+
+
+def traverse(obj, pre=None, post=None):
+    """
+    Walk the object graph of obj once, applying callbacks to every BaseEntity reached.
+
+    Like gemd's recursive_foreach, the walk goes through BaseEntity and DictSerializable members, mappings and
+    iterables, but every object is visited at most once, by identity, including the lists and dicts holding them
+    that recursive_foreach walks again each time they are reached. Objects are visited depth first.
+
+    Parameters
+    ----------
+    obj: BaseEntity, DictSerializable, Mapping or Iterable
+        root of the walk
+    pre: Callable[[BaseEntity], Any], optional
+        applied to every BaseEntity before the objects it links to (pre-order)
+    post: Callable[[BaseEntity], Any], optional
+        applied to every BaseEntity after the objects it links to (post-order)
+    Either callback can return STOP to end the walk.
+
+    Returns
+    -------
+    Counter
+        "entities" and "objects" visited, and "revisits" of objects already visited that were skipped
+
+    """
+    visited = {}  # id -> object, holding a reference so that ids stay unique during the walk
+    n_objects = n_entities = n_revisits = 0
+    stack = [obj]
+    while stack:
+        this = stack.pop()
+        this_type = type(this)
+        if this_type is _Leaving:
+            if post(this.entity) is STOP:
+                break
+            continue
+        if this_type in _LEAF_TYPES or isinstance(this, _LEAF_TYPES):
+            continue
+        key = id(this)
+        if key in visited:
+            n_revisits += 1
+            continue
+        visited[key] = this
+        n_objects += 1
+        if isinstance(this, BaseEntity):
+            n_entities += 1
+            if pre is not None and pre(this) is STOP:
+                break
+            if post is not None:
+                stack.append(_Leaving(this))
+        if isinstance(this, DictSerializable):
+            stack.extend(this.__dict__.values())
+        elif isinstance(this, Mapping):
+            stack.extend(this.keys())
+            stack.extend(this.values())
+        elif isinstance(this, Iterable):
+            stack.extend(this)
+    return Counter(objects=n_objects, entities=n_entities, revisits=n_revisits)
+
+
+def set_uuids(obj, scope):
+    """
+    Recursively assign a uuid to every BaseEntity that doesn't contain any uid, as gemd's set_uuids does,
+    visiting every object once (see :func:`~traverse`).
+
+    Parameters
+    ----------
+    obj: BaseEntity
+        object to recursively assign uuids to
+    scope: str
+        scope of the uuid to assign
+
+    Returns
+    -------
+    None
+
+    """
+
+    def func(base_obj):
+        if len(base_obj.uids) == 0:
+            base_obj.add_uid(scope, str(uuid.uuid4()))
+
+    traverse(obj, pre=func)
 
 
 def assign_uuid(obj, scope):
@@ -28,5 +127,5 @@ def assign_uuid(obj, scope):
             base_obj.add_uid(scope, str(uuid.uuid4()))
         return
 
-    recursive_foreach(obj, func)
+    traverse(obj, pre=func)
     return
@@ -0,0 +1,177 @@
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+
+class AttributeTable:
+    """
+    Columnar table of the attribute values (parameters, properties and conditions) of GEMD objects,
+    with one row per value: uid of the object, attribute name, kind, GEMD value type, and the value itself,
+    as numbers (nominal, lower and upper bounds, standard deviation) and units, or as text for non numeric values.
+    Rows are appended column by column while a graph is built, and turned into a pandas DataFrame at the end,
+    so that values can be filtered and colored on without parsing display strings back out.
+    Rows removed by incremental updates are only marked as such, and dropped from the columns once they are
+    the majority.
+    """
+
+    COLUMNS = [
+        "uid",
+        "attribute",
+        "kind",
+        "value_type",
+        "nominal",
+        "lower",
+        "upper",
+        "std",
+        "units",
+        "text",
+    ]
+    NUMERIC_COLUMNS = ["nominal", "lower", "upper", "std"]
+    CATEGORICAL_COLUMNS = ["attribute", "kind", "value_type", "units"]
+
+    def __init__(self):
+        self.columns = {column: [] for column in self.COLUMNS}
+        self.rows_of = defaultdict(list)  # uid -> positions of its rows
+        self.removed = set()  # positions of the rows removed, still in the columns
+
+    def __len__(self):
+        return len(self.columns["uid"]) - len(self.removed)
+
+    def append(self, uid, att):
+        """adds the value of a GEMD attribute, given as a thin dict
+
+        Args:
+            uid (str): uid of the object holding the attribute
+            att (dict): parameter, property, condition or property_and_conditions
+        """
+        if att["type"] == "property_and_conditions":
+            self.append(uid, att["property"])
+            for condition in att.get("conditions") or []:
+                self.append(uid, condition)
+            return
+        value = att.get("value")
+        row = dict.fromkeys(self.COLUMNS)
+        row["uid"] = uid
+        row["attribute"] = att["name"]
+        row["kind"] = att["type"]
+        if value is None:  # attribute without a value: no value columns
+            value = {}
+        value_type = row["value_type"] = value.get("type")
+        row["units"] = value.get("units")
+        if value_type in ("nominal_real", "nominal_integer"):
+            row["nominal"] = value["nominal"]
+        elif value_type in ("uniform_real", "uniform_integer"):
+            row["lower"] = value["lower_bound"]
+            row["upper"] = value["upper_bound"]
+        elif value_type == "normal_real":
+            row["nominal"] = value["mean"]
+            row["std"] = value["std"]
+        elif value_type == "nominal_categorical":
+            row["text"] = value["category"]
+        elif value_type == "empirical_formula":
+            row["text"] = value["formula"]
+        elif value_type == "nominal_composition":
+            row["text"] = str(value["quantities"])
+        elif value_type == "discrete_categorical":
+            row["text"] = str(value["probabilities"])
+        elif value_type in ("inchi", "smiles"):
+            row["text"] = value[value_type]
+        self.rows_of[uid].append(len(self.columns["uid"]))
+        for column, item in row.items():
+            self.columns[column].append(item)
+
+    def extend(self, uid, assets):
+        """adds the values of a list of GEMD attributes (see :func:`~append`)"""
+        for att in assets:
+            if isinstance(att, dict) and att.get("type"):
+                self.append(uid, att)
+
+    def remove(self, uids):
+        """removes the rows of the objects of uids, in time proportional to their number of rows
+
+        Args:
+            uids (set): uids of the objects
+        """
+        for uid in uids:
+            self.removed.update(self.rows_of.pop(uid, ()))
+        if len(self.removed) > len(self.columns["uid"]) // 2:
+            self.compact()
+
+    def compact(self):
+        """drops the rows removed from the columns"""
+        if not self.removed:
+            return
+        keep = [i for i in range(len(self.columns["uid"])) if i not in self.removed]
+        self.columns = {
+            column: [values[i] for i in keep] for column, values in self.columns.items()
+        }
+        self.removed = set()
+        self.rows_of = defaultdict(list)
+        for i, uid in enumerate(self.columns["uid"]):
+            self.rows_of[uid].append(i)
+
+    def to_frame(self, labels=None):
+        """returns the table as a pandas DataFrame, with float columns for numbers (NaN where missing)
+        and categorical columns for names, kinds, value types and units
+
+        Args:
+            labels (dict, optional): uid -> display name, added as a "label" column. Defaults to None.
+
+        Returns:
+            pandas.DataFrame: the table
+        """
+        keep = None
+        if self.removed:
+            keep = [i for i in range(len(self.columns["uid"])) if i not in self.removed]
+        data = {}
+        for column in self.COLUMNS:
+            values = self.columns[column]
+            if keep is not None:
+                values = [values[i] for i in keep]
+            if column in self.NUMERIC_COLUMNS:
+                data[column] = np.array(values, dtype=np.float64)
+            elif column in self.CATEGORICAL_COLUMNS:
+                data[column] = pd.Categorical(values)
+            else:
+                data[column] = values
+        frame = pd.DataFrame(data, columns=self.COLUMNS)
+        if labels is not None:
+            frame["label"] = frame["uid"].map(labels)
+        return frame
+
+    @classmethod
+    def values(cls, frame, attribute, column="nominal"):
+        """returns the numeric values of an attribute per object, e.g., to color nodes with
+
+        Args:
+            frame (pandas.DataFrame): table, as returned by to_frame
+            attribute (str): attribute name
+            column (str, optional): numeric column. Defaults to "nominal".
+
+        Returns:
+            pandas.Series: values indexed by uid, first value of every object
+        """
+        rows = frame[(frame["attribute"] == attribute) & frame[column].notna()]
+        return rows.drop_duplicates("uid").set_index("uid")[column]
+
+    @classmethod
+    def select(cls, frame, attribute, lower=None, upper=None, column="nominal"):
+        """returns the uids of the objects with a value of an attribute within bounds
+
+        Args:
+            frame (pandas.DataFrame): table, as returned by to_frame
+            attribute (str): attribute name
+            lower (float, optional): inclusive lower bound. Defaults to None.
+            upper (float, optional): inclusive upper bound. Defaults to None.
+            column (str, optional): numeric column. Defaults to "nominal".
+
+        Returns:
+            set: uids
+        """
+        mask = frame["attribute"] == attribute
+        if lower is not None:
+            mask &= frame[column] >= lower
+        if upper is not None:
+            mask &= frame[column] <= upper
+        return set(frame.loc[mask, "uid"])
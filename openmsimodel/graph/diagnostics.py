@@ -0,0 +1,125 @@
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+
+import networkx as nx
+
+
+@dataclass
+class GraphDiagnostics:
+    """
+    Report on the structure of a directed graph, as returned by diagnose_graph.
+    Printing it gives the human-readable summary.
+    """
+
+    nb_nodes: int
+    nb_edges: int
+    nb_isolates: int
+    has_cycles: bool
+    nb_cyclic_components: int
+    nb_strongly_connected_components: int
+    nb_weakly_connected_components: int
+    largest_strongly_connected_components: list
+    largest_weakly_connected_components: list
+    cycles: list = field(default_factory=list)
+    cycles_capped: bool = False
+    nb_objects: int = None
+    nb_disregarded: int = None
+    timings: dict = field(default_factory=dict)
+
+    def __str__(self):
+        lines = ["-- Analysis --"]
+        if self.nb_objects is not None:
+            lines.append(
+                "disregarded/total number of gemd objects: {}/{}".format(
+                    self.nb_disregarded, self.nb_objects
+                )
+            )
+        lines.append("nodes: {}, edges: {}".format(self.nb_nodes, self.nb_edges))
+        lines.append(
+            "cycles in the graph: {}{}".format(
+                "yes, in {} strongly connected components".format(
+                    self.nb_cyclic_components
+                )
+                if self.has_cycles
+                else "no",
+                "" if not self.cycles else ", e.g. {}".format(self.cycles),
+            )
+        )
+        lines.append(
+            "number of connected components: {} strongly, {} weakly".format(
+                self.nb_strongly_connected_components,
+                self.nb_weakly_connected_components,
+            )
+        )
+        lines.append(
+            "largest connected components: {} strongly, {} weakly".format(
+                self.largest_strongly_connected_components,
+                self.largest_weakly_connected_components,
+            )
+        )
+        lines.append("total nb of isolates in the graph: {}".format(self.nb_isolates))
+        return "\n".join(lines)
+
+
+def diagnose_graph(G, nb_objects=None, nb_disregarded=None, max_cycles=10, nb_largest=5):
+    """analyzes a directed graph in linear time: cycle presence comes from one pass over its strongly connected
+    components, components are counted and measured without building subgraphs,
+    and the enumeration of actual cycles stops after max_cycles.
+
+    Args:
+        G (NetworkX DiGraph): graph to analyze
+        nb_objects (int, optional): number of GEMD objects the graph was built from. Defaults to None.
+        nb_disregarded (int, optional): number of GEMD objects left out of the graph. Defaults to None.
+        max_cycles (int, optional): maximum number of cycles to list, 0 to only detect them. Defaults to 10.
+        nb_largest (int, optional): number of largest component sizes to report. Defaults to 5.
+
+    Returns:
+        GraphDiagnostics: the report
+    """
+    timings = {}
+
+    start = time.perf_counter()
+    scc_sizes = []
+    nb_cyclic_components = 0
+    for component in nx.strongly_connected_components(G):
+        scc_sizes.append(len(component))
+        # a component holds a cycle iff it has several nodes, or its single node has a self loop
+        node = next(iter(component))
+        if len(component) > 1 or G.has_edge(node, node):
+            nb_cyclic_components += 1
+    timings["strongly_connected_components"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    wcc_sizes = [len(c) for c in nx.weakly_connected_components(G)]
+    timings["weakly_connected_components"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cycles = []
+    if nb_cyclic_components and max_cycles > 0:
+        cycles = list(itertools.islice(nx.simple_cycles(G), max_cycles + 1))
+    cycles_capped = len(cycles) > max_cycles
+    cycles = cycles[:max_cycles]
+    timings["cycles"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    nb_isolates = nx.number_of_isolates(G)
+    timings["isolates"] = time.perf_counter() - start
+
+    return GraphDiagnostics(
+        nb_nodes=G.number_of_nodes(),
+        nb_edges=G.number_of_edges(),
+        nb_isolates=nb_isolates,
+        has_cycles=nb_cyclic_components > 0,
+        nb_cyclic_components=nb_cyclic_components,
+        nb_strongly_connected_components=len(scc_sizes),
+        nb_weakly_connected_components=len(wcc_sizes),
+        largest_strongly_connected_components=heapq.nlargest(nb_largest, scc_sizes),
+        largest_weakly_connected_components=heapq.nlargest(nb_largest, wcc_sizes),
+        cycles=cycles,
+        cycles_capped=cycles_capped,
+        nb_objects=nb_objects,
+        nb_disregarded=nb_disregarded,
+        timings=timings,
+    )
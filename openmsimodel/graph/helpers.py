@@ -1,8 +1,11 @@
 from yfiles_jupyter_graphs import GraphWidget
 import networkx as nx
 from webcolors import name_to_hex
+import matplotlib.pyplot as plt
+from matplotlib import colors
 import json
 from openmsimodel.graph.open_graph_widget import OpenGraphWidget
+from openmsimodel.utilities.io import read_graphml_cached
 
 
 def color_mapping(index, node):
@@ -12,7 +15,34 @@ def color_mapping(index, node):
         color = "white"
     return name_to_hex(color)
 
-def launch_graph_widget(graph_source, engine="yfiles"):
+def value_color_mapping(values, cmap="viridis", default="white"):
+    """returns a node color mapping coloring nodes on a colormap by a numeric value of their GEMD object,
+    e.g., from AttributeTable.values, found through their "uuid" attribute
+
+    Args:
+        values (dict or pandas.Series): uid -> value
+        cmap (str, optional): matplotlib colormap. Defaults to "viridis".
+        default (str, optional): color of the nodes without value. Defaults to "white".
+
+    Returns:
+        func: mapping (index, node) -> hex color
+    """
+    values = dict(values)
+    norm = colors.Normalize(
+        vmin=min(values.values(), default=0), vmax=max(values.values(), default=1)
+    )
+    colormap = plt.get_cmap(cmap)
+
+    def mapping(index, node):
+        uid = node["properties"].get("uuid")
+        if uid in values:
+            return colors.to_hex(colormap(norm(values[uid])))
+        return name_to_hex(default)
+
+    return mapping
+
+
+def launch_graph_widget(graph_source, engine="yfiles", color_values=None):
     print("Launching widget for {}".format(graph_source))
     if type(graph_source) == str:  # passing a single dot or graphml file
         if graph_source.endswith(".dot"):
@@ -20,12 +50,12 @@ def launch_graph_widget(graph_source, engine="yfiles"):
             graph_source = nx.Graph(dot)
         elif graph_source.endswith(".graphml"):
             if engine == "yfiles":
-                graph_source = nx.read_graphml(graph_source)
+                graph_source = read_graphml_cached(graph_source)
     elif type(graph_source) == list:  # passing a list of graphml files
-        merged_graph = nx.read_graphml(graph_source[0])
+        merged_graph = read_graphml_cached(graph_source[0])
         for i in range(1, len(graph_source)):
             next_graph = graph_source[i]
-            next_graph_ml = nx.read_graphml(next_graph)
+            next_graph_ml = read_graphml_cached(next_graph)
             merged_graph = nx.compose(merged_graph, next_graph_ml)
         graph_source = merged_graph
     elif (
@@ -36,7 +66,9 @@ def launch_graph_widget(graph_source, engine="yfiles"):
 
     if engine == "yfiles":
         w = GraphWidget(graph=graph_source)
-        w.set_node_color_mapping(color_mapping)
+        w.set_node_color_mapping(
+            color_mapping if color_values is None else value_color_mapping(color_values)
+        )
         w.directed = True
         w.hierarchic_layout()
         w.show()
@@ -0,0 +1,177 @@
+import hashlib
+import os
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import networkx as nx
+
+
+class FileManifest:
+    """
+    Record of the JSON files a graph was built from: path -> (mtime, size, content hash).
+    Contents are only hashed when the mtime or size of a file changed, so that touching a file isn't a change.
+    """
+
+    def __init__(self):
+        self.entries = {}
+
+    @staticmethod
+    def file_hash(path):
+        with open(path, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+
+    def diff(self, paths, complete=True):
+        """compares files to the manifest, and updates it.
+
+        Args:
+            paths (list): paths of the files to check
+            complete (bool, optional): whether paths lists every file of the source, so that the recorded files
+                missing from it are deleted. Otherwise, only the files of paths that don't exist anymore are.
+                Defaults to True.
+
+        Returns:
+            tuple: lists of added, changed and deleted paths, resolved
+        """
+        added, changed, deleted = [], [], []
+        seen = set()
+        for path in paths:
+            # resolved, so that relative and absolute paths to a file are the same entry
+            path = str(Path(path).resolve())
+            seen.add(path)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                if self.entries.pop(path, None) is not None:
+                    deleted.append(path)
+                continue
+            entry = self.entries.get(path)
+            if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+                continue
+            content_hash = self.file_hash(path)
+            self.entries[path] = (stat.st_mtime_ns, stat.st_size, content_hash)
+            if entry is None:
+                added.append(path)
+            elif entry[2] != content_hash:
+                changed.append(path)
+        if complete:
+            for path in [p for p in self.entries if p not in seen]:
+                del self.entries[path]
+                deleted.append(path)
+        return added, changed, deleted
+
+
+class IncrementalGraph:
+    """
+    Graph maintained from the contributions of the GEMD objects of individual files: the nodes and edges an object
+    adds, as recorded in a GraphBuffer from all the files holding it. Contributions are reference counted, so that
+    retracting an object only removes the nodes and edges no other object adds; the attributes of its own node are
+    cleared with it. The result is the graph a full build over the current files would give, up to the order of
+    nodes and edges.
+    """
+
+    def __init__(self, name):
+        self.G = nx.DiGraph(name=name)
+        self.manifest = FileManifest()
+        self.contributions = {}  # uid -> (nodes, edges)
+        self.labels = {}  # uid -> display name
+        self.paths_of = defaultdict(set)  # uid -> paths of the files holding its object
+        self.uid_of = {}  # path -> uid
+        self.node_refs = Counter()
+        self.edge_refs = Counter()
+        self.components = {}  # component key -> nodes, for the GraphML files written
+        self.component_of = {}
+
+    def register(self, path, uid):
+        """records that a file holds the object of uid"""
+        self.uid_of[path] = uid
+        self.paths_of[uid].add(path)
+
+    def forget(self, path):
+        """forgets the object a file held, and returns its uid (None if unknown)"""
+        uid = self.uid_of.pop(path, None)
+        if uid is not None:
+            self.paths_of[uid].discard(path)
+            if not self.paths_of[uid]:
+                del self.paths_of[uid]
+        return uid
+
+    def apply(self, uid, buffer):
+        """adds the contribution of an object to the graph
+
+        Args:
+            uid (str): uid of the GEMD object
+            buffer (GraphBuffer): nodes and edges added by the object, from all the files holding it
+
+        Returns:
+            set: nodes touched
+        """
+        G = self.G
+        for n, attrs in buffer.nodes.items():
+            self.node_refs[n] += 1
+            if n in G:
+                G.nodes[n].update(attrs)
+            else:
+                G.add_node(n, **attrs)
+        edges = []
+        for u, v, attrs in buffer.edges:
+            self.edge_refs[(u, v)] += 1
+            G.add_edge(u, v, **attrs)
+            edges.append((u, v))
+        self.contributions[uid] = (list(buffer.nodes), edges)
+        return set(buffer.nodes)
+
+    def retract(self, uid):
+        """removes the contribution of an object from the graph
+
+        Args:
+            uid (str): uid of the GEMD object
+
+        Returns:
+            set: nodes touched, including the ones removed
+        """
+        if uid not in self.contributions:
+            return set()
+        nodes, edges = self.contributions.pop(uid)
+        self.labels.pop(uid, None)
+        G = self.G
+        for e in edges:
+            self.edge_refs[e] -= 1
+            if self.edge_refs[e] == 0:
+                del self.edge_refs[e]
+                G.remove_edge(*e)
+        if uid in G:
+            G.nodes[uid].clear()
+        for n in nodes:
+            self.node_refs[n] -= 1
+            if self.node_refs[n] == 0:
+                del self.node_refs[n]
+                G.remove_node(n)
+        return set(nodes)
+
+    def affected_components(self, nodes):
+        """forgets the components holding any of nodes, and computes the current ones
+
+        Args:
+            nodes (set): nodes touched by an update
+
+        Returns:
+            tuple: keys of the components that don't exist anymore, and dict of key -> nodes of the new components
+        """
+        stale = {self.component_of[n] for n in nodes if n in self.component_of}
+        remaining = {n for n in nodes if n in self.G}
+        for key in stale:
+            for n in self.components.pop(key):
+                del self.component_of[n]
+                if n in self.G:
+                    remaining.add(n)
+        undirected = self.G.to_undirected(as_view=True)
+        new = {}
+        while remaining:
+            component = nx.node_connected_component(undirected, remaining.pop())
+            remaining -= component
+            key = hashlib.sha1(min(map(str, component)).encode()).hexdigest()[:16]
+            new[key] = component
+            self.components[key] = component
+            for n in component:
+                self.component_of[n] = key
+        return stale, new
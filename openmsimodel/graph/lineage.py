@@ -0,0 +1,125 @@
+from itertools import compress
+
+import networkx as nx
+
+_BINARY_DIGITS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def _selectors(bitset):
+    """returns the bits of an int as bytes of 0/1, least significant first, for itertools.compress"""
+    return bin(bitset)[:1:-1].encode().translate(_BINARY_DIGITS)
+
+
+class LineageIndex:
+    """
+    Reachability index of a directed graph, built once to answer any number of ancestors/descendants queries.
+    The graph is condensed into the DAG of its strongly connected components, sorted topologically once. A batch
+    of queries is then answered by a single pass over that DAG per direction, tagging every component with the
+    queried nodes reaching it (see :func:`~roots_of`): time is linear in the graph per batch, and memory is one bit
+    per queried node for the components reached, rather than a transitive closure, which is quadratic in the size
+    of the graph (e.g., a which=all graph, where templates connect every object).
+    The index reflects the graph at the time it was built: it must be rebuilt after the graph changes.
+    """
+
+    def __init__(self, G):
+        self.G = G
+        C = nx.condensation(G)
+        self.scc_of = C.graph["mapping"]  # node -> strongly connected component
+        self.order = list(nx.topological_sort(C))  # strongly connected components, in topological order
+        self.C = C
+
+    def reachable(self, node, ancestors=True, descendants=True):
+        """returns the ancestors and/or descendants of a node, as nx.ancestors and nx.descendants do
+
+        Args:
+            node: node of the graph
+            ancestors (bool, optional): whether to include the ancestors of the node. Defaults to True.
+            descendants (bool, optional): whether to include the descendants of the node. Defaults to True.
+
+        Returns:
+            set: nodes, without node itself
+        """
+        return self.lineage([node], ancestors=ancestors, descendants=descendants)[node]
+
+    def lineage(self, nodes, ancestors=True, descendants=True):
+        """returns the ancestors and/or descendants of several nodes at once, from a single traversal
+        (see :func:`~roots_of`)
+
+        Args:
+            nodes (iterable): nodes of the graph
+            ancestors (bool, optional): whether to include the ancestors of the nodes. Defaults to True.
+            descendants (bool, optional): whether to include the descendants of the nodes. Defaults to True.
+
+        Returns:
+            dict: node -> set of its ancestors and/or descendants, without the node itself
+        """
+        nodes = list(dict.fromkeys(nodes))
+        result = {node: set() for node in nodes}
+        for c, tag in self.roots_of(
+            nodes, ancestors=ancestors, descendants=descendants
+        ).items():
+            members = self.C.nodes[c]["members"]
+            for node in compress(nodes, _selectors(tag)):
+                result[node].update(members)
+        for node, reached in result.items():
+            reached.discard(node)
+        return result
+
+    def roots_of(self, roots, ancestors=True, descendants=True):
+        """tags the nodes reached from several roots in a single traversal of the graph: every strongly connected
+        component receives the bitset of the roots it is a descendant and/or an ancestor of, from its neighbors,
+        in one topological pass per direction over the whole condensed graph.
+
+        Args:
+            roots (list): nodes of the graph
+            ancestors (bool, optional): whether roots reach their ancestors. Defaults to True.
+            descendants (bool, optional): whether roots reach their descendants. Defaults to True.
+
+        Returns:
+            dict: strongly connected component -> bitset of the positions in roots of the roots reaching it,
+                for the components reached only
+        """
+        seeds = {}
+        for i, root in enumerate(roots):
+            c = self.scc_of[root]
+            seeds[c] = seeds.get(c, 0) | (1 << i)
+        order = self.order
+        tags = {}
+        directions = []
+        if descendants:
+            directions.append((order, self.C.predecessors))
+        if ancestors:
+            directions.append((order[::-1], self.C.successors))
+        for direction_order, neighbors in directions:
+            reached = {}
+            for c in direction_order:
+                tag = seeds.get(c, 0)
+                for neighbor in neighbors(c):
+                    tag |= reached.get(neighbor, 0)
+                if tag:
+                    reached[c] = tag
+            for c, tag in reached.items():
+                tags[c] = tags.get(c, 0) | tag
+        return tags
+
+    def provenance(self, roots, ancestors=True, descendants=True):
+        """returns the subgraph of every root with its ancestors and/or descendants, from a single traversal
+        (see :func:`~roots_of`)
+
+        Args:
+            roots (iterable): nodes of the graph
+            ancestors (bool, optional): whether to include the ancestors of the roots. Defaults to True.
+            descendants (bool, optional): whether to include the descendants of the roots. Defaults to True.
+
+        Returns:
+            dict: root -> subgraph view of G
+        """
+        roots = list(dict.fromkeys(roots))
+        nodes_of = {root: [] for root in roots}
+        for c, tag in self.roots_of(
+            roots, ancestors=ancestors, descendants=descendants
+        ).items():
+            members = self.C.nodes[c]["members"]
+            for root in compress(roots, _selectors(tag)):
+                nodes_of[root].extend(members)
+        return {root: self.G.subgraph(nodes) for root, nodes in nodes_of.items()}
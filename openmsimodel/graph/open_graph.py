@@ -1,6 +1,11 @@
 import json
 import networkx as nx
+from lxml import etree
+import numpy as np
 from collections import defaultdict
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+import gc
 import shutil
 import os
 import matplotlib.pyplot as plt
@@ -12,13 +17,305 @@ from gemd.json import GEMDJson
 
 from openmsimodel.utilities.argument_parsing import OpenMSIModelParser
 from openmsimodel.utilities.runnable import Runnable
+from openmsimodel.utilities import json_backend
 from openmsimodel.graph.helpers import launch_graph_widget
-from openmsimodel.utilities.io import read_gemd_data
+from openmsimodel.graph.diagnostics import diagnose_graph
+from openmsimodel.graph.incremental import IncrementalGraph
+from openmsimodel.graph.lineage import LineageIndex
+from openmsimodel.graph.attribute_table import AttributeTable
+from openmsimodel.graph.sampling import sample_gemd_data
+from openmsimodel.graph.summary import GraphSummary
+from openmsimodel.graph.rendering import summary_graph, render_graph, write_render_index
+from openmsimodel.utilities.io import (
+    iter_gemd_data,
+    list_gemd_files,
+    read_graphml_cached,
+    write_graph_cache,
+)
 
 import questionary
 import time
 
 
+@contextmanager
+def paused_gc(active=True):
+    """context manager disabling the cyclic garbage collector in its body, if active, and restoring its state after"""
+    was_enabled = gc.isenabled()
+    if active:
+        gc.disable()
+    try:
+        yield
+    finally:
+        if active and was_enabled:
+            gc.enable()
+
+
+class LazyGEMDObject:
+    """
+    Payload of the "object" node attribute in the raw layout, standing for the thin JSON of a GEMD object.
+
+    Objects read from a folder of thin JSONs only keep the path of their file and are re-read on demand; others keep
+    a reference to the dict they were parsed into. Either way, the JSON string is only built when it is needed,
+    i.e., when the graph is written to GraphML (see graphml_value) or the payload is converted with str().
+    """
+
+    __slots__ = ("data", "path")
+
+    def __init__(self, data=None, path=None):
+        self.data = data if path is None else None
+        self.path = path
+
+    def load(self):
+        """returns the GEMD object as a dict"""
+        if self.data is not None:
+            return self.data
+        with open(self.path) as fp:
+            return json_backend.load(fp)
+
+    def dumps(self):
+        """returns the GEMD object as a JSON string, identical to json.dumps of the dict it was read as"""
+        return json.dumps(self.load())
+
+    __str__ = dumps
+
+    def __eq__(self, other):
+        if not isinstance(other, LazyGEMDObject):
+            return NotImplemented
+        return self.path == other.path and self.data == other.data
+
+    def __repr__(self):
+        return "{}({})".format(
+            type(self).__name__, self.path if self.path is not None else "<dict>"
+        )
+
+
+def graphml_value(name, value):
+    """converts a node attribute to the value written to GraphML: lazy payloads to their JSON string,
+    and the dicts of tags and file links to their string representation"""
+    if isinstance(value, LazyGEMDObject):
+        return value.dumps()
+    if name in ("tags", "file_links") and value:
+        return str(value)
+    return value
+
+
+def graphml_type(name, value):
+    """type of graphml_value(name, value), without serializing anything"""
+    if isinstance(value, LazyGEMDObject) or (name in ("tags", "file_links") and value):
+        return str
+    return type(value)
+
+
+class GraphMLView:
+    """
+    Read-only view of a graph, whose node attributes are converted by graphml_value one node at a time,
+    when iterated over. It supports what the GraphML writer and write_graph_cache need.
+    """
+
+    def __init__(self, G):
+        self._G = G
+        self.graph = dict(G.graph)
+
+    def __iter__(self):
+        return iter(self._G)
+
+    def is_directed(self):
+        return self._G.is_directed()
+
+    def is_multigraph(self):
+        return self._G.is_multigraph()
+
+    def nodes(self, data=False):
+        if not data:
+            return self._G.nodes()
+        return (
+            (n, {k: graphml_value(k, v) for k, v in d.items()})
+            for n, d in self._G.nodes(data=True)
+        )
+
+    def edges(self, *args, **kwargs):
+        return self._G.edges(*args, **kwargs)
+
+
+GRAPHML_NAMESPACES = {
+    "xmlns": "http://graphml.graphdrawing.org/xmlns",
+    "xmlns:xsi": "http://www.w3.org/2001/XMLSchema-instance",
+    "xsi:schemaLocation": "http://graphml.graphdrawing.org/xmlns "
+    "http://graphml.graphdrawing.org/xmlns/1.0/graphml.xsd",
+}
+# GraphML types of attribute values, as NetworkX writes them
+GRAPHML_TYPES = {
+    **{t: "float" for t in (np.float64, np.float32, np.float16)},
+    **{
+        t: "int"
+        for t in (np.int8, np.int16, np.int32, np.int64, np.uint8, np.uint16, np.uint32, np.uint64)
+    },
+    **{t: "int" for t in (np.int_, np.intc, np.intp)},
+    str: "string",
+    int: "long",
+    float: "double",
+    bool: "boolean",
+}
+
+
+def graphml_xml_type(python_type):
+    """GraphML type of attribute values of python_type"""
+    try:
+        return GRAPHML_TYPES[python_type]
+    except KeyError as e:
+        raise TypeError(
+            f"GraphML does not support type {python_type} as data values."
+        ) from e
+
+
+def write_graphml(G, path, named_key_ids=False):
+    """writes a (non-multi) graph to a GraphML file, emitting nodes and edges to the file one at a time with lxml's
+    incremental writer, and converting node attributes on the fly with graphml_value, without modifying the graph.
+    The output is the same as write_graphml_lxml's would be on the converted graph: the keys are gathered in the
+    same order, with types given by graphml_type.
+
+    Args:
+        G (NetworkX graph): graph
+        path (str, Path): GraphML file
+        named_key_ids (bool, optional): whether to use attribute names as key ids. Defaults to False.
+    """
+    keys = {}  # (name, GraphML type, scope) -> key id
+    key_elements = []
+
+    def get_key(name, xml_type, scope, default):
+        if (name, xml_type, scope) not in keys:
+            key_id = name if named_key_ids else f"d{len(keys)}"
+            keys[(name, xml_type, scope)] = key_id
+            key_element = etree.Element(
+                "key",
+                {"id": key_id, "for": scope, "attr.name": name, "attr.type": xml_type},
+            )
+            if default is not None:
+                etree.SubElement(key_element, "default").text = str(default)
+            # NetworkX inserts each new key first
+            key_elements.insert(0, key_element)
+        return keys[(name, xml_type, scope)]
+
+    def data_elements(scope, data, default):
+        elements = []
+        for k, v in data.items():
+            key_id = get_key(str(k), graphml_xml_type(type(v)), scope, default.get(k))
+            element = etree.Element("data", key=key_id)
+            element.text = str(v)
+            elements.append(element)
+        return elements
+
+    graphdata = {
+        k: v for k, v in G.graph.items() if k not in ("id", "node_default", "edge_default")
+    }
+    node_default = G.graph.get("node_default", {})
+    edge_default = G.graph.get("edge_default", {})
+    view = GraphMLView(G)
+
+    for k, v in graphdata.items():
+        get_key(str(k), graphml_xml_type(type(v)), "graph", None)
+    for _, d in G.nodes(data=True):
+        for k, v in d.items():
+            get_key(str(k), graphml_xml_type(graphml_type(k, v)), "node", node_default.get(k))
+    for _, _, d in G.edges(data=True):
+        for k, v in d.items():
+            get_key(str(k), graphml_xml_type(type(v)), "edge", edge_default.get(k))
+
+    graph_attrs = {"edgedefault": "directed" if G.is_directed() else "undirected"}
+    if G.graph.get("id") is not None:
+        graph_attrs["id"] = G.graph["id"]
+    with open(path, "wb") as f, etree.xmlfile(f, encoding="utf-8") as xf:
+        xf.write_declaration()
+        with xf.element("graphml", GRAPHML_NAMESPACES):
+            for key_element in list(key_elements):
+                xf.write(key_element, pretty_print=True)
+            with xf.element("graph", graph_attrs):
+                for element in data_elements("graph", graphdata, {}):
+                    xf.write(element, pretty_print=True)
+                for n, d in view.nodes(data=True):
+                    element = etree.Element("node", id=str(n))
+                    element.extend(data_elements("node", d, node_default))
+                    xf.write(element, pretty_print=True)
+                for u, v, d in view.edges(data=True):
+                    element = etree.Element("edge", source=str(u), target=str(v))
+                    element.extend(data_elements("edge", d, edge_default))
+                    xf.write(element, pretty_print=True)
+
+
+_provenance_graph = None
+
+
+def _init_provenance_worker(G):
+    global _provenance_graph
+    _provenance_graph = G
+
+
+def _save_provenance_subgraph(G, nodes, path):
+    """writes the subgraph of G induced by nodes as GraphML, with its cache"""
+    subgraph = G.subgraph(nodes)
+    subgraph.graph = {**G.graph, "name": pathlib.Path(path).stem}
+    write_graphml(subgraph, path, named_key_ids=True)
+    write_graph_cache(GraphMLView(subgraph), path)
+    return path
+
+
+def _write_provenance(job):
+    """writes a provenance subgraph of the graph of the worker process"""
+    return _save_provenance_subgraph(_provenance_graph, *job)
+
+
+class GraphBuffer:
+    """
+    Accumulates nodes and edges during a scan of GEMD objects, to insert them afterwards into a NetworkX graph
+    in one add_nodes_from and one add_edges_from call.
+
+    It supports the subset of the NetworkX graph interface used while building (add_node, add_edge, membership,
+    and access to node attributes through nodes[n]), with the same semantics: edges implicitly create their end nodes,
+    and adding an existing node or edge updates its attributes. Insertion order is kept, so the flushed graph is
+    identical to one built call by call.
+    """
+
+    def __init__(self):
+        self.nodes = {}
+        self.edges = []
+
+    def __contains__(self, n):
+        return n in self.nodes
+
+    def add_node(self, n, **attr):
+        if n in self.nodes:
+            self.nodes[n].update(attr)
+        else:
+            self.nodes[n] = attr
+
+    def add_edge(self, u, v, **attr):
+        self.add_edges_from([(u, v, attr)])
+
+    def add_edges_from(self, ebunch):
+        nodes = self.nodes
+        for e in ebunch:
+            if e[0] not in nodes:
+                nodes[e[0]] = {}
+            if e[1] not in nodes:
+                nodes[e[1]] = {}
+            self.edges.append(e)
+
+    def flush(self, G):
+        """inserts the buffered nodes and edges into G and empties the buffer
+
+        Args:
+            G (NetworkX graph): graph to insert into
+
+        Returns:
+            NetworkX graph: G
+        """
+        G.add_nodes_from(self.nodes.items())
+        self.nodes = {}
+        G.add_edges_from(self.edges)
+        self.edges = []
+        return G
+
+
 class OpenGraph(Runnable):
     """
     Provides modules to build and visualize a networkx or graphviz object from GEMD objects.
@@ -39,6 +336,22 @@ class OpenGraph(Runnable):
         pathlib.Path(__file__).parent.resolve() / "open_graph_visualization_nb/.config"
     )
 
+    PROGRESS_EVERY = 10000
+
+    GEMD_OBJECT_TYPES = {
+        "process": ("run", "spec", "template"),
+        "ingredient": ("run", "spec"),
+        "material": ("run", "spec", "template"),
+        "measurement": ("run", "spec", "template"),
+    }
+    GEMD_ATTRIBUTE_TYPES = ("condition", "parameter", "property")
+    COLORS = {
+        "process": "red",
+        "ingredient": "blue",
+        "material": "green",
+        "measurement": "purple",
+    }
+
     # TODO: move build_graph function params to obj + store pygraphviz and networkx as obj attr
     def __init__(
         self,
@@ -57,7 +370,18 @@ class OpenGraph(Runnable):
             "add_tags": 1,
         },
         dump_svg_and_dot=False,
-        uuid_to_track="auto"
+        uuid_to_track="auto",
+        n_workers=None,
+        bulk_insert=False,
+        keep_uid_keys=False,
+        render_components=False,
+        max_component_nodes=2000,
+        attribute_table=False,
+        sample=None,
+        sample_size=1000,
+        sample_seeds=None,
+        random_state=None,
+        summarize_by=None,
     ):
         """
         Initialize the OpenGraph object with provided parameters.
@@ -72,8 +396,41 @@ class OpenGraph(Runnable):
         :type layout: str
         :param add_bidirectional_edges: Flag to add bidirectional edges between nodes.
         :type add_bidirectional_edges: bool
-        :param take_small_sample: Flag to take a small sample of data for the graph.
+        :param take_small_sample: Flag to take the first quarter of the GEMD objects for the graph.
         :type take_small_sample: bool
+        :param n_workers: Number of processes used to parse the JSON files of a source folder. None reads serially.
+        :type n_workers: int, optional
+        :param bulk_insert: Flag to accumulate nodes and edges during the scan and insert them in bulk at the end,
+            instead of one add_node/add_edge call per relationship. The resulting graph is the same.
+        :type bulk_insert: bool
+        :param keep_uid_keys: Flag to keep uids as node keys and store display names in a "label" node attribute,
+            instead of relabeling the graph with display names, which copies it.
+        :type keep_uid_keys: bool
+        :param render_components: Flag to render SVG and DOT files per weakly connected component, concurrently
+            with n_workers processes and with an HTML index, instead of laying out the whole graph at once.
+        :type render_components: bool
+        :param max_component_nodes: Number of nodes above which a component is rendered as a summary
+            (one node per GEMD type) instead of being laid out.
+        :type max_component_nodes: int
+        :param attribute_table: Flag to collect the attribute values of the visualisation layout into a columnar
+            table (see :class:`~AttributeTable`), available as attribute_frame after a build,
+            instead of formatting them into node attribute strings.
+        :type attribute_table: bool
+        :param sample: Strategy to sample the GEMD objects with while keeping the graph connected: "bfs", "random_walk",
+            "stratified" or "closure" (see :func:`~sample_gemd_data`). None keeps every object.
+        :type sample: str, optional
+        :param sample_size: Maximum number of GEMD objects to sample.
+        :type sample_size: int
+        :param sample_seeds: Uids of the objects to start "bfs" and "random_walk" sampling from.
+            Defaults to the material runs, in random order.
+        :type sample_seeds: list, optional
+        :param random_state: Seed of the random number generator used for sampling.
+        :type random_state: int, optional
+        :param summarize_by: Grouping criterion ("template", "short_name", or a node attribute like "type") to render
+            graphs, and components with render_components, larger than max_component_nodes as summaries
+            (see :class:`~GraphSummary`), with at most max_component_nodes super-nodes.
+            Defaults to None, which lays out the whole graph, and summarizes components by type.
+        :type summarize_by: str, optional
         :raises FileNotFoundError: If the output path does not exist.
         """
         self.name = name
@@ -92,10 +449,42 @@ class OpenGraph(Runnable):
         self.assets_to_add = assets_to_add
         self.dump_svg_and_dot = dump_svg_and_dot
         self.uuid_to_track = uuid_to_track
+        self.n_workers = n_workers
+        self.bulk_insert = bulk_insert
+        self.keep_uid_keys = keep_uid_keys
+        self.render_components = render_components
+        self.max_component_nodes = max_component_nodes
+        self.render_index_path = None
+        self.attribute_table = attribute_table
+        self.sample = sample
+        self.sample_size = sample_size
+        self.sample_seeds = sample_seeds
+        self.random_state = random_state
+        self.summarize_by = summarize_by
+        self.attributes = None
+        self._attribute_labels = None
+        self._attribute_frame = None
+        self.attributes_path = None
         self.svg_path = None
         self.dot_path = None
         self.graphml_path = None
+        self.report = None
         self.shapes = {"run": "circle", "spec": "rectangle", "template": "triangle"}
+        self._dispatch_table = None
+        self._incremental = None
+
+    @property
+    def attribute_frame(self):
+        """
+        DataFrame of the attribute table, labelled with the node labels of the graph, or None before a build
+        or without attribute_table. It is built on first access after a build or an update, so that updates
+        don't rebuild it.
+        """
+        if self._attribute_frame is None and self._attribute_labels is not None:
+            self._attribute_frame = self.attributes.to_frame(
+                labels=self._attribute_labels
+            )
+        return self._attribute_frame
 
     # instance method
     def build_graph(self, save=False):
@@ -121,62 +510,97 @@ class OpenGraph(Runnable):
             )
         )
         G_nx = nx.DiGraph(name=self.name)
+        G_scan = GraphBuffer() if self.bulk_insert else G_nx
         object_mapping = defaultdict()
         name_mapping = defaultdict()
         encoder = GEMDJson()
         nb_disregarded = 0
-
-        gemd_objects, gemd_paths = read_gemd_data(self.source, encoder)
-
-        if len(gemd_objects) == 0:
-            print("No objects were found.")
-            return
-
-        full_length = len(gemd_objects)
-        quarter_length = int(full_length / 4)
-        if self.take_small_sample:
-            gemd_objects, gemd_paths = (
-                gemd_objects[:quarter_length],
-                gemd_paths[:quarter_length],
+        self._dispatch_table = self.build_dispatch_table()
+        self.attributes = self.new_attribute_table()
+
+        gemd_data = iter_gemd_data(self.source, encoder, n_workers=self.n_workers)
+
+        if self.take_small_sample:  # needs the full length, so materializing
+            gemd_data = list(gemd_data)
+            gemd_data = gemd_data[: int(len(gemd_data) / 4)]
+        elif self.sample:  # links are followed across the whole data, so materializing
+            gemd_data = list(gemd_data)
+            print("Sampling {} gemd objects ({})...".format(self.sample_size, self.sample))
+            gemd_data = sample_gemd_data(
+                gemd_data,
+                self.sample,
+                self.sample_size,
+                scope=self.uuid_to_track,
+                seeds=self.sample_seeds,
+                random_state=self.random_state,
             )
 
-        # adding objects to graph one by one
-        for i, obj_data in enumerate(gemd_objects):
-            obj_type = obj_data["type"]
-            obj_state = obj_type.split("_")[-1]
-            if not (self.uuid_to_track in obj_data["uids"].keys()):
-                continue
-            obj_uid = obj_data["uids"][self.uuid_to_track]
-            obj_name = obj_data["name"]
-            # name_mapping[obj_uid] = "{}".format(obj_name, obj_uid, obj_type) #FIXME
-            name_mapping[obj_uid] = "{} [{}, {}]".format(obj_name, obj_uid[:4], obj_type)
-            self.handle_gemd_obj(
-                G_nx,
-                obj_uid,
-                obj_data,
-                obj_type,
-                obj_state,
-            )
-            try:
-                path = gemd_paths[i]
-                self.add_to_graph(G_nx, obj_uid, "source", path.name)
-            except IndexError:
-                continue
-            if i % quarter_length == 0:
-                print("{}/{} gemd objects processed...".format(i, full_length))
-        print("Done.")
+        # objects of a folder of thin JSONs can be re-read from their own file, so their dicts aren't retained
+        from_folder = type(self.source) != list and self.source.is_dir()
+
+        # adding objects to graph one by one, as they are read
+        # in bulk mode, the cyclic garbage collector is paused while the buffer fills up: every pass would
+        # traverse all the containers accumulated so far, none of which can be garbage yet
+        with paused_gc(self.bulk_insert):
+            nb_objects = 0
+            for i, (obj_data, path) in enumerate(gemd_data):
+                nb_objects += 1
+                obj_type = obj_data["type"]
+                obj_state = obj_type.split("_")[-1]
+                if not (self.uuid_to_track in obj_data["uids"].keys()):
+                    continue
+                obj_uid = obj_data["uids"][self.uuid_to_track]
+                obj_name = obj_data["name"]
+                # name_mapping[obj_uid] = "{}".format(obj_name, obj_uid, obj_type) #FIXME
+                name_mapping[obj_uid] = "{} [{}, {}]".format(obj_name, obj_uid[:4], obj_type)
+                self.handle_gemd_obj(
+                    G_scan,
+                    obj_uid,
+                    obj_data,
+                    obj_type,
+                    obj_state,
+                    path if from_folder else None,
+                )
+                if path is not None:
+                    self.add_to_graph(G_scan, obj_uid, "source", path.name)
+                if (i + 1) % self.PROGRESS_EVERY == 0:
+                    print("{} gemd objects processed...".format(i + 1))
+            if nb_objects == 0:
+                print("No objects were found.")
+                return
+            print("Done. {} gemd objects processed.".format(nb_objects))
+            if self.bulk_insert:
+                print("Inserting nodes and edges...")
+                G_scan.flush(G_nx)
 
         # relabelling according to uid -> name
         relabeled_G_nx = G_nx
-        if name_mapping:
+        if name_mapping and self.keep_uid_keys:
+            print("Labeling nodes ...")
+            nx.set_node_attributes(G_nx, name_mapping, "label")
+        elif name_mapping:
             print("Relabeling nodes ...")
             relabeled_G_nx = nx.relabel_nodes(G_nx, name_mapping)
 
+        if self.attributes is not None:
+            self._attribute_labels = name_mapping
+            self._attribute_frame = None
+
         # converting to grapviz
         relabeled_G_gviz = None
-        if self.dump_svg_and_dot:
-            print("Generating Graphviz version...")
-            relabeled_G_gviz = self.map_to_graphviz(relabeled_G_nx)
+        if self.dump_svg_and_dot and not self.render_components:
+            if self.summarize_by and len(relabeled_G_nx) > self.max_component_nodes:
+                print("Generating Graphviz version of the summary by {}...".format(self.summarize_by))
+                relabeled_G_gviz = self.map_to_graphviz(
+                    self.summarize(
+                        relabeled_G_nx,
+                        by=self.summarize_by,
+                        max_groups=self.max_component_nodes,
+                    ).graph()
+                )
+            else:
+                print("Generating Graphviz version...")
+                relabeled_G_gviz = self.map_to_graphviz(relabeled_G_nx)
 
         # # plotting
         if save:
@@ -190,11 +614,276 @@ class OpenGraph(Runnable):
 
             self.update_paths(svg_path, dot_path, graphml_path)
 
+            if self.attribute_frame is not None:
+                self.attributes_path = os.path.join(
+                    self.output, "{}_{}_attributes.csv".format(self.name, self.which)
+                )
+                self.attribute_frame.to_csv(self.attributes_path, index=False)
+
+            if self.dump_svg_and_dot and self.render_components:
+                renders = self.render_graph_components(
+                    relabeled_G_nx,
+                    self.output,
+                    "{}_{}".format(self.name, self.which),
+                    n_workers=self.n_workers,
+                    max_component_nodes=self.max_component_nodes,
+                    summarize_by=self.summarize_by or "type",
+                )
+                self.render_index_path = write_render_index(
+                    self.output, "{}_{}".format(self.name, self.which), renders
+                )
+
         # info
-        self.diagnostics(relabeled_G_nx, gemd_objects, nb_disregarded)
+        self.report = self.diagnostics(relabeled_G_nx, nb_objects, nb_disregarded)
+        print(self.report)
 
         return relabeled_G_nx, relabeled_G_gviz, name_mapping
 
+    def update_graph(self, changed_paths=None, save=False):
+        """
+        Updates the graph incrementally from the files of a source folder that were added, changed or deleted
+        since the last call, and returns it. The first call builds it from every file.
+
+        Only the nodes and edges contributed by those files are patched, so the cost scales with the change set.
+        Nodes are keyed by uid, with display names in a "label" attribute (as with keep_uid_keys).
+
+        :param changed_paths: Paths of the files that may have changed, e.g., reported by a file watcher.
+            Defaults to None, which checks every file of the source folder against the manifest (as the first call does).
+        :type changed_paths: list, optional
+        :param save: Whether to rewrite the GraphML files of the connected components touched by the update,
+            in the "<name>_<which>_components" subfolder of the output, along with their SVG and DOT files
+            if dump_svg_and_dot is set.
+        :type save: bool, optional
+        :returns: A tuple of the NetworkX graph and the set of nodes touched by the update.
+        :rtype: tuple
+        :raises ValueError: If the source isn't a folder.
+        """
+        if type(self.source) == list or not self.source.is_dir():
+            raise ValueError(
+                f"incremental updates need a folder of thin JSONs as source, got {self.source}."
+            )
+        first = self._incremental is None
+        if first:
+            self._incremental = IncrementalGraph(self.name)
+            self._dispatch_table = self.build_dispatch_table()
+            self.attributes = self.new_attribute_table()
+        incremental = self._incremental
+        if changed_paths is None or first:
+            added, changed, deleted = incremental.manifest.diff(
+                list_gemd_files(self.source)
+            )
+        else:
+            added, changed, deleted = incremental.manifest.diff(
+                changed_paths, complete=False
+            )
+        print(
+            "-- Updating graph: {} added, {} changed, {} deleted files".format(
+                len(added), len(changed), len(deleted)
+            )
+        )
+
+        # the node of an object merges the attributes of all the files holding it, in reading order,
+        # so an object is re-ingested from all of them whenever one changes
+        objects = {}
+        uids = set()
+        for path in changed + deleted:
+            uids.add(incremental.forget(path))
+        for path in added + changed:
+            with open(path) as fp:
+                objects[path] = json_backend.load(fp)
+            if self.uuid_to_track in objects[path]["uids"]:
+                uid = objects[path]["uids"][self.uuid_to_track]
+                incremental.register(path, uid)
+                uids.add(uid)
+        uids.discard(None)
+
+        touched = set()
+        if self.attributes is not None:
+            self.attributes.remove(uids)
+        for uid in uids:
+            touched |= incremental.retract(uid)
+        for uid in uids:
+            paths = sorted(
+                incremental.paths_of.get(uid, ()),
+                key=lambda p: (pathlib.Path(p).parent.parts, os.path.basename(p)),
+            )
+            if not paths:
+                continue
+            buffer = GraphBuffer()
+            for path in paths:
+                if path in objects:
+                    obj_data = objects[path]
+                else:
+                    with open(path) as fp:
+                        obj_data = json_backend.load(fp)
+                obj_type = obj_data["type"]
+                incremental.labels[uid] = "{} [{}, {}]".format(
+                    obj_data["name"], uid[:4], obj_type
+                )
+                self.handle_gemd_obj(
+                    buffer,
+                    uid,
+                    obj_data,
+                    obj_type,
+                    obj_type.split("_")[-1],
+                    pathlib.Path(path),
+                )
+                self.add_to_graph(buffer, uid, "source", os.path.basename(path))
+            touched |= incremental.apply(uid, buffer)
+
+        G = incremental.G
+        for n in touched:
+            if n in G and n in incremental.labels:
+                G.nodes[n]["label"] = incremental.labels[n]
+        if self.attributes is not None:
+            self._attribute_labels = incremental.labels
+            self._attribute_frame = None
+
+        if save:
+            self.save_components(touched)
+        return G, touched
+
+    def save_components(self, nodes):
+        """(re)writes the GraphML (and, with dump_svg_and_dot, SVG and DOT) files of the connected components of the incrementally updated graph
+        that hold any of nodes, and deletes the files of the components that don't exist anymore.
+
+        :param nodes: Nodes touched by an update.
+        :type nodes: set
+        :returns: Paths of the GraphML files written.
+        :rtype: list
+        """
+        dest = self.output / "{}_{}_components".format(self.name, self.which)
+        dest.mkdir(exist_ok=True)
+        stale, new = self._incremental.affected_components(nodes)
+        for key in stale:
+            for suffix in ("graphml", "svg", "dot"):
+                path = dest / "{}.{}".format(key, suffix)
+                if path.exists():
+                    path.unlink()
+        graphml_paths = []
+        for key, component in new.items():
+            # copying, so that the attributes converted to strings for GraphML aren't the graph's
+            subgraph = self._incremental.G.subgraph(component).copy()
+            subgraph_gviz = None
+            if self.dump_svg_and_dot:
+                subgraph_gviz = self.map_to_graphviz(subgraph)
+            _, _, graphml_path = self.save_graph(
+                dest,
+                subgraph,
+                subgraph_gviz,
+                key,
+                dump_svg_and_dot=self.dump_svg_and_dot,
+            )
+            graphml_paths.append(graphml_path)
+        return graphml_paths
+
+    def build_dispatch_table(self):
+        """builds the table mapping every GEMD type string to what ingesting an object of that type requires,
+        i.e., the attributes of its node (None if no node is added) and the one routine extracting its links.
+        All the type-based decisions (self.which, object kind, state) are taken here once, instead of per object.
+
+        Returns:
+            dict: GEMD type -> (node attributes or None, link extraction routine)
+        """
+        link_extractors = {
+            "ingredient": self._ingredient_links,
+            "material": self._material_links,
+            "measurement": self._measurement_links,
+        }
+        dispatch_table = {}
+        for kind, states in self.GEMD_OBJECT_TYPES.items():
+            for state in states:
+                obj_type = f"{kind}_{state}"
+                node_attrs = None
+                extractors = []
+                if state == self.which or self.which == "all":
+                    node_attrs = {"color": self.COLORS[kind], "shape": self.shapes[state]}
+                    if kind in link_extractors:
+                        extractors.append(link_extractors[kind])
+                if self.which == "all":
+                    extractors.append(
+                        {
+                            "template": self._template_links,
+                            "spec": self._spec_links,
+                            "run": self._run_links,
+                        }[state]
+                    )
+                dispatch_table[obj_type] = (node_attrs, self._chain_links(extractors))
+        if self.which == "all":
+            for kind in self.GEMD_ATTRIBUTE_TYPES:
+                dispatch_table[f"{kind}_template"] = (
+                    {"color": "black", "shape": "trapezium"},
+                    self._chain_links([]),
+                )
+        return dispatch_table
+
+    def new_attribute_table(self):
+        """returns an empty table to collect attribute values into during a scan,
+        or None if they are formatted into node attributes"""
+        if self.attribute_table and self.layout == "visualisation":
+            return AttributeTable()
+        return None
+
+    def _chain_links(self, extractors):
+        """combines link extractors into one routine yielding (from, to, edge attributes),
+        adding the reverse edges if self.add_bidirectional_edges"""
+        add_bidirectional_edges = self.add_bidirectional_edges
+
+        def links(uid, obj_data):
+            for extractor in extractors:
+                for u, v, relationship, reverse_relationship in extractor(
+                    uid, obj_data
+                ):
+                    yield u, v, (
+                        {"relationship": relationship} if relationship else {}
+                    )
+                    if add_bidirectional_edges:
+                        yield v, u, (
+                            {"relationship": reverse_relationship}
+                            if reverse_relationship
+                            else {}
+                        )
+
+        return links
+
+    @staticmethod
+    def _ingredient_links(uid, obj_data):
+        yield uid, obj_data["process"]["id"], "is used in", "uses"
+        if "material" in obj_data and obj_data["material"]:
+            yield obj_data["material"]["id"], uid, "becomes", "is made out of"
+
+    @staticmethod
+    def _material_links(uid, obj_data):
+        if "process" in obj_data and obj_data["process"]:
+            yield obj_data["process"]["id"], uid, "creates", "is created by"
+
+    @staticmethod
+    def _measurement_links(uid, obj_data):
+        if "material" in obj_data and obj_data["material"]:
+            yield obj_data["material"]["id"], uid, "is measured with", "measures"
+
+    @staticmethod
+    def _template_links(uid, obj_data):
+        # adding attribute templates from object templates
+        for key in ("parameters", "conditions", "properties"):
+            if key in obj_data and obj_data[key]:
+                for attribute_template in obj_data[key]:
+                    yield uid, attribute_template[0]["id"], None, None
+
+    @staticmethod
+    def _spec_links(uid, obj_data):
+        if (
+            "template" in obj_data
+            and obj_data["template"] is not None
+            and "id" in obj_data["template"]
+        ):
+            yield uid, obj_data["template"]["id"], None, None
+
+    @staticmethod
+    def _run_links(uid, obj_data):
+        if "spec" in obj_data and "id" in obj_data["spec"]:
+            yield uid, obj_data["spec"]["id"], None, None
+
     def handle_gemd_obj(
         self,
         G,
@@ -202,120 +891,34 @@ class OpenGraph(Runnable):
         obj_data,
         obj_type,
         obj_state,
+        path=None,
     ):
-        """method to handle the addition of a gemd object
+        """method to handle the addition of a gemd object.
+        Costs one lookup in the dispatch table, plus the object's own links and assets.
 
         Args:
             G (NetworkX graph): graph
             uid (str): uid of current object
             obj_data (dict): data of current object
             obj_type (str): type of current object
+            path (pathlib.Path, optional): thin JSON file holding only the current object, to re-read it from. Defaults to None.
         """
-        if obj_type.startswith("process"):
-            if obj_type.endswith(self.which) or self.which == "all":
-                G.add_node(uid, color="red", shape=self.shapes[obj_state])
-                self.add_gemd_assets(
-                    G,
-                    uid,
-                    obj_data,
-                    obj_type,
-                )
-        elif obj_type.startswith("ingredient"):  # TODO if node doesn't exist, create?
-            if obj_type.endswith(self.which) or self.which == "all":
-                G.add_node(uid, color="blue", shape=self.shapes[obj_state])
-                process = obj_data["process"]["id"]
-                G.add_edge(uid, process, relationship='is used in')
-                if "material" in obj_data and obj_data["material"]:
-                    material = obj_data["material"]["id"]
-                    G.add_edge(material, uid, relationship='becomes')
-                if self.add_bidirectional_edges:
-                    G.add_edge(process, uid, relationship='uses')
-                    if "material" in obj_data and obj_data["material"]:
-                        G.add_edge(uid, material, relationship='is made out of')
-                self.add_gemd_assets(
-                    G,
-                    uid,
-                    obj_data,
-                    obj_type,
-                )
-        elif obj_type.startswith("material"):
-            if obj_type.endswith(self.which) or self.which == "all":
-                G.add_node(uid, color="green", shape=self.shapes[obj_state])
-                self.add_gemd_assets(
-                    G,
-                    uid,
-                    obj_data,
-                    obj_type,
-                )
-                # if not self.restrictive:
-                if "process" in obj_data and obj_data["process"]:
-                    process = obj_data["process"]["id"]
-                    G.add_edge(process, uid, relationship="creates")  # ?
-                    if self.add_bidirectional_edges:
-                        G.add_edge(uid, process, relationship="is created by")
-        elif obj_type.startswith("measurement"):
-            if obj_type.endswith(self.which) or self.which == "all":
-                G.add_node(uid, color="purple", shape=self.shapes[obj_state])
-                self.add_gemd_assets(
-                    G,
-                    uid,
-                    obj_data,
-                    obj_type,
-                )
-                # if not self.restrictive:
-                if "material" in obj_data and obj_data["material"]:
-                    material = obj_data["material"]["id"]
-                    G.add_edge(material, uid, relationship="is measured with")
-                    if self.add_bidirectional_edges:
-                        G.add_edge(uid, material, relationship="measures")
-
-        if self.which == "all":
-            if (
-                obj_type.startswith("condition")
-                or obj_type.startswith("parameter")
-                or obj_type.startswith("property")
-            ):
-                G.add_node(uid, color="black", shape="trapezium")
-                self.add_gemd_assets(
-                    G,
-                    uid,
-                    obj_data,
-                    obj_type,
-                )
-            # adding attribute templates from object templates
-            elif obj_type.endswith("template"):
-                if "parameters" in obj_data and obj_data["parameters"]:
-                    for parameter in obj_data["parameters"]:
-                        G.add_edge(uid, parameter[0]["id"])
-                        if self.add_bidirectional_edges:
-                            G.add_edge(parameter[0]["id"], uid)
-                if "conditions" in obj_data and obj_data["conditions"]:
-                    for condition in obj_data["conditions"]:
-                        G.add_edge(uid, condition[0]["id"])
-                        if self.add_bidirectional_edges:
-                            G.add_edge(condition[0]["id"], uid)
-                if "properties" in obj_data and obj_data["properties"]:
-                    for prop in obj_data["properties"]:
-                        G.add_edge(uid, prop[0]["id"])
-                        if self.add_bidirectional_edges:
-                            G.add_edge(prop[0]["id"], uid)
-
-            if obj_type.endswith("run"):
-                if "spec" in obj_data and "id" in obj_data["spec"]:
-                    spec_id = obj_data["spec"]["id"]
-                    G.add_edge(uid, spec_id)
-                    if self.add_bidirectional_edges:
-                        G.add_edge(spec_id, uid)
-            elif obj_type.endswith("spec"):
-                if (
-                    "template" in obj_data
-                    and obj_data["template"] is not None
-                    and "id" in obj_data["template"]
-                ):
-                    template_id = obj_data["template"]["id"]
-                    G.add_edge(uid, template_id)
-                    if self.add_bidirectional_edges:
-                        G.add_edge(template_id, uid)
+        if self._dispatch_table is None:
+            self._dispatch_table = self.build_dispatch_table()
+        try:
+            node_attrs, links = self._dispatch_table[obj_type]
+        except KeyError:
+            return
+        if node_attrs is not None:
+            G.add_node(uid, **node_attrs)
+            self.add_gemd_assets(
+                G,
+                uid,
+                obj_data,
+                obj_type,
+                path,
+            )
+        G.add_edges_from(links(uid, obj_data))
 
     def add_gemd_assets(
         self,
@@ -323,22 +926,33 @@ class OpenGraph(Runnable):
         uid,
         obj_data,
         obj_type,
+        path=None,
     ):
         self.add_to_graph(G, uid, "uuid", uid)
         self.add_to_graph(G, uid, "type", obj_type)
         self.add_to_graph(G, uid, "short_name", f"{obj_data['name']}" )
         if self.layout == "raw":
-            self.add_to_graph(G, uid, "object", json.dumps(obj_data))
+            if self.add_separate_node:  # the payload is the key of a separate node
+                # standard library json, so that payloads (and the graphs written) don't depend on the JSON backend
+                payload = json.dumps(obj_data)
+            else:
+                payload = LazyGEMDObject(obj_data, path)
+            self.add_to_graph(G, uid, "object", payload)
         elif self.layout == "visualisation":
             if self.assets_to_add["add_attributes"] and not (
                 obj_type.endswith("template")
             ):
-                if "parameters" in obj_data:
-                    self.handle_gemd_value(G, uid, obj_data["parameters"])
-                if "properties" in obj_data:
-                    self.handle_gemd_value(G, uid, obj_data["properties"])
-                if "conditions" in obj_data:
-                    self.handle_gemd_value(G, uid, obj_data["conditions"])
+                if self.attributes is not None:  # collected into the columnar table
+                    for key in ("parameters", "properties", "conditions"):
+                        if key in obj_data:
+                            self.attributes.extend(uid, obj_data[key])
+                else:
+                    if "parameters" in obj_data:
+                        self.handle_gemd_value(G, uid, obj_data["parameters"])
+                    if "properties" in obj_data:
+                        self.handle_gemd_value(G, uid, obj_data["properties"])
+                    if "conditions" in obj_data:
+                        self.handle_gemd_value(G, uid, obj_data["conditions"])
             if self.assets_to_add["add_file_links"] and "file_links" in obj_data:
                 self.handle_gemd_value(G, uid, obj_data["file_links"])
             if self.assets_to_add["add_tags"] and "tags" in obj_data:
@@ -417,30 +1031,40 @@ class OpenGraph(Runnable):
             if self.add_bidirectional_edges:
                 G.add_edge(node_name, uid)
         else:  # add as an attribute of the node
-            if uid in G.nodes.keys():
-                if att_name in G.nodes[uid].keys():  # already exists, append to it
-                    if type(G.nodes[uid][att_name]) == dict:
-                        count = len(G.nodes[uid][att_name])
-                        G.nodes[uid][att_name][count] = node_name
+            if uid in G:
+                node = G.nodes[uid]
+                if att_name in node:  # already exists, append to it
+                    if type(node[att_name]) == dict:
+                        count = len(node[att_name])
+                        node[att_name][count] = node_name
                         # G.add_node_attribute(uid, att_name, node_name)
                     return
                 if att_name in ["file_links", "tags"]:
-                    G.nodes[uid][att_name] = {0: node_name}
+                    node[att_name] = {0: node_name}
                 else:
-                    G.nodes[uid][att_name] = node_name
-
-    def diagnostics(self, G, gemd_objects, nb_disregarded):
-        print("-- Analysis --")
-        if not self.add_bidirectional_edges:
-            print("cycles in the graph: {}".format(list(nx.simple_cycles(G))))
-        print(
-            "disregarded/total number of gemd objects: {}/{}".format(
-                nb_disregarded, len(gemd_objects)
-            )
+                    node[att_name] = node_name
+
+    def diagnostics(self, G, nb_objects, nb_disregarded, max_cycles=10):
+        """analyzes the structure of a built graph. See :func:`~diagnose_graph`.
+
+        :param G: The graph.
+        :type G: networkx.DiGraph
+        :param nb_objects: Number of GEMD objects read.
+        :type nb_objects: int
+        :param nb_disregarded: Number of GEMD objects left out of the graph.
+        :type nb_disregarded: int
+        :param max_cycles: Maximum number of cycles to list. None are listed with bidirectional edges,
+            where every edge is part of a cycle.
+        :type max_cycles: int, optional
+        :return: The report.
+        :rtype: GraphDiagnostics
+        """
+        return diagnose_graph(
+            G,
+            nb_objects=nb_objects,
+            nb_disregarded=nb_disregarded,
+            max_cycles=0 if self.add_bidirectional_edges else max_cycles,
         )
-        subgraphs = [G.subgraph(c) for c in nx.strongly_connected_components(G)]
-        print("number of connected components: {}".format(len(subgraphs)))
-        print("total nb of isolates in the graph: {}".format(nx.number_of_isolates(G)))
     
     def update_paths(self, svg_path, dot_path, graphml_path):
         self.svg_path = svg_path
@@ -470,14 +1094,33 @@ class OpenGraph(Runnable):
     def load_graphml(cls, file_path):
         """
         Load a GraphML file and return the graph object.
+        Its binary cache is used instead if it is fresh (see :func:`~read_graphml_cached`).
 
         :param file_path: Path to the GraphML file.
         :type file_path: str
         :return: Graph object.
         :rtype: networkx.Graph
         """
-        return nx.read_graphml(file_path)
+        return read_graphml_cached(file_path)
     
+    @classmethod
+    def get_object(cls, G, node):
+        """returns the GEMD object of a node as a dict, from its "object" attribute (raw layout),
+        whether it is a lazy payload of a built graph or a JSON string of a graph loaded from GraphML.
+
+        :param G: The graph.
+        :type G: networkx.Graph
+        :param node: The node.
+        :return: GEMD object, or None if the node doesn't hold one.
+        :rtype: dict
+        """
+        payload = G.nodes[node].get("object")
+        if isinstance(payload, LazyGEMDObject):
+            return payload.load()
+        if isinstance(payload, str):
+            return json_backend.loads(payload)
+        return payload
+
     @classmethod
     def get_isolated_subgraphs(cls, graph):
         """
@@ -507,7 +1150,8 @@ class OpenGraph(Runnable):
             os.makedirs(output_dir)
         for i, subgraph in enumerate(subgraphs):
             output_path = f"{output_dir}/subgraph_{i}.graphml"
-            nx.write_graphml(subgraph, output_path)
+            write_graphml(subgraph, output_path)
+            write_graph_cache(GraphMLView(subgraph), output_path)
 
     @classmethod
     def launch(cls, path, from_command_line=False):
@@ -542,6 +1186,25 @@ class OpenGraph(Runnable):
         else:
             launch_graph_widget(path)
 
+    @classmethod
+    def summarize(cls, G, by="template", pattern=None, max_groups=None):
+        """coarsens a graph into super-nodes grouping its nodes by template, short_name pattern or node attribute,
+        with counts and aggregated edges. Super-nodes can be expanded into their nodes, and the view rendered with
+        :func:`~map_to_graphviz` or a widget. See :class:`~GraphSummary`.
+
+        :param G: The graph, keyed by display name or by uid.
+        :type G: networkx.DiGraph
+        :param by: Grouping criterion: "template", "short_name", a node attribute, or a function (node, attributes) -> group.
+        :type by: str or func, optional
+        :param pattern: Regular expression grouping short names, when by is "short_name".
+        :type pattern: str, optional
+        :param max_groups: Maximum number of super-nodes, the smallest groups being merged beyond it.
+        :type max_groups: int, optional
+        :return: The summary, whose graph() method returns the view.
+        :rtype: GraphSummary
+        """
+        return GraphSummary(G, by=by, pattern=pattern, max_groups=max_groups)
+
     @classmethod
     def map_to_graphviz(cls, G):
         """helper method to map NetworkX graph to Graphviz graph
@@ -559,7 +1222,74 @@ class OpenGraph(Runnable):
         return G
 
     @classmethod
-    def slice_subgraph(cls, G, uuid, funcs, add_current=True):
+    def render_graph_components(
+        cls,
+        G,
+        dest,
+        name,
+        n_workers=None,
+        max_component_nodes=2000,
+        summarize_by="type",
+    ):
+        """renders every weakly connected component of a graph to its own SVG and DOT files, laying them out
+        concurrently in a process pool. Components with more than max_component_nodes nodes are rendered as
+        their summary graph (see :func:`~summary_graph`), since dot can take hours on them.
+
+        :param G: The graph.
+        :type G: networkx.DiGraph
+        :param dest: Folder to write the files to, as "<name>_<i>.svg/.dot", largest component first.
+        :type dest: str
+        :param name: Name of the graph.
+        :type name: str
+        :param n_workers: Number of processes laying out components. None lays them out serially.
+        :type n_workers: int, optional
+        :param max_component_nodes: Number of nodes above which a component is summarized,
+            and maximum number of nodes of its summary.
+        :type max_component_nodes: int, optional
+        :param summarize_by: Grouping criterion of the summaries.
+        :type summarize_by: str, optional
+        :return: (svg path, dot path, number of nodes, whether it is a summary) of every component.
+        :rtype: list
+        """
+        print("Rendering components...")
+        start = time.time()
+        subgraphs = sorted(cls.get_isolated_subgraphs(G), key=len, reverse=True)
+        jobs, summarized = [], []
+        for i, subgraph in enumerate(subgraphs):
+            path = os.path.join(dest, "{}_{}".format(name, i))
+            if len(subgraph) > max_component_nodes:
+                jobs.append(
+                    (
+                        summary_graph(
+                            subgraph, summarize_by, max_groups=max_component_nodes
+                        ),
+                        path + "_summary",
+                    )
+                )
+                summarized.append(True)
+            else:
+                jobs.append((subgraph, path))
+                summarized.append(False)
+        if n_workers is None or n_workers <= 1 or len(jobs) <= 1:
+            paths = list(map(render_graph, jobs))
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                paths = list(executor.map(render_graph, jobs))
+        end = time.time()
+        print(
+            "{} components rendered ({} summarized). Time elapsed: {}".format(
+                len(jobs), sum(summarized), end - start
+            )
+        )
+        return [
+            (svg_path, dot_path, len(subgraph), summary)
+            for (svg_path, dot_path), subgraph, summary in zip(
+                paths, subgraphs, summarized
+            )
+        ]
+
+    @classmethod
+    def slice_subgraph(cls, G, uuid, funcs, add_current=True, index=None):
         """applies paseed function(s) to graph object of interest with uuid=uuid.
         If elements are found to match the criteria, a subgraph containing all those elements is returned
 
@@ -568,43 +1298,169 @@ class OpenGraph(Runnable):
             uuid (str): uuid of current element of interest on self.which the functions are applied
             funcs (list): list of function(s) to apply to graph
             add_current (bool, optional): whether or not to add the current element of interest. Defaults to True.
+            index (LineageIndex, optional): lineage index of G, answering nx.ancestors and nx.descendants
+                without traversing the graph. Defaults to None.
 
         G (NetworkX graph): Graph to save
         """
         els = set()
         for func in funcs:
-            els = els.union(func(G, uuid))
+            if index is not None and func in (nx.ancestors, nx.descendants):
+                els |= index.reachable(
+                    uuid,
+                    ancestors=func is nx.ancestors,
+                    descendants=func is nx.descendants,
+                )
+            else:
+                els = els.union(func(G, uuid))
         if add_current:
             els.add(uuid)
         return G.subgraph(els)
 
     @classmethod
-    def return_uuid(cls, identifier):
+    def return_uuid(cls, identifier, G=None):
         """return the identifier of interest.
+        If G is passed and doesn't contain the identifier as a node, it is looked up among the "label" node attributes,
+        so that display names can be used on graphs keyed by uid.
 
         Args:
             identifier (str): identifier of object of interest
+            G (NetworkX graph, optional): graph the identifier is resolved in. Defaults to None.
 
         Returns:
             str: identifier
         """
+        if G is None or identifier in G:
+            return identifier
+        for node, label in G.nodes(data="label"):
+            if label == identifier:
+                return node
         return identifier
 
     @classmethod
-    def extract_subgraph(cls, G, identifier, func):
+    def return_uuids(cls, identifiers, G):
+        """return the identifiers of interest, as :func:`~return_uuid` does, looking up display names in one pass.
+
+        Args:
+            identifiers (list): identifiers of objects of interest
+            G (NetworkX graph): graph the identifiers are resolved in
+
+        Returns:
+            dict: identifier -> node of G (the identifier itself if not found)
+        """
+        labels = None
+        uuids = {}
+        for identifier in identifiers:
+            if identifier in G:
+                uuids[identifier] = identifier
+                continue
+            if labels is None:
+                labels = {}
+                for node, label in G.nodes(data="label"):
+                    labels.setdefault(label, node)
+            uuids[identifier] = labels.get(identifier, identifier)
+        return uuids
+
+    @classmethod
+    def extract_subgraph(cls, G, identifier, func, index=None):
         """extract subgraph from graph knowledge, based on functions applied to element of interest to filter in additional desired elements.
         Examples includes neighbords, descendants, ancestors, etc.
 
         Args:
-            G (NetworkX graph): Graph to save
-            identifier (str): uuid or identifier of element of interest
+            G (NetworkX graph): Graph to save, keyed by display name or by uid
+            identifier (str): uuid, display name or identifier of element of interest
             func (func): function to determine whether graph element should be added to subgraph or not
+            index (LineageIndex, optional): lineage index of G. Defaults to None.
 
         Returns:
             NetworkX graph: subgraph filtered based on passed criteria
         """
-        uuid = cls.return_uuid(identifier)
-        return cls.slice_subgraph(G, uuid, func)
+        uuid = cls.return_uuid(identifier, G)
+        return cls.slice_subgraph(G, uuid, func, index=index)
+
+    @classmethod
+    def extract_subgraphs(
+        cls, G, identifiers, ancestors=True, descendants=True, index=None
+    ):
+        """extract the provenance subgraphs of many elements at once: every element with its ancestors and/or
+        descendants. The elements reaching every node are found in a single traversal of the graph
+        (see :func:`~LineageIndex.roots_of`), rather than by a traversal per element.
+
+        Args:
+            G (NetworkX graph): knowledge graph, keyed by display name or by uid
+            identifiers (list): uuids, display names or identifiers of the elements of interest
+            ancestors (bool, optional): whether to include the ancestors of the elements. Defaults to True.
+            descendants (bool, optional): whether to include the descendants of the elements. Defaults to True.
+            index (LineageIndex, optional): lineage index of G, built if not passed. Defaults to None.
+
+        Returns:
+            dict: identifier -> subgraph of the element and its ancestors and/or descendants
+        """
+        if index is None:
+            index = LineageIndex(G)
+        uuids = cls.return_uuids(identifiers, G)
+        subgraphs = index.provenance(
+            uuids.values(), ancestors=ancestors, descendants=descendants
+        )
+        return {identifier: subgraphs[uuid] for identifier, uuid in uuids.items()}
+
+    @classmethod
+    def save_provenance(
+        cls,
+        G,
+        destinations,
+        ancestors=True,
+        descendants=True,
+        n_workers=None,
+        index=None,
+    ):
+        """extract the provenance subgraphs of many elements at once (see :func:`~extract_subgraphs`),
+        and save each of them as GraphML, in n_workers processes.
+
+        Args:
+            G (NetworkX graph): knowledge graph, keyed by display name or by uid
+            destinations (dict or list): uuid, display name or identifier of every element of interest -> GraphML
+                file to save its subgraph to, as a dict or a list of pairs, which can save an element to several
+                files. The name of the subgraph is the stem of the file.
+            ancestors (bool, optional): whether to include the ancestors of the elements. Defaults to True.
+            descendants (bool, optional): whether to include the descendants of the elements. Defaults to True.
+            n_workers (int, optional): number of processes writing the files. None writes them serially.
+                Defaults to None.
+            index (LineageIndex, optional): lineage index of G, built if not passed. Defaults to None.
+
+        Returns:
+            dict: identifier -> subgraph of the element and its ancestors and/or descendants
+        """
+        if isinstance(destinations, dict):
+            destinations = destinations.items()
+        destinations = list(destinations)
+        print("Saving {} provenance graphs...".format(len(destinations)))
+        start = time.time()
+        subgraphs = cls.extract_subgraphs(
+            G,
+            [identifier for identifier, _ in destinations],
+            ancestors=ancestors,
+            descendants=descendants,
+            index=index,
+        )
+        jobs = [
+            (list(subgraphs[identifier]), str(path))
+            for identifier, path in destinations
+        ]
+        if n_workers is None or n_workers <= 1 or len(jobs) <= 1:
+            for nodes, path in jobs:
+                _save_provenance_subgraph(G, nodes, path)
+        else:
+            # the graph is handed to every worker once, jobs only carry node lists
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=_init_provenance_worker,
+                initargs=(G,),
+            ) as executor:
+                list(executor.map(_write_provenance, jobs, chunksize=8))
+        end = time.time()
+        print(f"Time elapsed: {end - start}")
+        return subgraphs
 
     @classmethod
     def save_graph(cls, dest, G_nx, G_gviz, name, dump_svg_and_dot=False):
@@ -612,7 +1468,7 @@ class OpenGraph(Runnable):
 
         Args:
             dest (Pathlib.Path): path where to save the graph
-            G_nx (Networkx graph): Networkx version of graph
+            G_nx (Networkx graph): Networkx version of graph, keyed by display name or by uid
             G_gviz (Graphviz graph): Graphviz version of graph
             name (str): name of file to save graph to
 
@@ -650,21 +1506,8 @@ class OpenGraph(Runnable):
             print("Dumping graphml...")
             start = time.time()
 
-            def dicts_to_str(G):
-                if G.nodes:
-                    for node_name in G.nodes:
-                        if "tags" in G.nodes[node_name] and G.nodes[node_name]["tags"]:
-                            G.nodes[node_name]["tags"] = str(G.nodes[node_name]["tags"])
-                        if (
-                            "file_links" in G.nodes[node_name]
-                            and G.nodes[node_name]["file_links"]
-                        ):
-                            G.nodes[node_name]["file_links"] = str(
-                                G.nodes[node_name]["file_links"]
-                            )
-                return G
-
-            nx.write_graphml_lxml(dicts_to_str(G_nx), graphml_path, named_key_ids=True)
+            write_graphml(G_nx, graphml_path, named_key_ids=True)
+            write_graph_cache(GraphMLView(G_nx), graphml_path)
             # nx.write_graphml_lxml(G_nx, graphml_path, named_key_ids=True)
             end = time.time()
             print(f"Time elapsed: {end - start}")
@@ -704,6 +1547,16 @@ class OpenGraph(Runnable):
             "output",
             "take_small_sample",
             "dump_svg_and_dot",
+            "n_workers",
+            "bulk_insert",
+            "keep_uid_keys",
+            "render_components",
+            "max_component_nodes",
+            "attribute_table",
+            "sample",
+            "sample_size",
+            "random_state",
+            "summarize_by",
         ]
         kwargs = {**superkwargs}
         return args, kwargs
@@ -729,6 +1582,16 @@ class OpenGraph(Runnable):
             args.take_small_sample,
             args.uuid_to_track,
             dump_svg_and_dot=args.dump_svg_and_dot,
+            n_workers=args.n_workers,
+            bulk_insert=args.bulk_insert,
+            keep_uid_keys=args.keep_uid_keys,
+            render_components=args.render_components,
+            max_component_nodes=args.max_component_nodes,
+            attribute_table=args.attribute_table,
+            sample=args.sample,
+            sample_size=args.sample_size,
+            random_state=args.random_state,
+            summarize_by=args.summarize_by,
         )
         viewer.assets_to_add = {
             "add_attributes": args.add_attributes,
@@ -17,6 +17,7 @@ _style = [
             "background-color": "data(color)",
         },
     },
+    {"selector": "node[label]", "css": {"content": "data(label)"}},
     {"selector": "node:parent", "css": {"background-opacity": 0.333}},
     {"selector": "edge", "style": {"width": 4, "line-color": "#9dbaea"}},
     {
@@ -0,0 +1,68 @@
+import os
+
+import networkx as nx
+
+from openmsimodel.graph.summary import GraphSummary
+
+
+def summary_graph(G, attribute="type", max_groups=None):
+    """collapses a graph into one node per value of a node attribute (GEMD type by default), counting the nodes
+    it stands for, and one edge per pair of values and relationship, counting the edges it stands for.
+    Used to render components too large to lay out. See :class:`~GraphSummary`.
+
+    Args:
+        G (NetworkX graph): graph to summarize
+        attribute (str, optional): node attribute to group nodes by, or "template" or "short_name" pattern.
+            Defaults to "type".
+        max_groups (int, optional): maximum number of nodes of the summary. Defaults to None.
+
+    Returns:
+        NetworkX DiGraph: summary graph
+    """
+    return GraphSummary(G, by=attribute, max_groups=max_groups).graph()
+
+
+def render_graph(args):
+    """lays out a graph with graphviz' dot and writes it as SVG and DOT. Runs in worker processes.
+
+    Args:
+        args (tuple): graph, and path of the files to write without extension
+
+    Returns:
+        tuple: paths to the svg and dot files
+    """
+    G, path = args
+    G_gviz = nx.nx_agraph.to_agraph(G)
+    G_gviz.layout(prog="dot")
+    svg_path = path + ".svg"
+    dot_path = path + ".dot"
+    G_gviz.draw(svg_path)
+    with open(dot_path, "w") as f:
+        f.write(str(G_gviz))
+    return svg_path, dot_path
+
+
+def write_render_index(dest, name, renders):
+    """writes an HTML page showing the SVG of every rendered component, largest first
+
+    Args:
+        dest (str): folder of the SVG files
+        name (str): name of the graph
+        renders (list): (svg path, dot path, number of nodes, whether it is a summary) of the components
+
+    Returns:
+        str: path to the index
+    """
+    index_path = os.path.join(dest, "{}_index.html".format(name))
+    with open(index_path, "w") as f:
+        f.write("<html><head><title>{}</title></head><body>\n".format(name))
+        f.write("<h1>{}: {} components</h1>\n".format(name, len(renders)))
+        for i, (svg_path, _, nb_nodes, summarized) in enumerate(renders):
+            f.write(
+                "<h2>component {}: {} nodes{}</h2>\n".format(
+                    i, nb_nodes, " (summary)" if summarized else ""
+                )
+            )
+            f.write('<img src="{}"/>\n'.format(os.path.basename(svg_path)))
+        f.write("</body></html>\n")
+    return index_path
@@ -0,0 +1,181 @@
+import random
+from collections import defaultdict, deque
+
+SAMPLING_STRATEGIES = ["bfs", "random_walk", "stratified", "closure"]
+
+
+def gemd_links(obj_data, scope):
+    """returns the uids an object links to in a scope, from the link_by_uid dicts nested anywhere in it
+
+    Args:
+        obj_data (dict): thin GEMD object
+        scope (str): scope of the uids
+
+    Returns:
+        list: uids, in order of appearance
+    """
+    links = []
+    stack = [obj_data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            if item.get("type") == "link_by_uid" and item.get("scope") == scope:
+                links.append(item["id"])
+            else:
+                stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    links.reverse()
+    return links
+
+
+def sample_gemd_data(
+    gemd_data, strategy, budget, scope="auto", seeds=None, random_state=None
+):
+    """samples up to budget GEMD objects, following the links between them rather than taking them in reading order:
+        - "bfs" takes objects in breadth-first order of their links (in both directions) from the seeds,
+        - "random_walk" takes the objects visited by a random walk on their links from the seeds, restarting from a
+          seed with probability 0.15 at every step,
+        - "stratified" takes the same share of the objects of every type at random, rounding up for the types left
+          without objects first so that rare types are represented (links may point outside of the sample),
+        - "closure" takes random objects with everything they link to, transitively, so that no link of the sample
+          points outside of it, as long as closures fit in the budget left.
+    By default, the seeds are the material runs of the data (or all objects without any), in random order.
+    Objects held by several entries (e.g., files) are sampled with all of them.
+
+    Args:
+        gemd_data (list): (thin GEMD object, path) pairs, as returned by iter_gemd_data
+        strategy (str): one of SAMPLING_STRATEGIES
+        budget (int): maximum number of objects to keep
+        scope (str, optional): scope of the uids. Defaults to "auto".
+        seeds (list, optional): uids of the objects to start "bfs" and "random_walk" from. Defaults to None.
+        random_state (int, optional): seed of the random number generator. Defaults to None.
+
+    Returns:
+        list: sampled (thin GEMD object, path) pairs, in their original order
+    """
+    if strategy not in SAMPLING_STRATEGIES:
+        raise ValueError(
+            f"unknown sampling strategy {strategy}, expected one of {SAMPLING_STRATEGIES}."
+        )
+    rng = random.Random(random_state)
+    types = {}
+    links = defaultdict(list)
+    for obj_data, _ in gemd_data:
+        uid = obj_data["uids"].get(scope)
+        if uid is None:
+            continue
+        types.setdefault(uid, obj_data["type"])
+        links[uid].extend(gemd_links(obj_data, scope))
+    uids = list(types)
+    if budget >= len(uids):
+        return list(gemd_data)
+
+    if strategy in ("bfs", "random_walk"):
+        if seeds is None:
+            seeds = [uid for uid in uids if types[uid] == "material_run"] or uids
+            seeds = rng.sample(seeds, len(seeds))
+        seeds = [uid for uid in seeds if uid in types]
+        neighbors = defaultdict(set)
+        for uid, targets in links.items():
+            for target in targets:
+                if target in types and target != uid:
+                    neighbors[uid].add(target)
+                    neighbors[target].add(uid)
+        neighbors = {uid: sorted(targets) for uid, targets in neighbors.items()}
+        if strategy == "bfs":
+            sampled = _bfs(seeds, neighbors, budget)
+        else:
+            sampled = _random_walk(seeds, neighbors, budget, rng)
+    elif strategy == "stratified":
+        sampled = _stratified(types, budget, rng)
+    else:
+        sampled = _closure(uids, links, types, budget, rng)
+
+    return [
+        (obj_data, path)
+        for obj_data, path in gemd_data
+        if obj_data["uids"].get(scope) in sampled
+    ]
+
+
+def _bfs(seeds, neighbors, budget):
+    sampled = set()
+    for seed in seeds:
+        if seed in sampled:
+            continue
+        sampled.add(seed)
+        queue = deque([seed])
+        while queue and len(sampled) < budget:
+            for neighbor in neighbors.get(queue.popleft(), ()):
+                if neighbor not in sampled:
+                    sampled.add(neighbor)
+                    queue.append(neighbor)
+                    if len(sampled) == budget:
+                        break
+        if len(sampled) >= budget:
+            break
+    return sampled
+
+
+def _random_walk(seeds, neighbors, budget, rng, restart=0.15, max_stale_steps=100):
+    sampled = set()
+    remaining = deque(seeds)
+    while remaining and len(sampled) < budget:
+        seed = current = remaining.popleft()
+        sampled.add(seed)
+        # walks from the seed until the budget is spent, or the walk stops finding new objects
+        stale = 0
+        while len(sampled) < budget and stale < max_stale_steps:
+            if not neighbors.get(current) or rng.random() < restart:
+                current = seed
+                if not neighbors.get(current):
+                    break
+            current = rng.choice(neighbors[current])
+            if current in sampled:
+                stale += 1
+            else:
+                sampled.add(current)
+                stale = 0
+    return sampled
+
+
+def _stratified(types, budget, rng):
+    by_type = defaultdict(list)
+    for uid, obj_type in types.items():
+        by_type[obj_type].append(uid)
+    # largest remainder allocation of the budget, giving the types left without objects priority
+    total = len(types)
+    quotas = {t: budget * len(members) / total for t, members in by_type.items()}
+    counts = {t: int(quota) for t, quota in quotas.items()}
+    left = budget - sum(counts.values())
+    for t in sorted(quotas, key=lambda t: (counts[t] > 0, int(quotas[t]) - quotas[t]))[:left]:
+        counts[t] += 1
+    sampled = set()
+    for t, members in by_type.items():
+        sampled.update(rng.sample(members, min(counts[t], len(members))))
+    return sampled
+
+
+def _closure(uids, links, types, budget, rng, max_misses=100):
+    sampled = set()
+    misses = 0
+    for uid in rng.sample(uids, len(uids)):
+        if uid in sampled:
+            continue
+        closure = {uid}
+        stack = [uid]
+        while stack and len(sampled) + len(closure) <= budget:
+            for target in links.get(stack.pop(), ()):
+                if target in types and target not in sampled and target not in closure:
+                    closure.add(target)
+                    stack.append(target)
+        if len(sampled) + len(closure) <= budget:
+            sampled |= closure
+            misses = 0
+        else:
+            misses += 1
+        # stops once closures keep overflowing the budget left
+        if len(sampled) == budget or misses == max_misses:
+            break
+    return sampled
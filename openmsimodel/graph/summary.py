@@ -0,0 +1,171 @@
+import json
+import re
+from collections import Counter, defaultdict
+
+import networkx as nx
+
+OTHER_GROUP = "other"
+
+
+class GraphSummary:
+    """
+    Coarsened view of a (large) OpenGraph graph: nodes are collapsed into super-nodes by template, by short_name
+    pattern or by any node attribute, with the number of nodes each one stands for, and edges are aggregated between
+    super-nodes with their counts per relationship. Any super-node can be expanded back into its nodes (drill-down),
+    and collapsed again; the size of the view only depends on the number of groups and of nodes expanded.
+
+    Grouping criteria (by):
+        - "template": the template of the GEMD object of a node, found through the edges of graphs built with
+          which="all" (run -> spec -> template), or else through the link in its raw "object" payload,
+        - "short_name": the short_name of a node, with digits masked (e.g., "sample 12" and "sample 3" are
+          grouped as "sample #"), or its match of pattern: the first group of the regular expression if it has one,
+        - any other node attribute, e.g., "type",
+        - a function (node, node attributes) -> group.
+    """
+
+    def __init__(self, G, by="template", pattern=None, max_groups=None):
+        """
+        :param G: The graph, keyed by display name or by uid.
+        :type G: networkx.DiGraph
+        :param by: Grouping criterion.
+        :type by: str or func, optional
+        :param pattern: Regular expression applied to short names, when grouping by "short_name".
+        :type pattern: str, optional
+        :param max_groups: Maximum number of super-nodes. The smallest groups beyond it are merged into an "other"
+            group (numbered if a group or node is already named "other"), whose key is other_group.
+            Defaults to None, for no limit.
+        :type max_groups: int, optional
+        """
+        self.G = G
+        self.by = by
+        self.other_group = None
+        self.pattern = re.compile(pattern) if pattern is not None else None
+        key_of = self._key_function(by)
+        self.groups = defaultdict(list)
+        for node, data in G.nodes(data=True):
+            self.groups[key_of(node, data)].append(node)
+        if max_groups is not None and len(self.groups) > max_groups:
+            ranked = sorted(self.groups, key=lambda key: len(self.groups[key]), reverse=True)
+            other = []
+            for key in ranked[max_groups - 1 :]:
+                other.extend(self.groups.pop(key))
+            self.other_group = self._unused_key(OTHER_GROUP)
+            self.groups[self.other_group] = other
+        self.groups = dict(self.groups)
+        self.group_of = {
+            node: key for key, members in self.groups.items() for node in members
+        }
+        self.expanded = set()
+
+    def _unused_key(self, key):
+        """returns key, or key numbered, so that it is neither the key of a group (e.g., a template named "other")
+        nor a node of the graph, which the view holds along with super-nodes"""
+        candidate, i = key, 1
+        while candidate in self.groups or candidate in self.G:
+            i += 1
+            candidate = "{} {}".format(key, i)
+        return candidate
+
+    def _key_function(self, by):
+        if callable(by):
+            return by
+        if by == "template":
+            return self._template_of
+        if by == "short_name":
+            return self._name_pattern_of
+        return lambda node, data: data.get(by, "unknown")
+
+    def _template_of(self, node, data):
+        G = self.G
+        node_type = data.get("type", "")
+        if node_type.endswith("_template"):
+            return node
+        for successor in G.successors(node):
+            successor_type = G.nodes[successor].get("type", "")
+            if successor_type.endswith("_template"):
+                return successor
+            if successor_type.endswith("_spec"):
+                for template in G.successors(successor):
+                    if G.nodes[template].get("type", "").endswith("_template"):
+                        return template
+        payload = data.get("object")
+        if payload is not None:
+            # lazy payload of a built graph, or JSON string of a graph loaded from GraphML
+            obj = payload.load() if hasattr(payload, "load") else json.loads(payload)
+            for key in ("template", "spec"):
+                link = obj.get(key)
+                if isinstance(link, dict) and "id" in link:
+                    return "{} of {}".format(key, link["id"])
+        return node_type or "unknown"
+
+    def _name_pattern_of(self, node, data):
+        name = str(data.get("short_name", node))
+        if self.pattern is None:
+            return re.sub(r"\d+", "#", name)
+        match = self.pattern.search(name)
+        if match is None:
+            return name
+        return match.group(1) if self.pattern.groups else match.group(0)
+
+    def label(self, key):
+        """returns the display label of a group: its template's short name if the key is a node, and its count"""
+        name = key
+        if key in self.G:
+            name = self.G.nodes[key].get("short_name", key)
+        return "{} ({})".format(name, len(self.groups[key]))
+
+    def expand(self, key):
+        """drills down into a super-node: its nodes are shown instead of it in the view"""
+        if key not in self.groups:
+            raise KeyError(f"{key} is not a group of the summary.")
+        self.expanded.add(key)
+
+    def collapse(self, key):
+        """collapses the nodes of an expanded super-node back into it"""
+        self.expanded.discard(key)
+
+    def members(self, key):
+        """returns the subgraph of the nodes of a super-node"""
+        return self.G.subgraph(self.groups[key])
+
+    def graph(self):
+        """returns the current view: a super-node per collapsed group, with "label", "count", "color" and "shape"
+        attributes, the nodes of expanded groups with their own attributes and a "group" attribute, and an edge per
+        pair of viewed nodes with edges between them, with the count of those edges in "count", and per relationship
+        in "label".
+
+        :return: The view.
+        :rtype: networkx.DiGraph
+        """
+        G = self.G
+        view_of = {}
+        summary = nx.DiGraph(name="summary of {}".format(G.graph.get("name", "graph")))
+        for key, members in self.groups.items():
+            if key in self.expanded:
+                for node in members:
+                    view_of[node] = node
+                    summary.add_node(node, **G.nodes[node], group=key)
+            else:
+                for node in members:
+                    view_of[node] = key
+                summary.add_node(
+                    key,
+                    label=self.label(key),
+                    count=len(members),
+                    color=G.nodes[members[0]].get("color", "black"),
+                    shape="box",
+                )
+        edge_counts = Counter()
+        for u, v, d in G.edges(data=True):
+            if self.group_of[u] in self.expanded and self.group_of[v] in self.expanded:
+                # edges between expanded nodes are shown as they are
+                summary.add_edge(u, v, **d)
+            else:
+                edge_counts[(view_of[u], view_of[v], d.get("relationship", ""))] += 1
+        for (u, v, relationship), count in edge_counts.items():
+            label = "{} ({})".format(relationship, count) if relationship else str(count)
+            if summary.has_edge(u, v):
+                label = summary.edges[u, v]["label"] + ", " + label
+                count += summary.edges[u, v]["count"]
+            summary.add_edge(u, v, label=label, count=count)
+        return summary
@@ -3,12 +3,14 @@ import time
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 from gemd import MaterialTemplate, ProcessTemplate, MeasurementTemplate
+from gemd.json import GEMDJson
 from openmsimodel.entity.gemd.material import Material
 from openmsimodel.entity.gemd.ingredient import Ingredient
 from openmsimodel.entity.gemd.process import Process
 from openmsimodel.entity.gemd.measurement import Measurement
 from openmsimodel.structures.materials_sequence import MaterialsSequence
 from openmsimodel.graph.open_graph import OpenGraph
+from openmsimodel.utilities import json_backend
 import uuid
 import questionary
 
@@ -19,6 +21,7 @@ class GEMDAutomation(FileSystemEventHandler):
     mapping = {}
     output_folder = "./live_grapher_output"
     open_graphs = []
+    open_graph = None
 
     def __init__(self, output_folder=None):
         if self.output_folder:
@@ -55,20 +58,38 @@ class GEMDAutomation(FileSystemEventHandler):
                 pass
             elif choice == "Exit":
                 pass
-        open_graph = dump_graph(to_be_visualized, self.output_folder)
-        self.open_graphs.append(open_graph)
+        if self.open_graph is None:
+            self.open_graph = dump_graph(to_be_visualized, self.output_folder)
+            self.open_graphs.append(self.open_graph)
+        else:
+            dump_graph(to_be_visualized, self.output_folder, self.open_graph)
 
 
-def dump_graph(to_be_visualized, output):
-    open_graph = OpenGraph(
-        name=str(uuid.uuid4()),
-        science_kit=None,
-        source=to_be_visualized,
-        output=output,
-        which="run",
-        dump_svg_and_dot=True,
-    )
-    G, relabeled_G, name_mapping = open_graph.build_graph(save=True)
+def dump_graph(to_be_visualized, output, open_graph=None):
+    '''
+    Dumps the thin JSONs of GEMD objects to the 'gemd' folder of output, and updates the graph of that folder
+    incrementally, only re-emitting the GraphML of the connected components the new objects touch
+    '''
+    gemd_folder = os.path.join(output, "gemd")
+    os.makedirs(gemd_folder, exist_ok=True)
+    encoder = GEMDJson()
+    paths = []
+    for item in to_be_visualized:
+        fn = "_".join([item.__class__.__name__, item.name, item.uids["auto"], ".json"])
+        path = os.path.join(gemd_folder, fn)
+        with open(path, "w") as fp:
+            fp.write(json_backend.thin_dumps(encoder, item, indent=3))
+        paths.append(path)
+    if open_graph is None:
+        open_graph = OpenGraph(
+            name=str(uuid.uuid4()),
+            science_kit=None,
+            source=gemd_folder,
+            output=output,
+            which="run",
+            dump_svg_and_dot=True,
+        )
+    open_graph.update_graph(changed_paths=paths, save=True)
     return open_graph
 
 
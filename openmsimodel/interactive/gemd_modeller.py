@@ -4,6 +4,7 @@ from typing import Callable, List, Dict
 import openmsimodel.stores.stores_config as stores_tools
 from openmsimodel.utilities.runnable import Runnable
 from openmsimodel.utilities.argument_parsing import OpenMSIModelParser
+from openmsimodel.utilities import json_backend
 import questionary
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
@@ -226,7 +227,7 @@ class GEMDModeller(Runnable):
         for ele in output:
             json_file_path = self.gemd_folder / f"{ele.name}_{ele.typ}.json"
             with open(json_file_path, "w") as json_file:
-                json_file.write(self.encoder.thin_dumps(ele, indent=2))
+                json_file.write(json_backend.thin_dumps(self.encoder, ele, indent=2))
                 # json.dump(ele, json_file, indent=4)
             # json.dump(self.encoder(ele, json_file, indent=4)
 
@@ -55,6 +55,10 @@ from openmsimodel.entity.gemd.measurements.birdshot.srjt import SRJT
 
 from openmsimodel.utilities.tools import plot_graph
 from openmsimodel.utilities.argument_parsing import OpenMSIModelParser
+from openmsimodel.utilities.archive import GEMDArchive, ARCHIVE_INDEX_SUFFIX
+from openmsimodel.utilities import json_backend
+from openmsimodel.utilities.dump_pipeline import dump_thin_jsons
+from openmsimodel.entity.gemd.impl import traverse, set_uuids
 from openmsimodel.science_kit.birdshot.helpers import *
 
 import json
@@ -64,6 +68,7 @@ import shutil
 # import pandas as pd
 from pathlib import Path
 from collections import defaultdict
+from functools import partial
 import time
 import sys
 
@@ -73,7 +78,6 @@ from gemd.entity.value import NominalReal, NominalCategorical
 from gemd.entity.util import make_instance
 from gemd.entity import PerformedSource, FileLink
 from gemd.json import GEMDJson
-from gemd.util.impl import recursive_foreach
 
 
 class BIRDSHOTScienceKit(ScienceKit, FolderOrFile):
@@ -1332,8 +1336,22 @@ class BIRDSHOTScienceKit(ScienceKit, FolderOrFile):
         os.makedirs(thin_jsons_dirpath)
 
     def thin_dumps(
-        self, obj, destination=None, overwrite=False
+        self,
+        obj,
+        destination=None,
+        overwrite=False,
+        archive=None,
+        n_workers=None,
+        indent=3,
     ):  # TODO: add option to pass own target path
+        """
+        thin dumps obj and everything it links to, a file per object, through a pipeline serializing them over
+        n_workers processes and writing them from a pool of threads (see :func:`~dump_thin_jsons`).
+        indent=None drops pretty-printing, for smaller and faster dumps.
+        """
+        if archive is not None:
+            self.archive_dumps(obj, archive, overwrite=overwrite)
+            return
         self.local_out_destination = self.output / "thin"
         if destination:  # adding overwrite options
             self.local_out_destination = destination
@@ -1346,12 +1364,48 @@ class BIRDSHOTScienceKit(ScienceKit, FolderOrFile):
             if not len(os.listdir(self.local_out_destination)) == 0:
                 print("Folder is not empty.")
         print("Executing thin dumps...")
-        self.dump_function = self.encoder.thin_dumps
         start = time.time()
-        recursive_foreach(obj, self.out)
+        dump_thin_jsons(
+            obj,
+            self.local_out_destination,
+            self.encoder,
+            indent=indent,
+            n_workers=n_workers,
+        )
         end = time.time()
         print(f"Time elapsed: {end - start}")
 
+    def archive_dumps(self, obj, archive, overwrite=False, block_size=256):
+        """
+        thin dumps obj and everything it links to into a single GEMD archive (see :class:`~GEMDArchive`)
+        instead of a file per object. Compression follows the name of the archive: .ndjson, .ndjson.gz or .ndjson.zst.
+        Existing archives are appended to, unless overwrite is set.
+        """
+        archive = Path(archive)
+        if not archive.is_absolute():
+            archive = self.output / archive
+        archive.parent.mkdir(parents=True, exist_ok=True)
+        if overwrite:
+            for path in (archive, Path(str(archive) + ARCHIVE_INDEX_SUFFIX)):
+                if path.exists():
+                    path.unlink()
+        print("Executing thin dumps into archive...")
+        # uids are assigned once, rather than by every dump
+        set_uuids(obj, self.encoder.scope)
+        self.dump_function = partial(
+            json_backend.thin_dumps, self.encoder, assign_uids=False
+        )
+        self.out_archived = set()
+        start = time.time()
+        with GEMDArchive(archive, mode="a", block_size=block_size) as self.out_archive:
+            try:
+                visits = traverse(obj, pre=self.out)
+            finally:
+                self.out_archive = None
+        end = time.time()
+        print(f"{visits['entities']} objects visited, {visits['revisits']} revisits skipped.")
+        print(f"Time elapsed: {end - start}")
+
     @classmethod
     def get_command_line_arguments(cls):
         superargs, superkwargs = super().get_command_line_arguments()
@@ -1362,6 +1416,8 @@ class BIRDSHOTScienceKit(ScienceKit, FolderOrFile):
             "iteration",
             "synthesis_path",
             "srjt_path",
+            "n_workers",
+            "compact_dumps",
         ]
         kwargs = {**superkwargs}
         return args, kwargs
@@ -1376,7 +1432,12 @@ class BIRDSHOTScienceKit(ScienceKit, FolderOrFile):
 
         with open(os.path.join(args.output, "log.txt"), "w") as sys.stderr:
             science_kit.build()
-            science_kit.thin_dumps(science_kit.terminal_process, overwrite=True)
+            science_kit.thin_dumps(
+                science_kit.terminal_process,
+                overwrite=True,
+                n_workers=args.n_workers,
+                indent=None if args.compact_dumps else 3,
+            )
 
 
 def main(args=None):
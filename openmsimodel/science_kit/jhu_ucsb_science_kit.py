@@ -1,4 +1,3 @@
-import networkx as nx
 from pathlib import Path
 from gemd.json import GEMDJson
 import os
@@ -6,7 +5,6 @@ import shutil
 import json
 import csv
 from datetime import datetime
-import networkx as nx
 
 from openmsimodel.science_kit.science_kit import ScienceKit
 from openmsimodel.graph.open_graph import OpenGraph
@@ -44,10 +42,11 @@ def extract_record_ids(csv_file_path):
 
 
 class JhuUcsbHTMDECScienceKit(ScienceKit):
-    def __init__(self, root, output, launch_pkg_filemaker_path):
+    def __init__(self, root, output, launch_pkg_filemaker_path, n_workers=None):
         ScienceKit.__init__(self)
         self.root = Path(root)
         self.output = Path(output)
+        self.n_workers = n_workers
         self.encoder = GEMDJson()
         self.flyer_id_to_record_ids, self.record_ids_to_metadata = extract_record_ids(
             launch_pkg_filemaker_path
@@ -61,6 +60,7 @@ class JhuUcsbHTMDECScienceKit(ScienceKit):
         all_G, all_relabeled_G, all_name_mapping = open_graph.build_graph()
 
         # Find the HTMDEC samples
+        records = []
         for sample_id in self.flyer_id_to_record_ids.keys():
             dest = self.output / sample_id
             if os.path.exists(dest):
@@ -78,14 +78,19 @@ class JhuUcsbHTMDECScienceKit(ScienceKit):
                     print(e)
                     continue
                 identifier = obj["uids"]["auto"]
-                subgraph = OpenGraph.extract_subgraph(
-                    all_G, all_name_mapping[identifier], [nx.descendants, nx.ancestors]
-                )
-                subgraph.name = all_name_mapping[identifier]
-                structured_data.append(
-                    [subgraph, self.record_ids_to_metadata[record_id]]
-                )
-                OpenGraph.save_graph(dest, subgraph, None, name=str(subgraph.name))
+                records.append((dest, record_id, all_name_mapping[identifier]))
+
+        # Extract and save the provenance of every launch package in one batch
+        subgraphs = OpenGraph.save_provenance(
+            all_G,
+            [(name, dest / "{}.graphml".format(name)) for dest, _, name in records],
+            n_workers=self.n_workers,
+        )
+        for dest, record_id, name in records:
+            subgraph = subgraphs[name]
+            # subgraph views share the graph dict of all_G: each gets its own, to be named after its element
+            subgraph.graph = {**subgraph.graph, "name": name}
+            structured_data.append([subgraph, self.record_ids_to_metadata[record_id]])
 
         # # build final graph
         # structured_data = sorted(structured_data, key=lambda x: x[1])
@@ -132,6 +137,7 @@ class JhuUcsbHTMDECScienceKit(ScienceKit):
             "root",
             "output",
             "launch_pkg_filemaker_path",
+            "n_workers",
         ]
         kwargs = {**superkwargs}
         return args, kwargs
@@ -140,7 +146,9 @@ class JhuUcsbHTMDECScienceKit(ScienceKit):
     def run_from_command_line(cls, args=None):
         parser = cls.get_argument_parser()
         args = parser.parse_args(args=args)
-        science_kit = cls(args.root, args.output, args.launch_pkg_filemaker_path)
+        science_kit = cls(
+            args.root, args.output, args.launch_pkg_filemaker_path, args.n_workers
+        )
         # science_kit = cls(**args)
         science_kit.build()
 
@@ -9,6 +9,7 @@ from typing import Optional
 from openmsimodel.utilities.runnable import Runnable
 from openmsimodel.utilities.argument_parsing import OpenMSIModelParser
 from openmsimodel.utilities.typing import Spec, Run
+from openmsimodel.utilities.dump_pipeline import thin_json_filename
 
 from gemd.json import GEMDJson
 from gemd.util.impl import recursive_foreach
@@ -32,6 +33,7 @@ class ScienceKit(Runnable):
         self.instruments = {}
         self.open_graphs = {}
         self.open_dbs = {}
+        self.out_archive = None
 
     def assets(self):
         if self.structures:
@@ -65,8 +67,18 @@ class ScienceKit(Runnable):
         function object to run on individual item during recursion
         :param item: json item to write its destination
         se
+        if out_archive is set (see :class:`~openmsimodel.utilities.archive.GEMDArchive`), items are appended
+        to it once each, on a single line, instead of being written to a file each in local_out_destination
         """
-        fn = "_".join([item.__class__.__name__, item.name, item.uids["auto"], ".json"])
+        fn = thin_json_filename(item)
+        archive = getattr(self, "out_archive", None)
+        if archive is not None:
+            if fn not in self.out_archived:
+                self.out_archived.add(fn)
+                archive.append_dumped(
+                    self.dump_function(item), item.uids, item.typ, item.name
+                )
+            return
         with open(os.path.join(self.local_out_destination, fn), "w") as fp:
             fp.write(self.dump_function(item, indent=3))
 
@@ -1,10 +1,11 @@
 import copy, methodtools
 from typing import Union
 from dataclasses import dataclass
-from gemd.util.impl import set_uuids, recursive_foreach
 from gemd.entity.object import MaterialSpec, ProcessSpec, IngredientSpec, MeasurementSpec
 from gemd.json import GEMDJson
 from openmsimodel.stores.cached_isinstance_functions import isinstance_spec
+from openmsimodel.entity.gemd.impl import traverse, set_uuids, STOP
+from openmsimodel.utilities import json_backend
 from abc import ABC, abstractmethod
 from pathlib import Path
 import os, shutil, csv
@@ -129,7 +130,7 @@ class GEMDSpecStore(ABC) :
                 return existingspec.spec
         #if an existing spec wasn't returned, register this spec as a new one and then return it
         if recursive_register :
-            recursive_foreach(specobj,self.__register_new_unique_specs,apply_first=True)
+            traverse(specobj,pre=self.__register_new_unique_specs)
         else :
             self.__register_new_unique_specs(specobj)
         existingspec = self.__get_stored_version_of_spec(specobj,debug=debug)
@@ -164,7 +165,7 @@ class GEMDSpecStore(ABC) :
         dictionary where all UIDs of the relevant encoder scope have been removed
         """
         spec_copy = copy.deepcopy(specobj)
-        recursive_foreach(spec_copy,self.__scrub_uids)
+        traverse(spec_copy,pre=self.__scrub_uids)
         return str(spec_copy)
 
     def __scrub_uids(self,item) :
@@ -209,14 +210,14 @@ class GEMDSpecStore(ABC) :
     def __spec_exists_in_store_rec(self,specobj) :
         self.__n_objs_searched = 0
         self.__n_objs_found = 0
-        recursive_foreach(specobj,self.__check_spec_exists_in_store,apply_first=True)
+        traverse(specobj,pre=self.__check_spec_exists_in_store)
         if self.__n_objs_searched==self.__n_objs_found :
             return True
         return False
 
     def __check_spec_exists_in_store(self,item) :
         if self.__n_objs_found<self.__n_objs_searched :
-            return
+            return STOP
         elif not isinstance_spec(item) :
             return
         self.__n_objs_searched+=1
@@ -246,7 +247,7 @@ class GEMDSpecStore(ABC) :
             self.store_folders[type(spec)] / f"{name}_pid_{persistent_id}.json",
             "w",  # TODO: maybe use diff encoding of path
         ) as spec_file:
-            spec_file.write(self.encoder.thin_dumps(spec, indent=3))
+            spec_file.write(json_backend.thin_dumps(self.encoder, spec, indent=3))
         spec_dataclass.spec = spec
         return spec_dataclass
         
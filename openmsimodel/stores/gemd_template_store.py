@@ -1,12 +1,11 @@
 # imports
-import os, csv, json, warnings
+import os, csv, warnings
 import shutil
 from pathlib import Path
 from typing import Union
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 
-from gemd.util.impl import set_uuids
 from gemd.json import GEMDJson
 from gemd.entity.template import PropertyTemplate, ParameterTemplate, ConditionTemplate
 from gemd.entity.template import MaterialTemplate, MeasurementTemplate, ProcessTemplate
@@ -16,8 +15,9 @@ from openmsimodel.utilities.cached_isinstance_functions import (
     isinstance_attribute_template,
     isinstance_object_template,
 )
-from openmsimodel.entity.gemd.impl import assign_uuid
+from openmsimodel.entity.gemd.impl import assign_uuid, set_uuids
 from openmsimodel.utilities.logging import Logger
+from openmsimodel.utilities import json_backend
 
 # 1) register asset stores from raw files in the asset store (with recursive function or manual function) which can be called from open_graph or open_db
 # 2) write template[specs], specs[templates], runs[specs] in stores specificy
@@ -142,8 +142,7 @@ class GEMDTemplateStore(ABC):
                 with open(
                     os.path.join(template_type_root, template_name), "r"
                 ) as template_file:  # TODO: change to regular load
-                    template = json.dumps((json.load(template_file)))
-                    template = self.encoder.raw_loads(template)
+                    template = self.encoder.raw_loads(template_file.read())
                 self.register_new_template(template, from_file=True, from_store=True)
 
     def register_new_template(
@@ -235,7 +234,7 @@ class GEMDTemplateStore(ABC):
                 self.store_folders[type(template)] / f"{name}_pid_{persistent_id}.json",
                 "w",  # TODO: maybe use diff encoding of path
             ) as template_file:
-                template_file.write(self.encoder.thin_dumps(template, indent=3))
+                template_file.write(json_backend.thin_dumps(self.encoder, template, indent=3))
 
         dict_to_add_to[name] = GEMDTemplate(
             template, from_file, from_store, from_memory, from_subclass
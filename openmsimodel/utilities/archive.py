@@ -0,0 +1,182 @@
+import gzip
+import io
+import zlib
+from pathlib import Path
+
+from openmsimodel.utilities import json_backend
+
+try:
+    import zstandard
+except ImportError:  # optional, for .ndjson.zst archives only
+    zstandard = None
+
+ARCHIVE_SUFFIXES = {".ndjson": None, ".ndjson.gz": "gzip", ".ndjson.zst": "zstd"}
+ARCHIVE_INDEX_SUFFIX = ".idx"
+
+
+def archive_compression(path):
+    """returns the compression of a GEMD archive from its name: None, "gzip" or "zstd"
+
+    Raises:
+        ValueError: if path isn't named as an archive
+    """
+    name = str(path)
+    for suffix in sorted(ARCHIVE_SUFFIXES, key=len, reverse=True):
+        if name.endswith(suffix):
+            return ARCHIVE_SUFFIXES[suffix]
+    raise ValueError(
+        f"{path} isn't a GEMD archive, expected a name ending with one of {list(ARCHIVE_SUFFIXES)}."
+    )
+
+
+def is_gemd_archive(path):
+    """returns whether path is named as a GEMD archive"""
+    return any(str(path).endswith(suffix) for suffix in ARCHIVE_SUFFIXES)
+
+
+class GEMDArchive:
+    """
+    Single-file, append-only archive of GEMD objects: one thin JSON per line (newline-delimited JSON), uncompressed
+    (.ndjson) or compressed (.ndjson.gz, .ndjson.zst) in independent blocks of block_size objects, so that any block
+    can be decompressed on its own. A sidecar index (<archive>.idx) records, per object, the offset of its line or
+    block, its position in the block, and its type, name and uids, so that objects can be found and read without
+    scanning the archive. Reading the archive in order only needs the archive itself: gzip and zstd readers
+    decompress consecutive blocks as one stream.
+
+    Used as a context manager, in mode "r" to read, or "a" to append.
+    """
+
+    def __init__(self, path, mode="r", block_size=256):
+        if mode not in ("r", "a"):
+            raise ValueError(f"unknown mode {mode}, expected 'r' or 'a'.")
+        self.path = Path(path)
+        self.index_path = Path(str(self.path) + ARCHIVE_INDEX_SUFFIX)
+        self.compression = archive_compression(self.path)
+        if self.compression == "zstd" and zstandard is None:
+            raise ImportError("zstandard is required for .ndjson.zst archives.")
+        self.mode = mode
+        self.block_size = block_size if self.compression else 1
+        self._block = []
+        self._block_entries = []
+        self._cached_block = (None, None)
+        if mode == "a":
+            self._file = open(self.path, "ab")
+            self._index_file = open(self.index_path, "a")
+        else:
+            self._file = open(self.path, "rb")
+            self._index_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.mode == "a":
+            self._flush_block()
+            self._index_file.close()
+        self._file.close()
+
+    def append(self, obj):
+        """appends a thin GEMD object, given as a dict"""
+        self.append_dumped(
+            json_backend.dumps(obj), obj.get("uids"), obj.get("type"), obj.get("name")
+        )
+
+    def append_dumped(self, text, uids, obj_type, name):
+        """appends a thin GEMD object already dumped to JSON, on a single line (i.e., without indent)
+
+        Args:
+            text (str): JSON of the object
+            uids (dict): uids of the object, by scope
+            obj_type (str): type of the object
+            name (str): name of the object
+        """
+        self._block.append(text)
+        self._block_entries.append([obj_type, name, uids])
+        if len(self._block) >= self.block_size:
+            self._flush_block()
+
+    def _flush_block(self):
+        if not self._block:
+            return
+        offset = self._file.seek(0, io.SEEK_END)
+        data = "".join(text + "\n" for text in self._block).encode()
+        if self.compression == "gzip":
+            data = gzip.compress(data)
+        elif self.compression == "zstd":
+            data = zstandard.ZstdCompressor().compress(data)
+        self._file.write(data)
+        for position, entry in enumerate(self._block_entries):
+            self._index_file.write(json_backend.dumps([offset, position, *entry]) + "\n")
+        self._block, self._block_entries = [], []
+
+    def __iter__(self):
+        """yields every object of the archive, as dicts, in order"""
+        self._file.seek(0)
+        if self.compression == "gzip":
+            stream = gzip.GzipFile(fileobj=self._file, mode="rb")
+        elif self.compression == "zstd":
+            stream = zstandard.ZstdDecompressor().stream_reader(
+                self._file, read_across_frames=True
+            )
+        else:
+            stream = self._file
+        for line in io.TextIOWrapper(stream, encoding="utf-8"):
+            if line.strip():
+                yield json_backend.loads(line)
+
+    def entries(self):
+        """yields the index entries of the objects: (offset, position, type, name, uids)"""
+        if not self.index_path.exists():
+            return
+        with open(self.index_path) as f:
+            for line in f:
+                yield tuple(json_backend.loads(line))
+
+    def locate(self, uids=None, types=None, scope="auto"):
+        """returns the index entries of the objects matching uids and/or types, in order
+
+        Args:
+            uids (list, optional): uids, in scope. Defaults to None, for any.
+            types (list, optional): GEMD types. Defaults to None, for any.
+            scope (str, optional): scope of the uids. Defaults to "auto".
+
+        Returns:
+            list: (offset, position) of the objects
+        """
+        uids = None if uids is None else set(uids)
+        types = None if types is None else set(types)
+        return [
+            (offset, position)
+            for offset, position, obj_type, _, obj_uids in self.entries()
+            if (uids is None or (obj_uids or {}).get(scope) in uids)
+            and (types is None or obj_type in types)
+        ]
+
+    def read_at(self, offset, position=0):
+        """reads the object at an offset and position, as recorded in the index
+
+        Returns:
+            dict: the object
+        """
+        if self.compression is None:
+            self._file.seek(offset)
+            return json_backend.loads(self._file.readline())
+        cached_offset, lines = self._cached_block
+        if cached_offset != offset:
+            self._file.seek(offset)
+            if self.compression == "gzip":
+                decompressor = zlib.decompressobj(31)
+                data = b""
+                while not decompressor.eof:
+                    chunk = self._file.read(1 << 16)
+                    if not chunk:
+                        break
+                    data += decompressor.decompress(chunk)
+            else:
+                data = zstandard.ZstdDecompressor().stream_reader(self._file).read()
+            lines = data.decode("utf-8").splitlines()
+            self._cached_block = (offset, lines)
+        return json_backend.loads(lines[position])
@@ -260,6 +260,112 @@ class OpenMSIModelParser(ArgumentParser):
                 "default": "auto",
             },
         ],
+        "n_workers": [
+            "optional",
+            {
+                "type": positive_int,
+                "default": None,
+                "help": "number of processes used to parse folders of GEMD JSONs (serial if not given)",
+            },
+        ],
+        "bulk_insert": [
+            "optional",
+            {
+                "action": "store_true",
+                "default": False,
+                "help": "whether to accumulate nodes and edges while reading GEMD objects and insert them in bulk (faster on large models)",
+            },
+        ],
+        "keep_uid_keys": [
+            "optional",
+            {
+                "action": "store_true",
+                "default": False,
+                "help": "whether to keep uids as node keys, storing display names in a 'label' attribute, instead of relabeling (copying) the graph",
+            },
+        ],
+        "render_components": [
+            "optional",
+            {
+                "action": "store_true",
+                "default": False,
+                "help": "whether to render svg and dot files per connected component, in parallel over n_workers processes",
+            },
+        ],
+        "max_component_nodes": [
+            "optional",
+            {
+                "type": positive_int,
+                "default": 2000,
+                "help": "number of nodes above which a component is rendered as a summary instead of laid out",
+            },
+        ],
+        "attribute_table": [
+            "optional",
+            {
+                "action": "store_true",
+                "default": False,
+                "help": "whether to collect attribute values into a columnar table (saved as csv) instead of node attribute strings, in the visualisation layout",
+            },
+        ],
+        "sample": [
+            "optional",
+            {
+                "type": str,
+                "choices": ["bfs", "random_walk", "stratified", "closure"],
+                "default": None,
+                "help": "strategy to sample gemd objects with, keeping the graph connected",
+            },
+        ],
+        "sample_size": [
+            "optional",
+            {
+                "type": positive_int,
+                "default": 1000,
+                "help": "maximum number of gemd objects to sample",
+            },
+        ],
+        "random_state": [
+            "optional",
+            {
+                "type": int,
+                "default": None,
+                "help": "seed of the random number generator used for sampling",
+            },
+        ],
+        "summarize_by": [
+            "optional",
+            {
+                "type": str,
+                "default": None,
+                "help": "grouping criterion (template, short_name, or a node attribute) to render graphs larger than max_component_nodes as summaries",
+            },
+        ],
+        "compact_dumps": [
+            "optional",
+            {
+                "action": "store_true",
+                "default": False,
+                "help": "whether to dump thin JSONs on a single line each, without pretty-printing",
+            },
+        ],
+        "db_backend": [
+            "optional",
+            {
+                "type": str,
+                "choices": ["mssql", "sqlite"],
+                "default": "mssql",
+                "help": "database backend: Microsoft SQL Server, or a local SQLite file named database_name (no credentials needed)",
+            },
+        ],
+        "closure": [
+            "optional",
+            {
+                "action": "store_true",
+                "default": False,
+                "help": "whether to load the GEMDClosure of models, and answer reachability queries from it",
+            },
+        ],
         "synthesis_path": [
             "optional",
             {
@@ -0,0 +1,158 @@
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from gemd.json import GEMDJson
+from openmsimodel.entity.gemd.impl import traverse, set_uuids
+from openmsimodel.utilities import json_backend
+
+
+def thin_json_filename(item):
+    """returns the name of the file the thin JSON of a GEMD object is dumped to"""
+    return "_".join([item.__class__.__name__, item.name, item.uids["auto"], ".json"])
+
+
+def _collect_items(obj):
+    """returns the GEMD objects obj links to, once each by file name, in traversal order"""
+    items = {}
+
+    def collect(item):
+        items.setdefault(thin_json_filename(item), item)
+
+    traverse(obj, pre=collect)
+    return list(items.items())
+
+
+_dump_items = None
+_dump_encoder = None
+_dump_indent = None
+
+
+def _init_dump_worker(obj, encoder, indent):
+    """initializer of the serialization processes: each one receives the model once, and traverses it the same
+    way the main process does, so that chunks of objects are sent as positions only"""
+    global _dump_items, _dump_encoder, _dump_indent
+    _dump_items = _collect_items(obj)
+    _dump_encoder = encoder
+    _dump_indent = indent
+
+
+def _dump_chunk(positions):
+    """serializes the objects at positions, returning (file name, thin JSON) pairs"""
+    return [
+        (
+            _dump_items[i][0],
+            json_backend.thin_dumps(
+                _dump_encoder, _dump_items[i][1], indent=_dump_indent, assign_uids=False
+            ),
+        )
+        for i in positions
+    ]
+
+
+def _write_files(destination, files, fsync, errors):
+    while True:
+        item = files.get()
+        if item is None:
+            return
+        if errors:  # drains the queue without writing once a writer failed
+            continue
+        fn, text = item
+        try:
+            with open(os.path.join(destination, fn), "w") as fp:
+                fp.write(text)
+                if fsync:
+                    fp.flush()
+                    os.fsync(fp.fileno())
+        except Exception as e:
+            errors.append(e)
+
+
+def dump_thin_jsons(
+    obj,
+    destination,
+    encoder=None,
+    indent=3,
+    n_workers=None,
+    n_writers=4,
+    max_queued=256,
+    chunk_size=64,
+    fsync=False,
+):
+    """dumps obj and every GEMD object it links to as thin JSONs, a file per object, as ScienceKit.out does,
+    through a pipeline: objects are collected during a traversal of obj, serialized by a pool of n_workers processes
+    (in chunks of chunk_size objects, at most 2 * n_workers of them at once), and written by n_writers threads fed through a queue of at most max_queued
+    files, so that serialization, writes and their latency (e.g., with fsync) overlap.
+
+    Args:
+        obj (BaseEntity): GEMD object, or list of them
+        destination (str, Path): existing folder to write to
+        encoder (GEMDJson, optional): GEMD encoder, for its scope. Defaults to None, for GEMDJson().
+        indent (int, optional): indentation of the JSONs. Defaults to 3. None drops pretty-printing.
+        n_workers (int, optional): number of serialization processes. Defaults to None, serializing in this process.
+        n_writers (int, optional): number of I/O threads. Defaults to 4.
+        max_queued (int, optional): maximum number of serialized files waiting to be written. Defaults to 256.
+        chunk_size (int, optional): number of objects per serialization task. Defaults to 64.
+        fsync (bool, optional): whether to fsync every file written. Defaults to False.
+
+    Returns:
+        int: number of files written
+    """
+    encoder = GEMDJson() if encoder is None else encoder
+    # uids are assigned once, before the model is sent to the workers, so that all of them see the same uids
+    set_uuids(obj, encoder.scope)
+    items = _collect_items(obj)
+    files = queue.Queue(maxsize=max_queued)
+    errors = []
+    writers = [
+        threading.Thread(
+            target=_write_files, args=(destination, files, fsync, errors), daemon=True
+        )
+        for _ in range(n_writers)
+    ]
+    for writer in writers:
+        writer.start()
+    try:
+        if n_workers is None:
+            for fn, item in items:
+                text = json_backend.thin_dumps(
+                    encoder, item, indent=indent, assign_uids=False
+                )
+                files.put((fn, text))
+                if errors:
+                    break
+        else:
+            chunks = (
+                range(start, min(start + chunk_size, len(items)))
+                for start in range(0, len(items), chunk_size)
+            )
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=_init_dump_worker,
+                initargs=(obj, encoder, indent),
+            ) as executor:
+                # at most 2 * n_workers chunks are in flight, and the next one is submitted once one is queued,
+                # so that serialized chunks don't pile up here while the writers are slower than the workers
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(executor.submit(_dump_chunk, chunk))
+                    if len(pending) >= 2 * n_workers:
+                        for item in pending.popleft().result():
+                            files.put(item)
+                    if errors:
+                        break
+                while pending and not errors:
+                    for item in pending.popleft().result():
+                        files.put(item)
+                for future in pending:
+                    future.cancel()
+    finally:
+        for _ in writers:
+            files.put(None)
+        for writer in writers:
+            writer.join()
+    if errors:
+        raise errors[0]
+    return len(items)
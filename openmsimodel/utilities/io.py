@@ -1,17 +1,170 @@
-import json
 import os
+import json
+import hashlib
+import sqlite3
+import zipfile
 from pathlib import Path
 import glob
+import numpy as np
 import networkx as nx
-import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from openmsimodel.utilities.archive import GEMDArchive, is_gemd_archive
+from openmsimodel.utilities import json_backend
+
+GRAPH_CACHE_SUFFIX = ".cache"
+GRAPH_CACHE_VERSION = 2
+
+
+def graph_cache_path(graphml_filename):
+    """path of the binary cache of a GraphML file, next to it"""
+    return str(graphml_filename) + GRAPH_CACHE_SUFFIX
+
+
+def _attribute_table(attribute_dicts):
+    """turns a sequence of attribute dicts into a columnar table: name -> (positions, values).
+
+    Returns None if an attribute holds values of several types, which GraphML doesn't read back as written.
+    """
+    columns = {}
+    types = {}
+    for i, attrs in enumerate(attribute_dicts):
+        for name, value in attrs.items():
+            if isinstance(value, np.generic):
+                value = value.item()
+            if types.setdefault(name, type(value)) is not type(value):
+                return None
+            positions, values = columns.setdefault(name, ([], []))
+            positions.append(i)
+            values.append(value)
+    return columns
+
+
+def _attribute_dicts(table, size):
+    """inverse of _attribute_table"""
+    attribute_dicts = [{} for _ in range(size)]
+    for name, (positions, values) in table.items():
+        for i, value in zip(positions, values):
+            attribute_dicts[i][name] = value
+    return attribute_dicts
+
+
+def write_graph_cache(G, graphml_filename):
+    """writes the binary cache of a graph next to the GraphML file it was just written to (or read from):
+    an uncompressed NumPy archive of node ids and of edges as an array of node positions, with the graph and the
+    node and edge attribute tables as JSON. Nothing in it is pickled, so reading a cache can't run code.
+    The cache records the modification time and size of the GraphML file, and is only used while they match.
+    Graphs GraphML can't represent exactly (multigraphs, attributes of mixed types) aren't cached.
+
+    Args:
+        G (NetworkX graph): graph, as written to graphml_filename
+        graphml_filename (str, Path): GraphML file
+
+    Returns:
+        str: path to the cache, or None if the graph isn't cached
+    """
+    cache_filename = graph_cache_path(graphml_filename)
+    node_table = None if G.is_multigraph() else _attribute_table(d for _, d in G.nodes(data=True))
+    edge_table = None if node_table is None else _attribute_table(d for _, _, d in G.edges(data=True))
+    graph = {"node_default": {}, "edge_default": {}}
+    graph.update(G.graph)
+    stat = os.stat(graphml_filename)
+    try:
+        meta = json.dumps(
+            {
+                "version": GRAPH_CACHE_VERSION,
+                "graphml": [stat.st_mtime_ns, stat.st_size],
+                "directed": G.is_directed(),
+                "graph": graph,
+                "node_attributes": node_table,
+                "edge_attributes": edge_table,
+            }
+        )
+    except TypeError:  # attributes JSON can't hold
+        edge_table = None
+    if edge_table is None:
+        if os.path.exists(cache_filename):
+            os.remove(cache_filename)
+        return None
+    positions = {n: i for i, n in enumerate(G)}
+    edges = np.array(
+        [(positions[u], positions[v]) for u, v in G.edges()], dtype=np.int64
+    ).reshape(-1, 2)
+    nodes = np.array([str(n) for n in G], dtype=np.str_)
+    # an open file, as np.savez appends ".npz" to file names
+    with open(cache_filename, "wb") as f:
+        np.savez(f, meta=np.array(meta), nodes=nodes, edges=edges)
+    return cache_filename
+
+
+def read_graph_cache(graphml_filename):
+    """reads the graph of a GraphML file from its binary cache, if it is fresh.
+    Anything but a cache written by :func:`~write_graph_cache` is ignored; pickled data is never loaded.
+
+    Args:
+        graphml_filename (str, Path): GraphML file
+
+    Returns:
+        NetworkX graph: graph, or None if there is no fresh cache
+    """
+    try:
+        stat = os.stat(graphml_filename)
+        data = np.load(graph_cache_path(graphml_filename), allow_pickle=False)
+    except (OSError, ValueError, EOFError, zipfile.BadZipFile):
+        # missing, pickled (refused), or not a NumPy file
+        return None
+    if not isinstance(data, np.lib.npyio.NpzFile):
+        return None
+    try:
+        with data:
+            meta = json.loads(str(data["meta"][()]))
+            nodes = data["nodes"].tolist()
+            edges = data["edges"].tolist()
+    except (OSError, ValueError, KeyError, IndexError, zipfile.BadZipFile):
+        # incomplete, or arrays of objects (refused)
+        return None
+    if not (
+        isinstance(meta, dict)
+        and meta.get("version") == GRAPH_CACHE_VERSION
+        and meta.get("graphml") == [stat.st_mtime_ns, stat.st_size]
+    ):
+        return None
+    G = nx.DiGraph() if meta["directed"] else nx.Graph()
+    G.graph.update(meta["graph"])
+    G.add_nodes_from(zip(nodes, _attribute_dicts(meta["node_attributes"], len(nodes))))
+    G.add_edges_from(
+        (nodes[u], nodes[v], d)
+        for (u, v), d in zip(edges, _attribute_dicts(meta["edge_attributes"], len(edges)))
+    )
+    return G
+
+
+def read_graphml_cached(graphml_filename):
+    """reads a GraphML file, from its binary cache if it is fresh, or else parsing it and (re)writing the cache.
+
+    Args:
+        graphml_filename (str, Path): GraphML file
+
+    Returns:
+        NetworkX graph: graph
+    """
+    G = read_graph_cache(graphml_filename)
+    if G is None:
+        G = nx.read_graphml(graphml_filename)
+        try:
+            write_graph_cache(G, graphml_filename)
+        except OSError:  # e.g., read-only folder
+            pass
+    return G
+
 
 def from_graphml(graphml_filename):
     if not os.path.exists(graphml_filename):
         raise FileNotFoundError(f"GraphML file '{graphml_filename}' not found.")
-    time.sleep(1)
-    graph_source = nx.read_graphml(graphml_filename)
+    graph_source = read_graphml_cached(graphml_filename)
     for n, d in graph_source.nodes(data=True):
-        d.update(json.loads(d.pop("object", "{}")))
+        d.update(json_backend.loads(d.pop("object", "{}")))
     return graph_source
 
 def read_graphml_from_folder(graphml_folder):
@@ -24,13 +177,426 @@ def read_graphml_from_folder(graphml_folder):
         entire_graph.add_edges_from(individual_graph.edges(data=True))
     return entire_graph
 
-def read_gemd_data(dirpath, encoder):
+def list_gemd_files(dirpath):
+    """lists the JSON files of a GEMD folder in a deterministic order (sorted per directory, depth first).
+
+    Args:
+        dirpath (str, Path): path to directory containing GEMD thin JSONs
+
+    Returns:
+        list: paths of all JSON files found under dirpath
+    """
+    gemd_paths = []
+    for dp, dn, filenames in os.walk(dirpath):
+        dn.sort()
+        for f in sorted(filenames):
+            if f.endswith(".json"):
+                gemd_paths.append(Path(os.path.join(dp, f)))
+    return gemd_paths
+
+
+def _load_json_chunk(paths):
+    """loads a chunk of JSON files. Module level so it can be shipped to worker processes.
+
+    Args:
+        paths (list): paths of JSON files to load
+
+    Returns:
+        list: parsed content of each file, in the order of paths
+    """
+    loaded = []
+    for path in paths:
+        with open(path) as fp:
+            loaded.append(json_backend.load(fp))
+    return loaded
+
+
+def _iter_json_files(gemd_paths, n_workers=None, chunk_size=256):
+    """yields (obj, path) for every path, parsing files in a process pool if n_workers > 1.
+    At most 2 * n_workers chunks are in flight at once, so memory stays bounded by the chunk size
+    and not by the size of the folder. Order of gemd_paths is preserved.
+
+    Args:
+        gemd_paths (list): paths of JSON files to load
+        n_workers (int, optional): number of worker processes. Defaults to None (serial).
+        chunk_size (int, optional): number of files parsed per task. Defaults to 256.
+    """
+    if not n_workers or n_workers <= 1 or len(gemd_paths) <= chunk_size:
+        for path in gemd_paths:
+            with open(path) as fp:
+                yield json_backend.load(fp), path
+        return
+
+    chunks = (
+        gemd_paths[i : i + chunk_size] for i in range(0, len(gemd_paths), chunk_size)
+    )
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((executor.submit(_load_json_chunk, chunk), chunk))
+            if len(pending) >= 2 * n_workers:
+                future, paths = pending.popleft()
+                yield from zip(future.result(), paths)
+        while pending:
+            future, paths = pending.popleft()
+            yield from zip(future.result(), paths)
+
+
+GEMD_INDEX_FILENAME = ".gemd_index.sqlite"
+GEMD_INDEX_VERSION = 1
+
+
+def gemd_cache_dir():
+    """folder of the caches of openmsimodel: $OPENMSIMODEL_CACHE_DIR, or else openmsimodel in the user cache folder
+    ($XDG_CACHE_HOME, ~/.cache by default)"""
+    if os.environ.get("OPENMSIMODEL_CACHE_DIR"):
+        return Path(os.environ["OPENMSIMODEL_CACHE_DIR"])
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "openmsimodel"
+
+
+def default_gemd_index_path(dirpath):
+    """path of the uid index of a folder in the cache folder (see :func:`~gemd_cache_dir`), named after the absolute
+    path of the folder, so that data folders, which may be shared or read-only, aren't written to.
+    Pass index_path=Path(dirpath) / GEMD_INDEX_FILENAME to keep the index in the folder instead."""
+    dirpath = Path(dirpath).resolve()
+    key = hashlib.sha1(str(dirpath).encode()).hexdigest()[:16]
+    return gemd_cache_dir() / "gemd_index" / "{}_{}.sqlite".format(dirpath.name, key)
+
+
+def _gemd_file_order(path):
+    """sort key giving the order of list_gemd_files to relative paths"""
+    path = Path(path)
+    return path.parent.parts, path.name
+
+
+class GEMDIndex:
+    """
+    Persistent SQLite index of a folder of GEMD JSONs, mapping every uid (in every scope) to the file holding its
+    object, with its position in the file, type and name, so that objects can be looked up without scanning the
+    folder. Files are recorded with their modification time and size: updating the index only re-reads the files
+    added or changed since, and forgets the deleted ones. Paths are stored relative to the folder.
+    The index is kept in the cache folder by default (see :func:`~default_gemd_index_path`), not in the data folder.
+    Built and updated with :func:`~index_gemd_folder`.
+    """
+
+    def __init__(self, dirpath, index_path=None):
+        self.dirpath = Path(dirpath)
+        self.index_path = (
+            Path(index_path)
+            if index_path is not None
+            else default_gemd_index_path(self.dirpath)
+        )
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.index_path))
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != GEMD_INDEX_VERSION:
+            self.connection.executescript(
+                """
+                DROP TABLE IF EXISTS files;
+                DROP TABLE IF EXISTS objects;
+                CREATE TABLE files (path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER);
+                CREATE TABLE objects (
+                    scope TEXT, uid TEXT, path TEXT, position INTEGER, type TEXT, name TEXT
+                );
+                CREATE INDEX objects_uid ON objects (uid, scope);
+                CREATE INDEX objects_type ON objects (type);
+                CREATE INDEX objects_path ON objects (path);
+                PRAGMA user_version = {};
+                """.format(
+                    GEMD_INDEX_VERSION
+                )
+            )
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def update(self, n_workers=None):
+        """brings the index up to date with the folder
+
+        Args:
+            n_workers (int, optional): number of processes to parse the new and changed files with. Defaults to None (serial).
+
+        Returns:
+            tuple: numbers of files added, changed and deleted
+        """
+        recorded = {
+            path: (mtime_ns, size)
+            for path, mtime_ns, size in self.connection.execute(
+                "SELECT path, mtime_ns, size FROM files"
+            )
+        }
+        stats = {}
+        to_read = []
+        for path in list_gemd_files(self.dirpath):
+            relative = path.relative_to(self.dirpath).as_posix()
+            stat = os.stat(path)
+            stats[relative] = (stat.st_mtime_ns, stat.st_size)
+            if recorded.get(relative) != stats[relative]:
+                to_read.append(path)
+        deleted = [path for path in recorded if path not in stats]
+        added = [path for path in to_read if path.relative_to(self.dirpath).as_posix() not in recorded]
+        with self.connection:
+            for relative in deleted:
+                self.connection.execute("DELETE FROM files WHERE path = ?", (relative,))
+            for relative in deleted + [
+                path.relative_to(self.dirpath).as_posix() for path in to_read
+            ]:
+                self.connection.execute("DELETE FROM objects WHERE path = ?", (relative,))
+            rows = []
+            for content, path in _iter_json_files(to_read, n_workers=n_workers):
+                relative = path.relative_to(self.dirpath).as_posix()
+                if type(content) == dict:
+                    content = [content]
+                for position, obj in enumerate(content):
+                    if not isinstance(obj, dict):
+                        continue
+                    # objects without uids get a row of their own, to be found by type
+                    for scope, uid in (obj.get("uids") or {None: None}).items():
+                        rows.append(
+                            (scope, uid, relative, position, obj.get("type"), obj.get("name"))
+                        )
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?)",
+                    (relative, *stats[relative]),
+                )
+                if len(rows) >= 10000:
+                    self.connection.executemany(
+                        "INSERT INTO objects VALUES (?, ?, ?, ?, ?, ?)", rows
+                    )
+                    rows = []
+            self.connection.executemany(
+                "INSERT INTO objects VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+        return len(added), len(to_read) - len(added), len(deleted)
+
+    def lookup(self, uid, scope="auto"):
+        """returns where the object(s) of a uid are
+
+        Args:
+            uid (str): uid
+            scope (str, optional): scope of the uid. Defaults to "auto".
+
+        Returns:
+            list: (path, position in the file, type, name) of every entry of the uid, in the order of list_gemd_files
+        """
+        rows = self.connection.execute(
+            "SELECT path, position, type, name FROM objects WHERE uid = ? AND scope = ?",
+            (uid, scope),
+        ).fetchall()
+        return sorted(
+            [(self.dirpath / path, position, typ, name) for path, position, typ, name in rows],
+            key=lambda row: (_gemd_file_order(row[0].relative_to(self.dirpath)), row[1]),
+        )
+
+    def locate(self, uids=None, types=None, scope="auto"):
+        """returns the entries of the objects matching uids and/or types
+
+        Args:
+            uids (list, optional): uids, in scope. Defaults to None, for any.
+            types (list, optional): GEMD types, e.g., "material_run". Defaults to None, for any.
+            scope (str, optional): scope of the uids. Defaults to "auto".
+
+        Returns:
+            list: (path, position in the file) of every entry, in the order of list_gemd_files
+        """
+        select = "SELECT DISTINCT path, position, type FROM objects"
+        if uids is None and types is None:
+            entries = set(self.connection.execute(select))
+        else:
+            if uids is not None:
+                values, condition = list(uids), " WHERE scope = ? AND uid IN ({})"
+            else:
+                values, condition = list(types), " WHERE type IN ({})"
+            entries = set()
+            # binding in batches, under the SQLite limit of parameters
+            for i in range(0, len(values), 500):
+                batch = values[i : i + 500]
+                params = ([scope] if uids is not None else []) + batch
+                entries.update(
+                    self.connection.execute(
+                        select + condition.format(",".join("?" * len(batch))), params
+                    )
+                )
+        if types is not None:
+            entries = {entry for entry in entries if entry[2] in types}
+        return [
+            (self.dirpath / path, position)
+            for path, position, _ in sorted(
+                entries, key=lambda entry: (_gemd_file_order(entry[0]), entry[1])
+            )
+        ]
+
+
+def index_gemd_folder(dirpath, index_path=None, n_workers=None):
+    """builds or updates the uid index of a folder of GEMD JSONs (see :class:`~GEMDIndex`)
+
+    Args:
+        dirpath (str, Path): path to directory containing GEMD JSONs
+        index_path (str, Path, optional): SQLite file of the index. Defaults to None, for a file in the cache folder
+            (see :func:`~default_gemd_index_path`); the folder itself isn't written to unless index_path is in it.
+        n_workers (int, optional): number of processes to parse files with. Defaults to None (serial).
+
+    Returns:
+        GEMDIndex: the index, up to date
+    """
+    index = GEMDIndex(dirpath, index_path=index_path)
+    added, changed, deleted = index.update(n_workers=n_workers)
+    print(
+        "-- Indexed {}: {} added, {} changed, {} deleted files".format(
+            dirpath, added, changed, deleted
+        )
+    )
+    return index
+
+
+def _iter_indexed_objects(index, uids=None, types=None, scope="auto"):
+    """yields (obj, path) for the objects of an index matching uids and/or types, reading only their files"""
+    wanted_uids = None if uids is None else set(uids)
+    current_path, content = None, None
+    for path, position in index.locate(uids=uids, types=types, scope=scope):
+        if path != current_path:
+            with open(path) as fp:
+                content = json_backend.load(fp)
+            if type(content) == dict:
+                content = [content]
+            current_path = path
+        obj = content[position]
+        # files holding several objects are filtered object by object
+        if wanted_uids is not None and obj.get("uids", {}).get(scope) not in wanted_uids:
+            continue
+        if types is not None and obj.get("type") not in types:
+            continue
+        yield obj, path
+
+
+def iter_gemd_data(
+    dirpath,
+    encoder,
+    n_workers=None,
+    chunk_size=256,
+    uids=None,
+    types=None,
+    scope="auto",
+    index_path=None,
+    update_index=True,
+):
+    """generator version of read_gemd_data. Yields GEMD objects lazily together with the path they were read from,
+    whether from a folder of JSONs, a single JSON, a GEMD archive (see :class:`~GEMDArchive`)
+    or a list of in-memory objects.
+    Objects can be restricted to uids and/or types: the files of a folder holding them are then found through its
+    uid index (see :func:`~index_gemd_folder`), updated beforehand, and only those are read,
+    and the objects of an archive through its own index.
+
+    Args:
+        dirpath (str, Path, list): path to directory, file or archive containing GEMD knowledge, or list of GEMD objects
+        encoder (GEMDJson): GEMD encoder
+        n_workers (int, optional): number of processes to parse files of a folder with. Defaults to None (serial).
+        chunk_size (int, optional): number of files handed to a worker at once. Defaults to 256.
+        uids (list, optional): uids of the objects to load, in scope. Defaults to None, for all.
+        types (list, optional): types of the objects to load. Defaults to None, for all.
+        scope (str, optional): scope of uids. Defaults to "auto".
+        index_path (str, Path, optional): SQLite file of the uid index of a folder. Defaults to None,
+            for a file in the cache folder (see :func:`~default_gemd_index_path`).
+        update_index (bool, optional): whether to bring the index up to date first, which stats every file.
+            Defaults to True.
+
+    Raises:
+        IOError: if folder or file doesn't match the criteria
+
+    Yields:
+        tuple: (gemd object as dict, pathlib.Path to its file or None)
+    """
+    if uids is not None or types is not None:
+        if type(dirpath) != list and os.path.isdir(dirpath):
+            print("Extracting indexed objects of folder...")
+            if index_path is None:
+                index_path = default_gemd_index_path(dirpath)
+            if update_index or not Path(index_path).exists():
+                index = index_gemd_folder(
+                    dirpath, index_path=index_path, n_workers=n_workers
+                )
+            else:
+                index = GEMDIndex(dirpath, index_path=index_path)
+            with index:
+                yield from _iter_indexed_objects(
+                    index, uids=uids, types=types, scope=scope
+                )
+            return
+        if type(dirpath) != list and is_gemd_archive(dirpath):
+            print("Extracting indexed objects of archive...")
+            with GEMDArchive(dirpath) as archive:
+                for offset, position in archive.locate(
+                    uids=uids, types=types, scope=scope
+                ):
+                    yield archive.read_at(offset, position), Path(dirpath)
+            return
+        wanted_uids = None if uids is None else set(uids)
+        for obj, path in iter_gemd_data(
+            dirpath, encoder, n_workers=n_workers, chunk_size=chunk_size
+        ):
+            if wanted_uids is not None and obj["uids"].get(scope) not in wanted_uids:
+                continue
+            if types is not None and obj["type"] not in types:
+                continue
+            yield obj, path
+    elif type(dirpath) == list:
+        print("Extracting list...")
+        for obj in dirpath:
+            yield json_backend.loads(json_backend.thin_dumps(encoder, obj)), None
+    elif os.path.isdir(dirpath):
+        print("Extracting folder...")
+        yield from _iter_json_files(
+            list_gemd_files(dirpath), n_workers=n_workers, chunk_size=chunk_size
+        )
+    elif os.path.isfile(dirpath) and is_gemd_archive(dirpath):
+        print("Extracting archive...")
+        with GEMDArchive(dirpath) as archive:
+            for obj in archive:
+                yield obj, Path(dirpath)
+    elif os.path.isfile(dirpath) and str(dirpath).endswith(".json"):
+        print("Extracting file...")
+        with open(dirpath) as fp:
+            content = json_backend.load(fp)
+        if type(content) == dict:
+            content = [content]
+        for obj in content:
+            yield obj, Path(dirpath)
+    else:
+        raise IOError(
+            f"couldn't extract GEMD data from {dirpath}. Expected folder of JSONs, single JSON with 1+ objects, GEMD archive, or list of objects."
+        )
+
+
+def read_gemd_data(
+    dirpath,
+    encoder,
+    n_workers=None,
+    uids=None,
+    types=None,
+    scope="auto",
+    index_path=None,
+    update_index=True,
+):
     """helper to extract GEMD data from all scenarios, whether folder of JSONs or single JSON, thin or full, etc.
     it raises IOError in case the data can't be properly extracted.
+    Materializes everything in memory; prefer iter_gemd_data for large folders.
+    Targeted loads of uids and/or types read only the files holding them, through the uid index of a folder.
 
     Args:
         dirpath (str, Path): path to directory or file containing GEMD knowledge
         encoder (GEMDJson): GEMD encoder
+        n_workers (int, optional): number of processes to parse files with. Defaults to None (serial).
+        uids (list, optional): uids of the objects to load, in scope. Defaults to None, for all.
+        types (list, optional): types of the objects to load. Defaults to None, for all.
+        scope (str, optional): scope of uids. Defaults to "auto".
+        index_path (str, Path, optional): SQLite file of the uid index of a folder. Defaults to None.
+        update_index (bool, optional): whether to bring the index up to date first. Defaults to True.
 
     Raises:
         IOError: if folder or file doesn't match the criteria
@@ -40,32 +606,19 @@ def read_gemd_data(dirpath, encoder):
     """
     gemd_objects = []
     gemd_paths = []
-    # try:
-    if True:
-        if type(dirpath) == list:
-            print("Extracting list...")
-            for obj in dirpath:
-                gemd_objects.append(json.loads(encoder.thin_dumps(obj)))
-        elif os.path.isdir(dirpath):
-            print("Extracting folder...")
-            for dp, dn, filenames in os.walk(dirpath):
-                for f in filenames:
-                    if f.endswith(".json"):
-                        path = os.path.join(dp, f)
-                        with open(path) as fp:
-                            gemd_objects.append(json.load(fp))
-                            gemd_paths.append(Path(path))
-        elif os.path.isfile(dirpath) and str(dirpath).endswith(".json"):
-            print("Extracting file...")
-            if f.endswith(".json"):
-                with open(dirpath) as fp:
-                    gemd_objects = json.load(fp)
-
-            #     gemd_objects = json.load(fp)
-    # except:
-    #     raise IOError(  # FIXME
-    #         f"couldn't extract GEMD data. Expected folder of JSONs or single JSON with 1+ objects. "
-    #     )
+    for obj, path in iter_gemd_data(
+        dirpath,
+        encoder,
+        n_workers=n_workers,
+        uids=uids,
+        types=types,
+        scope=scope,
+        index_path=index_path,
+        update_index=update_index,
+    ):
+        gemd_objects.append(obj)
+        if path is not None:
+            gemd_paths.append(path)
     if len(gemd_objects) == 0:  # FIXME: better message, like filenotfound
         raise ValueError(f"Couldn't extract any gemd object from {dirpath}. ")
-    return gemd_objects, gemd_paths
\ No newline at end of file
+    return gemd_objects, gemd_paths
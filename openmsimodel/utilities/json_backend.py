@@ -0,0 +1,159 @@
+import json
+import math
+
+from gemd.entity.dict_serializable import DictSerializable
+from gemd.enumeration.base_enumeration import BaseEnumeration
+from gemd.util.impl import substitute_links
+
+from openmsimodel.entity.gemd.impl import set_uuids
+
+try:
+    import orjson
+except ImportError:  # optional, faster backend
+    orjson = None
+try:
+    import ujson
+except ImportError:  # optional, faster backend
+    ujson = None
+
+JSON_BACKENDS = ["orjson", "ujson", "json"]
+
+
+def available_json_backends():
+    """returns the JSON backends installed, fastest first"""
+    installed = {"orjson": orjson, "ujson": ujson, "json": json}
+    return [name for name in JSON_BACKENDS if installed[name] is not None]
+
+
+_backend = available_json_backends()[0]
+
+
+def get_json_backend():
+    """returns the name of the JSON backend in use"""
+    return _backend
+
+
+def set_json_backend(name=None):
+    """selects the JSON backend used to load and dump GEMD data: "orjson", "ujson" or "json" (standard library).
+
+    Args:
+        name (str, optional): backend name. Defaults to None, for the fastest installed.
+
+    Raises:
+        ValueError: if the backend is unknown
+        ImportError: if the backend isn't installed
+    """
+    global _backend
+    if name is None:
+        name = available_json_backends()[0]
+    if name not in JSON_BACKENDS:
+        raise ValueError(f"unknown JSON backend {name}, expected one of {JSON_BACKENDS}.")
+    if name not in available_json_backends():
+        raise ImportError(f"JSON backend {name} is not installed.")
+    _backend = name
+
+
+def _gemd_default(obj):
+    """serializes the objects the backends don't know of, as GEMDEncoder does"""
+    if isinstance(obj, DictSerializable):
+        return obj.as_dict()
+    if isinstance(obj, BaseEnumeration):
+        return obj.value
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+def loads(text):
+    """parses a JSON string (or bytes) with the current backend. What the backend rejects, e.g., the NaN and
+    Infinity literals the standard library and GEMDJson write, is parsed by the standard library instead."""
+    if _backend == "orjson":
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    elif _backend == "ujson":
+        try:
+            return ujson.loads(text)
+        except ValueError:
+            pass
+    return json.loads(text)
+
+
+def load(fp):
+    """parses a JSON file object with the current backend"""
+    return loads(fp.read())
+
+
+def _all_finite(obj):
+    """whether no float held by obj, through dicts, lists, tuples and GEMD objects, is NaN or infinite"""
+    stack = [obj]
+    seen = set()
+    while stack:
+        this = stack.pop()
+        if isinstance(this, float):
+            if not math.isfinite(this):
+                return False
+        elif isinstance(this, dict):
+            stack.extend(this.values())
+        elif isinstance(this, (list, tuple)):
+            stack.extend(this)
+        elif isinstance(this, DictSerializable) and id(this) not in seen:
+            seen.add(id(this))
+            stack.extend(this.__dict__.values())
+    return True
+
+
+def dumps(obj, indent=None, sort_keys=False, default=None):
+    """serializes obj to a JSON string with the current backend.
+    Only single-line JSON is written by the faster backends: indented JSON (e.g., the thin JSONs ScienceKit and the
+    stores write) is always written by the standard library, so that files are the same whatever is installed.
+    Objects with NaN or infinite floats, which orjson writes as null, and objects the backend rejects
+    (e.g., integers beyond 64 bits) are serialized by the standard library too.
+
+    Args:
+        obj: object to serialize
+        indent (int, optional): indentation. Defaults to None, for a single line.
+        sort_keys (bool, optional): whether to sort the keys of dicts. Defaults to False.
+        default (func, optional): serializes objects the backend doesn't know of. Defaults to None.
+
+    Returns:
+        str: JSON
+    """
+    if indent is not None:
+        pass
+    elif _backend == "orjson" and _all_finite(obj):
+        option = orjson.OPT_SORT_KEYS if sort_keys else 0
+        try:
+            return orjson.dumps(obj, default=default, option=option).decode()
+        except orjson.JSONEncodeError:
+            pass
+    elif _backend == "ujson":
+        try:
+            return ujson.dumps(
+                obj,
+                sort_keys=sort_keys,
+                default=default,
+                escape_forward_slashes=False,
+            )
+        except (TypeError, OverflowError):
+            pass
+    return json.dumps(obj, indent=indent, sort_keys=sort_keys, default=default)
+
+
+def thin_dumps(encoder, obj, indent=None, assign_uids=True):
+    """serializes the thin version of a GEMD object, as encoder.thin_dumps does, with the current backend
+
+    Args:
+        encoder (GEMDJson): GEMD encoder, for its scope
+        obj (BaseEntity): GEMD object
+        indent (int, optional): indentation. Defaults to None, for a single line.
+        assign_uids (bool, optional): whether to assign uids to the objects obj links to that have none first,
+            which traverses all of them. Defaults to True, as GEMDJson does.
+
+    Returns:
+        str: JSON, with link_by_uid in place of pointers to other objects
+    """
+    if assign_uids:
+        set_uuids(obj, encoder.scope)
+    return dumps(
+        substitute_links(obj), indent=indent, sort_keys=True, default=_gemd_default
+    )
@@ -0,0 +1,224 @@
+import unittest, io, contextlib, tempfile, types
+import sqlalchemy as sqla
+
+from openmsimodel.db import schema, queries, statements
+from openmsimodel.db.gemd_database import MSSQLDatabase, open_database
+from openmsimodel.db.open_db import OpenDB
+from config import TEST_CONST
+
+BAKE_HISTORY = (
+    TEST_CONST.TEST_DIR_PATH.parent
+    / "examples"
+    / "bake"
+    / "example_gemd_material_history.json"
+)
+
+
+class TestDB(unittest.TestCase):
+    """
+    Class for testing the loading of GEMD models into a database, on an in-memory SQLite database
+    """
+
+    def setUp(self):
+        self.engine = sqla.create_engine("sqlite://")
+        schema.metadata.create_all(self.engine)
+        self.db = types.SimpleNamespace(ENGINE=self.engine)
+
+    def test_load_model_query(self):
+        """
+        objects are loaded in batches, with their edges and attributes
+        """
+        with contextlib.redirect_stdout(io.StringIO()):
+            model_id = queries.load_model_query(
+                "bake", self.db, BAKE_HISTORY, "citrine-demo", batch_size=7
+            )
+        with self.engine.connect() as conn:
+            count = lambda sql: conn.execute(sqla.text(sql)).scalar()
+            self.assertEqual(
+                count(f"select count(*) from GEMDObject where model_id={model_id}"), 114
+            )
+            self.assertEqual(
+                count(
+                    "select count(*) from GEMDEdge where gemd_ref='material_run:process_run'"
+                ),
+                16,
+            )
+            self.assertEqual(
+                count("select count(*) from GEMDAttribute where attribute_type='parameter'"),
+                8,
+            )
+
+    def test_mssql_pool(self):
+        """
+        MSSQLDatabase creates a single pooled engine, without connecting until it is used
+        """
+        auth = {"host": "localhost", "user": "user", "pwd": "pwd", "database": "GEMD"}
+        db = MSSQLDatabase(auth, pool_size=3, max_overflow=2, pool_recycle=60)
+        status = db.pool_status()
+        self.assertEqual(status["size"], 3)
+        self.assertEqual(status["checked_out"], 0)
+        self.assertEqual(status["max_overflow"], 2)
+        db.dispose()
+
+    def test_sqlite_backend(self):
+        """
+        models loaded in a SQLite database are queried with the SQLite versions of the listed queries
+        """
+        db = open_database({"backend": "sqlite"})
+        with contextlib.redirect_stdout(io.StringIO()):
+            model_id = queries.load_model_query(
+                "bake", db, BAKE_HISTORY, "citrine-demo"
+            )
+        self.assertEqual(len(db.execute_query(queries.show_models("sqlite"))), 1)
+        runs = db.execute_query(
+            queries.top_elements(model_id, 3, "material_run", backend="sqlite")
+        )
+        self.assertEqual(len(runs), 3)
+        reachable = db.execute_query(
+            queries.reachable_nodes_query(runs.uid[0], backend="sqlite")
+        )
+        self.assertGreater(len(reachable), 1)
+        types_ = db.execute_query(queries.gemd_types_query(backend="sqlite"))
+        self.assertIn("material_run", set(types_.gemd_type))
+        paths = db.execute_query(
+            queries.multiple_paths_nodes_query(model_id, backend="sqlite")
+        )
+        self.assertTrue((paths.num_paths > 1).all())
+        db.dispose()
+
+    def test_bound_statements(self):
+        """
+        queries are statements built once per backend, with their arguments bound as parameters
+        """
+        first = queries.top_elements(1, 3, "material_run", backend="sqlite")
+        second = queries.top_elements("2", "5", "process_run", backend="sqlite")
+        self.assertEqual(str(first), str(second))
+        self.assertNotIn("process_run", str(second))
+        self.assertEqual(
+            second.compile().params,
+            {"model_id": 2, "nb": 5, "gemd_type": "process_run"},
+        )
+        self.assertIs(
+            statements.statement("top_elements", "sqlite"),
+            statements.statement("top_elements", "sqlite"),
+        )
+        self.assertIn("top (:nb)", str(queries.top_elements(1, 3, "material_run")))
+        with self.assertRaises(ValueError):
+            queries.display_all(1, "material_run; drop table GEMDObject")
+        # T-SQL isn't handed to other backends: only portable statements run on every backend
+        with self.assertRaises(ValueError):
+            statements.statement("create_edges_query", "sqlite")
+        self.assertEqual(
+            str(queries.show_models("sqlite")), str(queries.show_models("mssql"))
+        )
+
+    def test_closure(self):
+        """
+        the closure loaded with a model matches the one computed from its edges, and answers the reachability
+        queries as the recursive ones do
+        """
+        db = open_database({"backend": "sqlite"})
+        with contextlib.redirect_stdout(io.StringIO()):
+            model_id = queries.load_model_query(
+                "bake", db, BAKE_HISTORY, "citrine-demo", closure=True
+            )
+        closure = db.execute_query("select * from GEMDClosure")
+        self.assertGreater(len(closure), 0)
+        db.execute_update("delete from GEMDClosure")
+        db.execute_update(queries.create_closure_query(model_id, backend="sqlite"))
+        columns = ["ancestor", "descendant", "depth", "max_depth", "paths"]
+        self.assertEqual(
+            closure.sort_values(columns[:2])[columns].values.tolist(),
+            db.execute_query("select * from GEMDClosure")
+            .sort_values(columns[:2])[columns]
+            .values.tolist(),
+        )
+
+        by_closure = db.execute_query(
+            queries.multiple_paths_nodes_query(model_id, "sqlite", closure=True)
+        )
+        recursive = db.execute_query(
+            queries.multiple_paths_nodes_query(model_id, "sqlite")
+        )
+        columns = ["root_uid", "endpoint_uid", "min_level", "max_level", "num_paths"]
+        self.assertEqual(
+            by_closure.sort_values(columns[:2])[columns].values.tolist(),
+            recursive.sort_values(columns[:2])[columns].values.tolist(),
+        )
+
+        counts = db.execute_query(queries.to_node_query(model_id, "sqlite", True))
+        recursive = db.execute_query(queries.to_node_query(model_id, "sqlite"))
+        self.assertEqual(
+            dict(zip(counts.endpoint_uid, counts.num_in_nodes)),
+            dict(recursive.dropna().values.tolist()),
+        )
+
+        uid = closure.ancestor[0]
+        by_closure = db.execute_query(queries.reachable_nodes_query(uid, "sqlite", True))
+        recursive = db.execute_query(queries.reachable_nodes_query(uid, "sqlite"))
+        self.assertEqual(
+            set(map(tuple, by_closure[["Source", "Target"]].fillna("").values)),
+            set(map(tuple, recursive[["Source", "Target"]].fillna("").values)),
+        )
+        ancestors = db.execute_query(
+            queries.ancestors_query(closure.descendant[0], "sqlite")
+        )
+        self.assertIn(closure.ancestor[0], set(ancestors.ancestor))
+        db.dispose()
+
+    def test_load_into_existing_database(self):
+        """
+        models are loaded, with or without their closure, into databases created before GEMDClosure was added
+        """
+        for closure in [False, True]:
+            with tempfile.TemporaryDirectory() as folder:
+                path = f"{folder}/gemd.sqlite"
+                engine = sqla.create_engine(f"sqlite:///{path}")
+                with engine.begin() as conn:
+                    conn.exec_driver_sql(
+                        "create table GEMDModel (id integer primary key, name varchar(1024) not null)"
+                    )
+                engine.dispose()
+                db = open_database({"backend": "sqlite", "path": path})
+                with contextlib.redirect_stdout(io.StringIO()):
+                    model_id = queries.load_model_query(
+                        "bake", db, BAKE_HISTORY, "citrine-demo", closure=closure
+                    )
+                if not closure:
+                    db.execute_update(queries.create_closure_query(model_id, "sqlite"))
+                models = db.execute_query("select distinct model_id from GEMDClosure")
+                self.assertEqual(models.model_id.tolist(), [model_id])
+                db.dispose()
+
+    def test_closure_fallback(self):
+        """
+        listed queries join the closure of models that have one, follow edges for the others, and closures created
+        later are committed and recorded
+        """
+        with tempfile.TemporaryDirectory() as output:
+            open_db = OpenDB(":memory:", None, output, backend="sqlite", closure=True)
+            with contextlib.redirect_stdout(io.StringIO()):
+                model_id = queries.load_model_query(
+                    "bake", open_db.gemd_db, BAKE_HISTORY, "citrine-demo"
+                )
+                self.assertFalse(open_db.has_closure(model_id))
+                statement, recursive = open_db.run_listed_query(
+                    queries.to_node_query, [str(model_id)]
+                )
+                self.assertNotIn("GEMDClosure", str(statement))
+                uid = recursive.dropna().endpoint_uid.iloc[0]
+                with self.assertRaises(ValueError):
+                    open_db.run_listed_query(queries.ancestors_query, [uid])
+
+                open_db.run_listed_query(queries.create_closure_query, [str(model_id)])
+                self.assertTrue(open_db.has_closure(model_id))
+                statement, by_closure = open_db.run_listed_query(
+                    queries.to_node_query, [str(model_id)]
+                )
+            self.assertIn("GEMDClosure", str(statement))
+            self.assertEqual(
+                dict(zip(by_closure.endpoint_uid, by_closure.num_in_nodes)),
+                dict(recursive.dropna().values.tolist()),
+            )
+            self.assertTrue(open_db.has_closure(uid=uid))
+            open_db.gemd_db.dispose()
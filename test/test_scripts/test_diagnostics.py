@@ -0,0 +1,39 @@
+import unittest
+import networkx as nx
+from openmsimodel.graph.diagnostics import diagnose_graph
+
+
+class TestDiagnostics(unittest.TestCase):
+    """
+    Class for testing graph/diagnostics.py
+    """
+
+    def test_acyclic(self):
+        """
+        a forest has no cycles, and its components are counted and measured
+        """
+        G = nx.DiGraph([(0, 1), (1, 2), (3, 4)])
+        G.add_node(5)
+        report = diagnose_graph(G, nb_objects=6, nb_disregarded=0)
+        self.assertFalse(report.has_cycles)
+        self.assertEqual(report.cycles, [])
+        self.assertEqual(report.nb_strongly_connected_components, 6)
+        self.assertEqual(report.nb_weakly_connected_components, 3)
+        self.assertEqual(report.largest_weakly_connected_components, [3, 2, 1])
+        self.assertEqual(report.nb_isolates, 1)
+        self.assertIn("cycles in the graph: no", str(report))
+
+    def test_cycles_capped(self):
+        """
+        cycles are detected through components, self loops included, and their enumeration is capped
+        """
+        G = nx.complete_graph(6, create_using=nx.DiGraph)
+        G.add_edge(10, 10)
+        report = diagnose_graph(G, max_cycles=3)
+        self.assertTrue(report.has_cycles)
+        self.assertEqual(report.nb_cyclic_components, 2)
+        self.assertEqual(len(report.cycles), 3)
+        self.assertTrue(report.cycles_capped)
+        report = diagnose_graph(G, max_cycles=0)
+        self.assertTrue(report.has_cycles)
+        self.assertEqual(report.cycles, [])
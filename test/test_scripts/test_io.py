@@ -0,0 +1,225 @@
+import unittest, json, math, tempfile, pathlib, io, contextlib, pickle, os
+from unittest import mock
+import numpy as np
+import networkx as nx
+from openmsimodel.utilities.io import (
+    iter_gemd_data,
+    read_gemd_data,
+    list_gemd_files,
+    write_graph_cache,
+    read_graph_cache,
+    read_graphml_cached,
+    index_gemd_folder,
+    GEMD_INDEX_FILENAME,
+)
+from openmsimodel.utilities.archive import GEMDArchive
+from openmsimodel.utilities import json_backend
+from openmsimodel.utilities.dump_pipeline import dump_thin_jsons
+
+
+class TestIO(unittest.TestCase):
+    """
+    Class for testing functions in utilities/io.py
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = pathlib.Path(self.tmp.name)
+        (self.root / "sub").mkdir()
+        for i in range(10):
+            folder = self.root / "sub" if i % 2 else self.root
+            with open(folder / f"obj_{i}.json", "w") as f:
+                json.dump(
+                    {"type": "material_run", "name": f"obj_{i}", "uids": {"auto": str(i)}},
+                    f,
+                )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_iter_gemd_data_folder(self):
+        """
+        streaming a folder yields every object with its path, in a deterministic order
+        """
+        serial = list(iter_gemd_data(self.root, None))
+        self.assertEqual(len(serial), 10)
+        self.assertEqual([p for _, p in serial], list_gemd_files(self.root))
+        for obj, path in serial:
+            self.assertEqual(path.name, f"{obj['name']}.json")
+
+    def test_iter_gemd_data_parallel(self):
+        """
+        parsing over a process pool in small chunks gives the same objects in the same order
+        """
+        serial = list(iter_gemd_data(self.root, None))
+        parallel = list(iter_gemd_data(self.root, None, n_workers=2, chunk_size=3))
+        self.assertEqual(serial, parallel)
+
+    def test_read_gemd_data(self):
+        """
+        read_gemd_data materializes the stream, and raises on unreadable sources
+        """
+        objects, paths = read_gemd_data(self.root, None)
+        self.assertEqual(len(objects), len(paths))
+        with self.assertRaises(IOError):
+            read_gemd_data(self.root / "never_name_a_folder_this", None)
+
+    def test_graph_cache(self):
+        """
+        the binary cache gives the graph GraphML does, and is ignored once the GraphML file changes
+        """
+        G = nx.DiGraph(name="cache")
+        G.add_node("a", color="red", size=2, weight=0.5)
+        G.add_node("b", color="blue", visible=True)
+        G.add_edge("a", "b", relationship="creates")
+        graphml_path = self.root / "cache.graphml"
+        nx.write_graphml_lxml(G, graphml_path, named_key_ids=True)
+        write_graph_cache(G, graphml_path)
+        expected = nx.read_graphml(graphml_path)
+        cached = read_graph_cache(graphml_path)
+        self.assertEqual(list(cached.nodes(data=True)), list(expected.nodes(data=True)))
+        self.assertEqual(list(cached.edges(data=True)), list(expected.edges(data=True)))
+        self.assertEqual(cached.graph, expected.graph)
+
+        G.add_edge("b", "c")
+        nx.write_graphml_lxml(G, graphml_path, named_key_ids=True)
+        self.assertIsNone(read_graph_cache(graphml_path))
+        self.assertEqual(read_graphml_cached(graphml_path).number_of_edges(), 2)
+        self.assertEqual(read_graph_cache(graphml_path).number_of_edges(), 2)
+
+    def test_graph_cache_rejects_pickles(self):
+        """
+        a pickled file next to a GraphML file is never loaded as its cache
+        """
+        G = nx.DiGraph()
+        G.add_edge("a", "b")
+        graphml_path = self.root / "pickled.graphml"
+        nx.write_graphml_lxml(G, graphml_path)
+        with open(str(graphml_path) + ".cache", "wb") as f:
+            pickle.dump({"version": 2}, f)
+        self.assertIsNone(read_graph_cache(graphml_path))
+        with open(str(graphml_path) + ".cache", "wb") as f:
+            np.savez(f, meta=np.array([{"version": 2}], dtype=object))
+        self.assertIsNone(read_graph_cache(graphml_path))
+        self.assertEqual(read_graphml_cached(graphml_path).number_of_edges(), 1)
+        self.assertEqual(read_graph_cache(graphml_path).number_of_edges(), 1)
+
+    def test_gemd_index(self):
+        """
+        targeted loads through the uid index read the objects a full read would, and follow changes to the folder
+        """
+        cache = tempfile.TemporaryDirectory()
+        self.addCleanup(cache.cleanup)
+        environ = mock.patch.dict(os.environ, {"OPENMSIMODEL_CACHE_DIR": cache.name})
+        environ.start()
+        self.addCleanup(environ.stop)
+        with contextlib.redirect_stdout(io.StringIO()):
+            objects, paths = read_gemd_data(self.root, None, uids=["3", "4", "missing"])
+            self.assertEqual([obj["name"] for obj in objects], ["obj_4", "obj_3"])
+            self.assertEqual(paths, [self.root / "obj_4.json", self.root / "sub" / "obj_3.json"])
+            (self.root / "obj_4.json").unlink()
+            with open(self.root / "sub" / "obj_3.json", "w") as f:
+                json.dump({"type": "process_run", "name": "obj_3", "uids": {"auto": "3"}}, f)
+            with open(self.root / "obj_10.json", "w") as f:
+                json.dump({"type": "material_run", "name": "obj_10", "uids": {"auto": "4"}}, f)
+            index = index_gemd_folder(self.root)
+        self.assertEqual(index.lookup("3")[0][2], "process_run")
+        self.assertEqual(index.lookup("4")[0][0], self.root / "obj_10.json")
+        self.assertEqual(len(index.locate(types=["material_run"])), 9)
+        index.close()
+        # the data folder is left as is
+        self.assertFalse((self.root / GEMD_INDEX_FILENAME).exists())
+        self.assertTrue(str(index.index_path).startswith(cache.name))
+
+    def test_gemd_archive(self):
+        """
+        objects appended to plain and gzip archives are read back in order, in full or through the archive index
+        """
+        objects, _ = read_gemd_data(self.root, None)
+        for name in ["objects.ndjson", "objects.ndjson.gz"]:
+            path = self.root / name
+            with GEMDArchive(path, mode="a", block_size=3) as archive:
+                for obj in objects:
+                    archive.append(obj)
+            with contextlib.redirect_stdout(io.StringIO()):
+                archived, paths = read_gemd_data(path, None)
+                self.assertEqual(archived, objects)
+                self.assertEqual(set(paths), {path})
+                targeted, _ = read_gemd_data(path, None, uids=["7", "2", "missing"])
+            self.assertEqual([obj["name"] for obj in targeted], ["obj_2", "obj_7"])
+
+    def test_json_backends(self):
+        """
+        every installed JSON backend thin dumps GEMD objects as GEMDJson does, and loads them back
+        """
+        from gemd.json import GEMDJson
+        from gemd.demo.cake import make_cake
+
+        encoder = GEMDJson()
+        cake = make_cake(seed=1)
+        default = json_backend.get_json_backend()
+        try:
+            for backend in json_backend.available_json_backends():
+                json_backend.set_json_backend(backend)
+                self.assertEqual(
+                    json_backend.loads(json_backend.thin_dumps(encoder, cake, indent=3)),
+                    json.loads(encoder.thin_dumps(cake)),
+                )
+        finally:
+            json_backend.set_json_backend(default)
+        with self.assertRaises(ValueError):
+            json_backend.set_json_backend("yaml")
+
+    def test_json_backends_nan(self):
+        """
+        every installed JSON backend round trips NaN and infinite values, and indents as the standard library does
+        """
+        obj = {"b": [1.5, float("inf")], "a": float("nan")}
+        default = json_backend.get_json_backend()
+        try:
+            for backend in json_backend.available_json_backends():
+                json_backend.set_json_backend(backend)
+                for indent in [None, 3]:
+                    loaded = json_backend.loads(json_backend.dumps(obj, indent=indent))
+                    self.assertTrue(math.isnan(loaded["a"]))
+                    self.assertEqual(loaded["b"], [1.5, float("inf")])
+                self.assertTrue(math.isnan(json_backend.loads('{"a": NaN}')["a"]))
+                self.assertEqual(
+                    json_backend.dumps({"a": [1, 2]}, indent=3, sort_keys=True),
+                    json.dumps({"a": [1, 2]}, indent=3, sort_keys=True),
+                )
+        finally:
+            json_backend.set_json_backend(default)
+
+    def test_dump_thin_jsons(self):
+        """
+        the dump pipeline writes the files ScienceKit.out does, serially or over worker processes, pretty or compact
+        """
+        from gemd.json import GEMDJson
+        from gemd.demo.cake import make_cake
+        from gemd.util.impl import recursive_foreach
+        from openmsimodel.science_kit.science_kit import ScienceKit
+
+        encoder = GEMDJson(scope="auto")
+        cake = make_cake(seed=1)
+        recursive_foreach(cake, lambda item: item.add_uid("auto", str(id(item))))
+        kit = ScienceKit()
+        kit.local_out_destination = self.root / "out"
+        kit.local_out_destination.mkdir()
+        kit.dump_function = encoder.thin_dumps
+        recursive_foreach(cake, kit.out)
+        expected = {
+            path.name: json.loads(path.read_text())
+            for path in kit.local_out_destination.iterdir()
+        }
+        for n_workers, indent in [(None, 3), (2, None)]:
+            destination = self.root / f"pipeline_{n_workers}"
+            destination.mkdir()
+            written = dump_thin_jsons(
+                cake, destination, encoder, indent=indent, n_workers=n_workers, chunk_size=10
+            )
+            self.assertEqual(written, len(expected))
+            dumped = {
+                path.name: json.loads(path.read_text()) for path in destination.iterdir()
+            }
+            self.assertEqual(dumped, expected)
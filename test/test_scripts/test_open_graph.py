@@ -0,0 +1,370 @@
+import unittest, tempfile, io, contextlib, json, pathlib, os
+import numpy as np
+import networkx as nx
+from openmsimodel.graph.open_graph import (
+    OpenGraph,
+    LazyGEMDObject,
+    GraphMLView,
+    write_graphml,
+    summary_graph,
+    AttributeTable,
+    sample_gemd_data,
+)
+from openmsimodel.graph.incremental import FileManifest
+import openmsimodel.graph.open_graph as open_graph_module
+from config import TEST_CONST
+
+BAKE_HISTORY = (
+    TEST_CONST.TEST_DIR_PATH.parent
+    / "examples"
+    / "bake"
+    / "example_gemd_material_history.json"
+)
+
+
+class TestOpenGraph(unittest.TestCase):
+    """
+    Class for testing graph/open_graph.py
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, **kwargs):
+        open_graph = OpenGraph(
+            "bake", BAKE_HISTORY, self.tmp.name, uuid_to_track="citrine-demo", **kwargs
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            return open_graph.build_graph()
+
+    def test_dispatch_table(self):
+        """
+        every GEMD object type is dispatched, only the types matching 'which' add nodes
+        """
+        open_graph = OpenGraph("bake", BAKE_HISTORY, self.tmp.name, which="run")
+        table = open_graph.build_dispatch_table()
+        self.assertEqual(table["material_run"][0]["color"], "green")
+        self.assertIsNone(table["material_spec"][0])
+        self.assertNotIn("property_template", table)
+        open_graph.which = "all"
+        table = open_graph.build_dispatch_table()
+        self.assertEqual(table["property_template"][0]["shape"], "trapezium")
+
+    def test_build_graph_relationships(self):
+        """
+        building the run graph of the bake example links ingredients, processes, materials and measurements
+        """
+        G, _, name_mapping = self.build(which="run")
+        relationships = {d["relationship"] for _, _, d in G.edges(data=True)}
+        self.assertEqual(
+            relationships, {"is used in", "becomes", "creates", "is measured with"}
+        )
+        G_bidirectional, _, _ = self.build(which="run", add_bidirectional_edges=True)
+        self.assertEqual(
+            G_bidirectional.number_of_edges(), 2 * G.number_of_edges()
+        )
+
+    def test_bulk_insert(self):
+        """
+        inserting the nodes and edges in bulk gives the same graph as inserting them one by one
+        """
+        G, _, _ = self.build(which="all")
+        G_bulk, _, _ = self.build(which="all", bulk_insert=True)
+        self.assertEqual(list(G.nodes(data=True)), list(G_bulk.nodes(data=True)))
+        self.assertEqual(list(G.edges(data=True)), list(G_bulk.edges(data=True)))
+
+    def test_keep_uid_keys(self):
+        """
+        keeping uids as node keys stores the display names as labels, which subgraph extraction resolves
+        """
+        G, _, name_mapping = self.build(which="run")
+        G_uid, _, _ = self.build(which="run", keep_uid_keys=True)
+        self.assertEqual(
+            {name_mapping[n] for n in G_uid.nodes}, set(G.nodes)
+        )
+        uid = next(n for n in G_uid.nodes if G_uid.out_degree(n) == 0)
+        self.assertEqual(G_uid.nodes[uid]["label"], name_mapping[uid])
+        subgraph = OpenGraph.extract_subgraph(G_uid, name_mapping[uid], [nx.ancestors])
+        self.assertEqual(set(subgraph), nx.ancestors(G_uid, uid) | {uid})
+        subgraph = OpenGraph.extract_subgraph(G, name_mapping[uid], [nx.ancestors])
+        self.assertEqual({name_mapping[n] for n in nx.ancestors(G_uid, uid)} | {name_mapping[uid]}, set(subgraph))
+
+    def test_lazy_object_payload(self):
+        """
+        the raw layout stores lazy payloads, rehydrated on demand and serialized only in GraphML files
+        """
+        G, _, _ = self.build(which="run", layout="raw", keep_uid_keys=True)
+        uid = next(iter(G.nodes))
+        self.assertIsInstance(G.nodes[uid]["object"], LazyGEMDObject)
+        obj = OpenGraph.get_object(G, uid)
+        self.assertEqual(obj["uids"]["citrine-demo"], uid)
+        with contextlib.redirect_stdout(io.StringIO()):
+            _, _, graphml_path = OpenGraph.save_graph(self.tmp.name, G, None, "bake")
+        self.assertIsInstance(G.nodes[uid]["object"], LazyGEMDObject)
+        G_loaded = OpenGraph.load_graphml(graphml_path)
+        self.assertEqual(OpenGraph.get_object(G_loaded, uid), obj)
+
+    def test_update_graph(self):
+        """
+        incremental updates from a folder patch the graph into the one a full build gives
+        """
+        source = pathlib.Path(self.tmp.name) / "gemd"
+        source.mkdir()
+        with open(BAKE_HISTORY) as f:
+            objects = json.load(f)
+        for i, obj in enumerate(objects):
+            with open(source / f"{i:03d}.json", "w") as f:
+                json.dump(obj, f)
+
+        def full_build():
+            G, _, _ = OpenGraph(
+                "bake", source, self.tmp.name, uuid_to_track="citrine-demo", keep_uid_keys=True
+            ).build_graph()
+            return {n: str(d) for n, d in G.nodes(data=True)}, set(G.edges)
+
+        open_graph = OpenGraph("bake", source, self.tmp.name, uuid_to_track="citrine-demo")
+        with contextlib.redirect_stdout(io.StringIO()):
+            G, _ = open_graph.update_graph(save=True)
+            self.assertEqual(({n: str(d) for n, d in G.nodes(data=True)}, set(G.edges)), full_build())
+
+            changed = next(i for i, obj in enumerate(objects) if obj["type"] == "material_run")
+            objects[changed]["name"] = "renamed"
+            with open(source / f"{changed:03d}.json", "w") as f:
+                json.dump(objects[changed], f)
+            (source / "000.json").unlink()
+            G, touched = open_graph.update_graph(save=True)
+            self.assertLess(len(touched), G.number_of_nodes())
+            self.assertEqual(({n: str(d) for n, d in G.nodes(data=True)}, set(G.edges)), full_build())
+
+            G, touched = open_graph.update_graph(save=True)
+            self.assertEqual(touched, set())
+
+    def test_file_manifest(self):
+        """
+        relative and absolute paths to a file are the same manifest entry
+        """
+        path = pathlib.Path(self.tmp.name) / "object.json"
+        path.write_text("{}")
+        manifest = FileManifest()
+        added, _, _ = manifest.diff([path.resolve()])
+        self.assertEqual(len(added), 1)
+        relative = os.path.relpath(path)
+        self.assertEqual(manifest.diff([relative]), ([], [], []))
+
+    def test_write_graphml(self):
+        """
+        the streaming GraphML writer leaves the graph as is, and writes what write_graphml_lxml does after conversion
+        """
+        G, _, _ = self.build(which="run", layout="visualisation")
+        tagged = next(n for n, d in G.nodes(data=True) if d.get("tags"))
+        tags = G.nodes[tagged]["tags"]
+        streamed = pathlib.Path(self.tmp.name) / "streamed.graphml"
+        write_graphml(G, streamed, named_key_ids=True)
+        self.assertIs(G.nodes[tagged]["tags"], tags)
+        converted = pathlib.Path(self.tmp.name) / "converted.graphml"
+        G_converted = nx.DiGraph(name=G.graph["name"])
+        G_converted.add_nodes_from(GraphMLView(G).nodes(data=True))
+        G_converted.add_edges_from(G.edges(data=True))
+        nx.write_graphml_lxml(G_converted, converted, named_key_ids=True)
+        self.assertEqual(streamed.read_bytes(), converted.read_bytes())
+
+        G, _, _ = self.build(which="all", layout="raw")
+        write_graphml(G, streamed)
+        G_converted = nx.DiGraph(**G.graph)
+        G_converted.add_nodes_from(GraphMLView(G).nodes(data=True))
+        G_converted.add_edges_from(G.edges(data=True))
+        nx.write_graphml(G_converted, converted)
+        self.assertEqual(streamed.read_bytes(), converted.read_bytes())
+
+        G = nx.Graph(id="g", flag=True, node_default={"size": 1})
+        G.add_node("a", size=2, weight=np.float32(0.5), visible=False)
+        G.add_node("b", count=np.int64(3))
+        G.add_edge("a", "b", weight=1.5)
+        write_graphml(G, streamed)
+        nx.write_graphml(G.copy(), converted)
+        self.assertEqual(streamed.read_bytes(), converted.read_bytes())
+
+    def test_summary_graph(self):
+        """
+        summary graphs count the nodes of every type and the edges between types
+        """
+        G, _, _ = self.build(which="run")
+        summary = summary_graph(G)
+        types = [d["type"] for _, d in G.nodes(data=True)]
+        self.assertEqual(set(summary.nodes), set(types))
+        for t in summary.nodes:
+            self.assertEqual(
+                summary.nodes[t]["label"], "{} ({})".format(t, types.count(t))
+            )
+        for u, v in G.edges:
+            self.assertTrue(summary.has_edge(G.nodes[u]["type"], G.nodes[v]["type"]))
+
+    def test_extract_subgraphs(self):
+        """
+        batched extraction through the lineage index gives the subgraphs nx.ancestors/nx.descendants give
+        """
+        G, _, _ = self.build(which="all")
+        for ancestors, descendants in [(True, True), (True, False), (False, True)]:
+            funcs = [nx.ancestors] * ancestors + [nx.descendants] * descendants
+            subgraphs = OpenGraph.extract_subgraphs(
+                G, list(G), ancestors=ancestors, descendants=descendants
+            )
+            for node in G:
+                expected = OpenGraph.extract_subgraph(G, node, funcs)
+                self.assertEqual(set(subgraphs[node]), set(expected))
+                self.assertEqual(set(subgraphs[node].edges), set(expected.edges))
+
+    def test_save_provenance(self):
+        """
+        provenance graphs saved in one batch match the ones extracted one by one
+        """
+        G, _, name_mapping = self.build(which="all", keep_uid_keys=True)
+        roots = list(G)[:5]
+        output = pathlib.Path(self.tmp.name)
+        with contextlib.redirect_stdout(io.StringIO()):
+            OpenGraph.save_provenance(
+                G, [(name_mapping[uid], output / f"{i}.graphml") for i, uid in enumerate(roots)]
+            )
+        # the serial path doesn't keep the graph alive in the worker global
+        self.assertIsNone(open_graph_module._provenance_graph)
+        for i, uid in enumerate(roots):
+            expected = OpenGraph.extract_subgraph(G, uid, [nx.ancestors, nx.descendants])
+            saved = nx.read_graphml(output / f"{i}.graphml")
+            self.assertEqual(set(saved), set(expected))
+            self.assertEqual(set(saved.edges), set(expected.edges))
+            self.assertEqual(saved.graph["name"], str(i))
+
+    def test_attribute_table(self):
+        """
+        the columnar mode collects every attribute value of the visualisation layout as numbers or text
+        """
+        open_graph = OpenGraph(
+            "bake",
+            BAKE_HISTORY,
+            self.tmp.name,
+            uuid_to_track="citrine-demo",
+            layout="visualisation",
+            which="run",
+            attribute_table=True,
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            G, _, _ = open_graph.build_graph(save=True)
+        frame = open_graph.attribute_frame
+        history = json.loads(BAKE_HISTORY.read_text())
+        runs = [obj for obj in history if obj["type"].endswith("_run")]
+        nb_values = sum(
+            len(obj.get(key) or [])
+            for obj in runs
+            for key in ("parameters", "properties", "conditions")
+        )
+        self.assertEqual(len(frame), nb_values)
+        self.assertEqual(frame["nominal"].dtype, "float64")
+        row = frame[frame["value_type"] == "nominal_real"].iloc[0]
+        self.assertEqual(G.nodes[row["label"]]["uuid"], row["uid"])
+        self.assertIn(row["uid"], AttributeTable.select(frame, row["attribute"], lower=row["nominal"]))
+        self.assertTrue(pathlib.Path(open_graph.attributes_path).exists())
+
+    def test_attribute_table_updates(self):
+        """
+        attributes without a value keep a row without value columns, and removed rows leave the table
+        """
+        table = AttributeTable()
+        value = {"type": "nominal_real", "nominal": 1.0, "units": "m"}
+        for uid in ("a", "b", "c"):
+            table.append(uid, {"type": "parameter", "name": "length", "value": value})
+        table.append("a", {"type": "property", "name": "color", "value": None})
+        table.remove({"b"})
+        self.assertEqual(len(table), 3)
+        frame = table.to_frame()
+        self.assertEqual(list(frame["uid"]), ["a", "c", "a"])
+        self.assertTrue(np.isnan(frame["nominal"].iloc[2]))
+        table.remove({"a"})
+        self.assertEqual(table.columns["uid"], ["c"])
+        self.assertEqual(list(table.to_frame()["nominal"]), [1.0])
+
+        # incremental updates leave the frame to be built on first access
+        source = pathlib.Path(self.tmp.name) / "gemd"
+        source.mkdir()
+        with open(BAKE_HISTORY) as f:
+            objects = json.load(f)
+        for i, obj in enumerate(objects):
+            with open(source / f"{i:03d}.json", "w") as f:
+                json.dump(obj, f)
+        open_graph = OpenGraph(
+            "bake",
+            source,
+            self.tmp.name,
+            uuid_to_track="citrine-demo",
+            layout="visualisation",
+            attribute_table=True,
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            open_graph.update_graph()
+        self.assertIsNone(open_graph._attribute_frame)
+        frame = open_graph.attribute_frame
+        self.assertGreater(len(frame), 0)
+        self.assertIs(open_graph.attribute_frame, frame)
+
+    def test_sample(self):
+        """
+        sampling strategies keep within the budget, and closures don't link outside of the sample
+        """
+        history = json.loads(BAKE_HISTORY.read_text())
+        dangling = lambda G: {n for n, d in G.nodes(data=True) if "type" not in d}
+        G_full, _, _ = self.build(which="all", keep_uid_keys=True)
+        for sample in ["bfs", "random_walk", "stratified", "closure"]:
+            G, _, _ = self.build(
+                which="all",
+                keep_uid_keys=True,
+                sample=sample,
+                sample_size=20,
+                random_state=0,
+            )
+            objects = {n for n, d in G.nodes(data=True) if "type" in d}
+            self.assertLessEqual(len(objects), 20)
+            self.assertTrue(objects)
+            if sample == "closure":
+                self.assertLessEqual(dangling(G), dangling(G_full))
+        sample = sample_gemd_data(
+            [(obj, None) for obj in history], "stratified", 20, scope="citrine-demo"
+        )
+        self.assertEqual(len(sample), 20)
+        self.assertEqual(
+            {obj["type"] for obj, _ in sample},
+            {obj["type"] for obj in history if "citrine-demo" in obj["uids"]},
+        )
+
+    def test_summarize(self):
+        """
+        summaries group nodes by template, count them and their edges, and expand back into them
+        """
+        G, _, _ = self.build(which="all")
+        summary = OpenGraph.summarize(G, by="template")
+        view = summary.graph()
+        self.assertEqual(sum(nx.get_node_attributes(view, "count").values()), len(G))
+        self.assertEqual(sum(nx.get_edge_attributes(view, "count").values()), G.number_of_edges())
+        for key, members in summary.groups.items():
+            if key in G:
+                self.assertTrue(G.nodes[key]["type"].endswith("_template"))
+        key = max(summary.groups, key=lambda key: len(summary.groups[key]))
+        summary.expand(key)
+        expanded = summary.graph()
+        self.assertEqual(len(expanded), len(view) - 1 + len(summary.groups[key]))
+        self.assertTrue(set(summary.groups[key]) <= set(expanded))
+        summary.collapse(key)
+        self.assertEqual(set(summary.graph()), set(view))
+        bounded = OpenGraph.summarize(G, by="short_name", max_groups=3).graph()
+        self.assertEqual(len(bounded), 3)
+
+        G = nx.DiGraph()
+        G.add_nodes_from(["a", "b", "c"], kind="other")
+        G.add_nodes_from(["d", "e"], kind="first")
+        G.add_nodes_from(["f"], kind="second")
+        G.add_nodes_from(["g"], kind="third")
+        summary = OpenGraph.summarize(G, by="kind", max_groups=3)
+        self.assertEqual(summary.groups["other"], ["a", "b", "c"])
+        self.assertEqual(sorted(summary.groups[summary.other_group]), ["f", "g"])
+        self.assertEqual(sum(map(len, summary.groups.values())), len(G))
@@ -0,0 +1,46 @@
+import unittest
+
+from gemd.demo.cake import make_cake
+from gemd.util.impl import recursive_foreach
+
+from openmsimodel.entity.gemd.impl import traverse, assign_uuid, STOP
+
+
+class TestTraversal(unittest.TestCase):
+    """this tests the traversal of GEMD object graphs in entity/gemd/impl.py"""
+
+    def setUp(self):
+        self.cakes = [make_cake(seed=seed) for seed in range(2)]
+
+    def test_traverse_visits_once(self):
+        """
+        every entity recursive_foreach reaches is visited exactly once, before and after the objects it links to
+        """
+        expected = []
+        recursive_foreach(self.cakes, expected.append)
+        pre, post = [], []
+        visits = traverse(self.cakes, pre=pre.append, post=post.append)
+        self.assertEqual(len(pre), len({id(item) for item in pre}))
+        self.assertEqual({id(item) for item in pre}, {id(item) for item in expected})
+        self.assertEqual({id(item) for item in post}, {id(item) for item in expected})
+        self.assertEqual(visits["entities"], len(pre))
+        self.assertGreater(visits["revisits"], 0)
+        # a material run is left after the process run that made it
+        cake = self.cakes[0]
+        self.assertLess(
+            next(i for i, item in enumerate(post) if item is cake.process),
+            next(i for i, item in enumerate(post) if item is cake),
+        )
+
+    def test_traverse_stop(self):
+        visited = []
+
+        def pre(item):
+            visited.append(item)
+            return STOP if len(visited) == 3 else None
+
+        self.assertEqual(traverse(self.cakes, pre=pre)["entities"], 3)
+
+    def test_assign_uuid(self):
+        assign_uuid(self.cakes, "test")
+        recursive_foreach(self.cakes, lambda item: self.assertIn("test", item.uids))